@@ -1,68 +1,497 @@
-import requests, os
+import requests, re, time, random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlencode
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from exceptions import APIError
+from exceptions import APIError, BatchUnsupported
 from logger import logger
-from config.config import Config, load_json_file, create_json_file
+from config.config import Config
 from config.filereg import FileReg
-import json
-from utils.variables import FileNames
 from tools.encryption import decrypt_password
+from tools.telemetry import telemetry
+from api.budget import budget
+from api.latency import latency
+from api.cache import result_cache, cache_key
+from utils.clock import get_clock
+
+_session = None
+_batch_unsupported = set()
+
+_snapshots = {}
+
+_hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+BATCH_LIMIT = 25
+RETRY_STATUSES = {500, 502, 503, 504}
+RETRY_BASE_SECONDS = 0.5
+COMMITMENT_FIELD = "Time_Before_Next_Update_Commitment__c"
+
+def shared_session() -> requests.Session:
+  global _session
+  if _session is None:
+    _session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    _session.mount("https://", adapter)
+    _session.mount("http://", adapter)
+  return _session
+
+def composite_batch_url(api_url: str):
+  match = re.search(r"^(.*/services/data/)(v\d+\.\d+)/query/?$", api_url or "")
+  if not match:
+    return None, None
+  return f"{match.group(1)}{match.group(2)}/composite/batch", match.group(2)
+
+def latency_kind(method: str, url: str, params: dict = None, body: dict = None) -> str:
+  if body is not None:
+    first = ((body.get("batchRequests") or [{}])[0]).get("url", "")
+    return "batch_probe" if "COUNT%28" in first.upper() else "batch"
+  if params is None:
+    return "page"
+  return "probe" if re.match(r"\s*SELECT\s+COUNT\(", params.get("q", ""), re.IGNORECASE) else "query"
+
+def probe_query(query: str) -> str:
+  match = re.search(r"\bFROM\b(.*?)(?:\s+(?:ORDER\s+BY|LIMIT)\b.*)?$", query, re.IGNORECASE | re.DOTALL)
+  return f"SELECT COUNT(Id), MAX(LastModifiedDate) FROM{match.group(1)}" if match else None
+
+def result_signature(response_data: dict):
+  records = response_data.get("records", [])
+  if records and "LastModifiedDate" not in records[0]:
+    return None
+  latest = max((r.get("LastModifiedDate") for r in records if r.get("LastModifiedDate")), default=None)
+  return (response_data.get("totalSize", len(records)), latest)
+
+def probe_signature(response_data: dict):
+  records = response_data.get("records", [])
+  if not records:
+    return (response_data.get("totalSize", 0), None)
+  return (records[0].get("expr0"), records[0].get("expr1"))
+
+def age_records(records: list, elapsed_seconds: float) -> list:
+  # Commitment times are formula fields that count down without touching LastModifiedDate
+  elapsed_days = elapsed_seconds / (24 * 60 * 60)
+  aged = []
+  for record in records:
+    commitment = record.get(COMMITMENT_FIELD)
+    if commitment is not None:
+      record = dict(record, **{COMMITMENT_FIELD: round(commitment - elapsed_days, 4)})
+    aged.append(record)
+  return aged
+
+def aged_snapshot(snapshot: dict, now: float) -> dict:
+  records = age_records(snapshot["response"].get("records", []), now - snapshot["fetched_at"])
+  return dict(snapshot["response"], records=records)
+
+def record_key(record: dict):
+  return record.get("CaseNumber") or record.get("Id") or record.get("attributes", {}).get("url") or id(record)
+
+def merge_records(record_sets: list) -> list:
+  seen = set()
+  merged = []
+  for records in record_sets:
+    for record in records:
+      key = record_key(record)
+      if key in seen:
+        continue
+      seen.add(key)
+      merged.append(record)
+  return merged
+
+def order_records(records: list, query: str) -> list:
+  match = re.search(r"ORDER\s+BY\s+([\w.]+)(?:\s+(ASC|DESC))?", query, re.IGNORECASE)
+  if not match:
+    return records
+
+  path = match.group(1).split(".")
+  descending = (match.group(2) or "").upper() == "DESC"
+
+  def value(record):
+    for part in path:
+      record = record.get(part) if isinstance(record, dict) else None
+    return (record is None) != descending, "" if record is None else record
+
+  return sorted(records, key=value, reverse=descending)
+
+def record_poll(started: float):
+  telemetry.observe("poll.seconds", time.perf_counter() - started)
+  telemetry.incr("poll.success")
+  telemetry.gauge("poll.last_success_timestamp", time.time())
+
+def record_fetch(started: float, content_size: int, records: int):
+  telemetry.observe("fetch.seconds", time.perf_counter() - started)
+  telemetry.incr("fetch.count")
+  telemetry.incr("fetch.bytes", content_size)
+  telemetry.gauge("fetch.records", records)
+
+def split_results(results: list, handlers: list) -> list:
+  """Hands each handler back its own slice of results fetched for their concatenated queries"""
+  parts, start = [], 0
+  for handler in handlers:
+    parts.append(results[start:start + len(handler.queries)])
+    start += len(handler.queries)
+  return parts
 
 class APIHandler():
-  def __init__(self, api_url, username, query, test: bool, config_cls: Config, filereg_cls: FileReg, rerender: bool = False):
+  def __init__(self, api_url, username, query, test: bool, config_cls: Config, filereg_cls: FileReg, rerender: bool = False, recorder=None, max_workers: int = 4, execution_mode: str = "batch", change_probe: bool = True, probe_max_skips: int = 5, hedge_requests: bool = True, max_retries: int = 2):
     self.api_url = api_url
     self.username = username
-    self.query = query
+    self.queries = [query] if isinstance(query, str) else list(query)
+    self.query = self.queries[0]
+    self.max_workers = max_workers
+    self.execution_mode = execution_mode
+    self.change_probe = change_probe
+    self.probe_max_skips = probe_max_skips
+    self.signature = None
+    self.hedge_requests = hedge_requests
+    self.max_retries = max_retries
     self.test = test
     self.config_cls = config_cls
     self.filereg_cls = filereg_cls
-    self.last_query_result = filereg_cls.resolve_file("dataBuffer")
+    self.cache_key = cache_key(api_url, username, self.queries)
     self.rerender = rerender or False
+    self.recorder = recorder
 
-  def run(self) -> dict:
-    if ((self.test_mode() or self.rerender) and self.cached_file_exists()):
-      logger.debug(f"{__class__.__name__}.run() invoked to perform a rerender OR is currently in TEST mode")
-      response_data = self.load_previous_data()
-    else:
-      logger.debug(f"{__class__.__name__}.run() invoked to call the API")
-      response_data = self.fetch_from_api()
+  def for_queries(self, queries: list) -> "APIHandler":
+    """A handler with the same org and settings for other queries, used to fetch for other processes"""
+    return APIHandler(
+      self.api_url, self.username, queries, self.test, self.config_cls, self.filereg_cls,
+      max_workers=self.max_workers, execution_mode=self.execution_mode, change_probe=self.change_probe,
+      probe_max_skips=self.probe_max_skips, hedge_requests=self.hedge_requests, max_retries=self.max_retries
+    )
 
+  def run(self, use_cache: bool = True) -> dict:
+    started = time.perf_counter()
+    try:
+      response_data = self.local_result(use_cache)
+      if response_data is None and self.change_probe and use_cache:
+        response_data = self.unchanged_snapshot()
+      if response_data is None:
+        response_data = self.fetch_from_api()
+        if self.recorder:
+          self.recorder.record(response_data.get('records', []))
+      telemetry.flush()
+    except Exception:
+      telemetry.incr("poll.errors")
+      raise
+
+    record_poll(started)
     return response_data.get('records', [])
+
+  def local_result(self, use_cache: bool = True):
+    """Returns the response that can be served without a full fetch, or None"""
+    # Test mode and re-renders take any cached result, otherwise only one within its TTL
+    cached = self.cached_result(stale_ok=True) if self.test or self.rerender else None
+    if cached is None and use_cache:
+      cached = self.cached_result()
+
+    if cached is not None:
+      logger.debug("%s.run() served the result from the query cache", __class__.__name__)
+      return cached
+
+    logger.debug("%s.run() invoked to call the API", __class__.__name__)
+    return self.reserved_snapshot() if budget.exhausted() else None
+
+  def reserved_snapshot(self):
+    snapshot = _snapshots.get(tuple(self.queries))
+    if snapshot:
+      response_data = aged_snapshot(snapshot, get_clock().time())
+    else:
+      response_data = self.cached_result(stale_ok=True)
+      if response_data is None:
+        return None
+
+    logger.warning(f"Only {budget.remaining_fraction():.1%} of the daily API allocation is left, serving the last snapshot instead of fetching")
+    telemetry.incr("api.fetches_paused")
+    return response_data
+
+  def probe_queries(self):
+    snapshot = _snapshots.get(tuple(self.queries))
+    if not snapshot or snapshot["signature"] is None or snapshot["skips"] >= self.probe_max_skips:
+      return None
+
+    probes = [probe_query(query) for query in self.queries]
+    return None if None in probes else probes
+
+  def unchanged_snapshot(self):
+    probes = self.probe_queries()
+    if probes is None:
+      return None
+    results = self.run_probes(probes)
+    return None if results is None else self.probe_matched(results)
+
+  def run_probes(self, probes: list):
+    started = time.perf_counter()
+    try:
+      results = self.fetch_many(probes)
+    except (APIError, requests.exceptions.RequestException) as e:
+      logger.warning(f"Change probe failed, falling back to a full fetch: {e}")
+      telemetry.incr("probe.errors")
+      return None
+
+    telemetry.observe("probe.seconds", time.perf_counter() - started)
+    telemetry.incr("probe.count")
+    telemetry.incr("probe.bytes", sum(size for _, size in results))
+    return results
+
+  def probe_matched(self, results: list):
+    snapshot = _snapshots[tuple(self.queries)]
+    if [probe_signature(data) for data, _ in results] != snapshot["signature"]:
+      logger.info("Change probe detected new or updated cases, fetching the full result")
+      telemetry.incr("probe.fetched")
+      return None
+
+    snapshot["skips"] += 1
+    telemetry.incr("probe.skipped")
+    telemetry.incr("probe.bytes_saved", max(0, snapshot["size"] - sum(size for _, size in results)))
+    logger.info("Change probe matched the previous cycle, reusing the in-memory snapshot (%d/%d)", snapshot["skips"], self.probe_max_skips)
+    return aged_snapshot(snapshot, get_clock().time())
   
+  def last_snapshot(self):
+    """Returns (records, age_seconds) of the last cached result for these queries, however old"""
+    cached = result_cache.get(self.cache_key, stale_ok=True)
+    if cached is None:
+      return None
+    response_data, stored_at = cached
+    age = max(0, time.time() - stored_at)
+    return age_records(response_data.get("records", []), age), age
+
   def test_mode(self) -> bool:
-    return self.test and self.cached_file_exists()
+    return self.test and self.cached_entry_exists()
 
-  def cached_file_exists(self) -> bool:
-    return os.path.exists(self.last_query_result)
+  def cached_entry_exists(self) -> bool:
+    return result_cache.entry_path(self.cache_key).exists()
 
-  def load_previous_data(self) -> dict:
-    try:
-      logger.info(f"Loading data from the previous successful API call")
-      return load_json_file(self.last_query_result, fatal=True)
-    except json.JSONDecodeError as e:
-      logger.error(f"Failed to decode JSON from {self.last_query_result}: {e}")
-      raise APIError("Invalid test response file format.")
+  def cached_result(self, stale_ok: bool = False):
+    cached = result_cache.get(self.cache_key, stale_ok=stale_ok)
+    if cached is None:
+      return None
+
+    response_data, stored_at = cached
+    logger.info("Loading the result of an identical query cached %.0fs ago", time.time() - stored_at)
+    if self.test:
+      return response_data
+    # Commitments count down while the entry sits in the cache
+    return dict(response_data, records=age_records(response_data.get("records", []), time.time() - stored_at))
 
-  def hit_api(self) -> requests.Response:
+  def hit_api(self, url: str = None, query: str = None) -> requests.Response:
     logger.debug("API call invoked!")
-    logger.debug(f"Using query: {self.query}")
-    logger.debug(f"HTTP request to {self.api_url}")
+    params = None
+    if url is None:
+      url = self.api_url
+      params = {"q": query or self.query}
+      logger.debug("Using query: %s", params["q"])
+    logger.debug("HTTP request to %s", url)
 
     auth = HTTPBasicAuth(self.username, decrypt_password())
-    response = requests.get(self.api_url, headers={"Content-Type": "application/json"}, auth=auth, params={"q": self.query}, timeout=30)
+    response = self.send("GET", url, headers={"Content-Type": "application/json"}, auth=auth, params=params)
 
-    logger.debug(f"Response took {response.elapsed} and resulted in HTTP {response.status_code}")
+    logger.debug("Response took %s and resulted in HTTP %s", response.elapsed, response.status_code)
     return response
 
   def fetch_from_api(self) -> dict:
     logger.info("Fetching the data from the SalesForce API")
-    response = self.hit_api()
 
-    self.validate_response(response)
-    response_data = response.json()
+    started = time.perf_counter()
+    if len(self.queries) == 1:
+      results = [self.fetch_query(self.queries[0])]
+    else:
+      results = self.fetch_many(self.queries)
+    response_data = self.store_results(results)
 
-    self.cache_response(response.content, response_data)
+    record_fetch(started, sum(size for _, size in results), len(response_data.get("records", [])))
     return response_data
+
+  def store_results(self, results: list) -> dict:
+    """Merges the (data, size) result of each query into one response, keeps it for the change probe and caches it"""
+    self.signature = [result_signature(data) for data, _ in results]
+    if len(results) == 1:
+      response_data, content_size = results[0]
+    else:
+      response_data, content_size = self.merge_chunks(results)
+
+    _snapshots[tuple(self.queries)] = {
+      "signature": None if None in self.signature else self.signature,
+      "response": response_data,
+      "size": content_size,
+      "fetched_at": get_clock().time(),
+      "skips": 0,
+    }
+
+    self.cache_response(content_size, response_data)
+    return response_data
+
+  def post_api(self, url: str, body: dict) -> requests.Response:
+    logger.debug("HTTP POST to %s with %d batched requests", url, len(body.get("batchRequests", [])))
+
+    auth = HTTPBasicAuth(self.username, decrypt_password())
+    response = self.send("POST", url, json=body, auth=auth)
+
+    logger.debug("Response took %s and resulted in HTTP %s", response.elapsed, response.status_code)
+    return response
+
+  def send(self, method: str, url: str, **kwargs) -> requests.Response:
+    kind = latency_kind(method, url, kwargs.get("params"), kwargs.get("json"))
+    attempt = 0
+
+    while True:
+      try:
+        response = self.hedged(kind, method, url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+          return response
+        reason = f"HTTP {response.status_code}"
+      except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        if attempt >= self.max_retries:
+          raise
+        reason = type(e).__name__
+
+      # Full jitter keeps retries from several instances from landing together
+      delay = random.uniform(0, RETRY_BASE_SECONDS * 2 ** attempt)
+      attempt += 1
+      logger.warning(f"Transient {reason} from SalesForce, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+      telemetry.incr("api.retries")
+      time.sleep(delay)
+
+  def hedged(self, kind: str, method: str, url: str, **kwargs) -> requests.Response:
+    timeout = latency.timeout(kind)
+
+    def attempt():
+      budget.acquire()
+      started = time.perf_counter()
+      response = shared_session().request(method, url, timeout=(5, timeout), **kwargs)
+      if response.status_code < 500:
+        latency.observe(kind, time.perf_counter() - started)
+      budget.observe(response.headers)
+      return response
+
+    hedge_after = latency.hedge_delay(kind) if self.hedge_requests else None
+    if hedge_after is None:
+      return attempt()
+
+    primary = _hedge_pool.submit(attempt)
+    done, _ = wait([primary], timeout=hedge_after)
+    if done:
+      return primary.result()
+
+    logger.debug("%s request exceeded p95 (%.2fs), sending a hedged duplicate", kind, hedge_after)
+    telemetry.incr("api.hedges")
+    pending = {primary, _hedge_pool.submit(attempt)}
+    error = None
+
+    while pending:
+      done, pending = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        if future.exception() is None:
+          if future is not primary:
+            telemetry.incr("api.hedge_wins")
+          return future.result()
+        error = future.exception()
+    raise error
+
+  def fetch_query(self, query: str):
+    response = self.hit_api(query=query)
+
+    self.validate_response(response)
+    return self.follow_pages(response.json(), len(response.content))
+
+  def follow_pages(self, response_data: dict, content_size: int):
+    while not response_data.get("done", True) and response_data.get("nextRecordsUrl"):
+      logger.debug("Fetched %d of %s records, following nextRecordsUrl", len(response_data.get("records", [])), response_data.get("totalSize"))
+      response = self.hit_api(url=urljoin(self.api_url, response_data["nextRecordsUrl"]))
+      self.validate_response(response)
+
+      page = response.json()
+      content_size += len(response.content)
+      response_data["records"].extend(page.get("records", []))
+      response_data["done"] = page.get("done", True)
+      response_data["nextRecordsUrl"] = page.get("nextRecordsUrl")
+
+    response_data.pop("nextRecordsUrl", None)
+    return response_data, content_size
+
+  def stream_pages(self, query: str = None):
+    """
+    Yields (records, bytes) for each result page as it arrives. A result that stays within
+    rules.max_buffer_size_bytes is kept and cached once its last page arrived, a larger one
+    is never held in memory whole.
+    """
+    max_size = self.config_cls.get_config_value("rules.max_buffer_size_bytes")
+    kept, content_size = [], 0
+    response = self.hit_api(query=query or self.query)
+    while True:
+      self.validate_response(response)
+      page = response.json()
+      records = page.get("records", [])
+      content_size += len(response.content)
+      if content_size > max_size:
+        kept = None
+      elif kept is not None:
+        kept.extend(records)
+      yield records, len(response.content)
+
+      if page.get("done", True) or not page.get("nextRecordsUrl"):
+        break
+      logger.debug("Streamed a page of %d records, following nextRecordsUrl", len(records))
+      response = self.hit_api(url=urljoin(self.api_url, page["nextRecordsUrl"]))
+
+    if kept is not None and (query or self.query) == self.query and len(self.queries) == 1:
+      self.cache_response(content_size, {"totalSize": len(kept), "done": True, "records": kept})
+
+  def fetch_many(self, queries: list) -> list:
+    batch_url, _ = composite_batch_url(self.api_url)
+    use_batch = (
+      self.execution_mode == "batch" and len(queries) > 1 and
+      batch_url and self.api_url not in _batch_unsupported
+    )
+
+    if use_batch:
+      try:
+        return self.fetch_batch(queries)
+      except BatchUnsupported as e:
+        logger.warning(f"Composite batch is unavailable ({e}), falling back to concurrent requests")
+        _batch_unsupported.add(self.api_url)
+
+    workers = min(len(queries), self.max_workers)
+    logger.debug("Running %d queries across %d connections", len(queries), workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+      return list(pool.map(self.fetch_query, queries))
+
+  def fetch_batch(self, queries: list) -> list:
+    batch_url, version = composite_batch_url(self.api_url)
+    results = []
+
+    for start in range(0, len(queries), BATCH_LIMIT):
+      group = queries[start:start + BATCH_LIMIT]
+      body = {
+        "haltOnError": False,
+        "batchRequests": [{"method": "GET", "url": f"{version}/query?{urlencode({'q': query})}"} for query in group]
+      }
+      response = self.post_api(batch_url, body)
+
+      if response.status_code in (400, 404, 405):
+        raise BatchUnsupported(f"HTTP {response.status_code} {response.reason}")
+      self.validate_response(response)
+
+      sub_results = response.json().get("results", [])
+      if len(sub_results) != len(group):
+        raise BatchUnsupported(f"expected {len(group)} results but received {len(sub_results)}")
+
+      share = len(response.content) // len(group)
+      for result in sub_results:
+        status = result.get("statusCode")
+        if status != 200:
+          logger.debug("Batched query failed with: %s", result.get('result'))
+          raise APIError(f"HTTP {status} returned for a batched query")
+        results.append(self.follow_pages(result.get("result") or {}, share))
+
+    logger.debug("Fetched %d queries through %d composite batch request(s)", len(queries), -(-len(queries) // BATCH_LIMIT))
+    return results
+
+  def merge_chunks(self, results: list):
+    records = merge_records([data.get("records", []) for data, _ in results])
+    records = order_records(records, self.query)
+    logger.debug("Merged %d chunk records into %d cases", sum(len(data.get("records", [])) for data, _ in results), len(records))
+
+    response_data = {"totalSize": len(records), "done": True, "records": records}
+    return response_data, sum(size for _, size in results)
   
   def validate_response(self, response: requests.Response) -> None:
     logger.debug("Verifying the HTTP response code")
@@ -70,16 +499,22 @@ class APIHandler():
     if response.status_code != 200:
       self.handle_http_error(response)
   
-  def cache_response(self, content: bytes, response_data: dict) -> None:
+  def cache_response(self, content_size: int, response_data: dict) -> None:
     logger.debug("Attemping to cache the response from the previous API call")
 
     max_size = self.config_cls.get_config_value("rules.max_buffer_size_bytes")
 
-    if len(content) > max_size:
-      logger.error(f"Response size {len(content)} exceeds {max_size}. {FileNames.QueryResults} will not be written to.")
+    if content_size > max_size:
+      logger.error(f"Response size {content_size} exceeds {max_size}. The result will not be cached.")
       return
     
-    create_json_file(path=self.last_query_result, data=response_data, log_event=False)
+    result_cache.put(
+      self.cache_key,
+      response_data,
+      ttl=self.config_cls.get_config_value("rules.cache_ttl_seconds", default=60),
+      max_bytes=self.config_cls.get_config_value("rules.cache_max_bytes", default=50 * 1024 * 1024),
+      queries=self.queries
+    )
 
   def handle_http_error(self, response: requests.Response) -> None:
     logger.debug("HTTP call resulted in a non 200 code, thus handling the error")
@@ -105,13 +540,52 @@ class APIHandler():
     logger.error(f"Unexpected error: {response.status_code} {response.reason} - {response.text}")
     raise APIError(f"Error {response.status_code} {response.reason}. Unable to fetch data.")
 
+def run_together(handlers: list, use_cache: bool = True) -> list:
+  """
+  Serves several handlers of the same org from one round trip per step and returns one
+  record list per handler. Cached results are taken first, the change probes of the rest
+  go out together, and the queries still needing a full fetch share one fetch_many call.
+  """
+  started = time.perf_counter()
+  try:
+    responses = [handler.local_result(use_cache) for handler in handlers]
+
+    probes = {idx: handler.probe_queries() for idx, handler in enumerate(handlers) if responses[idx] is None and handler.change_probe and use_cache}
+    probing = [idx for idx, queries in probes.items() if queries]
+    if probing:
+      results = handlers[probing[0]].run_probes([probe for idx in probing for probe in probes[idx]])
+      if results is not None:
+        for idx, part in zip(probing, split_results(results, [handlers[idx] for idx in probing])):
+          responses[idx] = handlers[idx].probe_matched(part)
+
+    pending = [idx for idx, response in enumerate(responses) if response is None]
+    if pending:
+      logger.info("Fetching the data of %d handlers from the SalesForce API in one call", len(pending))
+      fetch_started = time.perf_counter()
+      results = handlers[pending[0]].fetch_many([query for idx in pending for query in handlers[idx].queries])
+      for idx, part in zip(pending, split_results(results, [handlers[idx] for idx in pending])):
+        responses[idx] = handlers[idx].store_results(part)
+        if handlers[idx].recorder:
+          handlers[idx].recorder.record(responses[idx].get('records', []))
+      record_fetch(fetch_started, sum(size for _, size in results), sum(len(responses[idx].get("records", [])) for idx in pending))
+    telemetry.flush()
+  except Exception:
+    telemetry.incr("poll.errors")
+    raise
+
+  record_poll(started)
+  return [response.get('records', []) for response in responses]
 
-def uploadToTseBoard(cases, config_class):
+def uploadToTseBoard(cases, config_class, views=None):
   tseBoardApi = config_class.get_config_value('front_end_board', default="http://localhost:3000/api/v1/uploadCases")
   payload = {
     "nextPollSetting": config_class.get_config_value("rules.poll_interval"),
     "cases": cases
   }
+  if views is not None:
+    # Partitioned payloads key cases by number and list them per view, owner and engineer
+    payload["payloadVersion"] = 2
+    payload["views"] = views
   try:
     response = requests.post(
       tseBoardApi,
@@ -0,0 +1,139 @@
+import json, os, re, threading, time
+from collections import deque
+from pathlib import Path
+from logger import logger, every
+from tools.telemetry import telemetry
+from utils.variables import FileNames, VARS
+
+LIMIT_HEADER = "Sforce-Limit-Info"
+BUDGET_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.Shared / "api-budget.json"
+
+# (remaining fraction at or above, poll interval multiplier)
+STRETCH_STEPS = ((0.5, 1), (0.25, 2), (0.1, 4), (0, 8))
+RECHECK_SECONDS = 15 * 60
+
+def parse_limit_info(value: str):
+  # per-app-api-usage reports a connected app's own allocation, not the org's
+  match = re.search(r"(?<![\w-])api-usage=(\d+)/(\d+)", value or "")
+  return (int(match.group(1)), int(match.group(2))) if match else None
+
+class ApiBudget():
+  """
+  Tracks the org's daily API allocation from the Sforce-Limit-Info header. The latest
+  reading is shared through config/shared so every instance on the host, including ones
+  that never call the API, stretches its poll interval as the allocation runs down.
+  """
+  def __init__(self, path: Path = BUDGET_PATH, reserve: float = 0.05, max_per_minute: int = 0):
+    self.path = Path(path)
+    self.reserve = reserve
+    self.max_per_minute = max_per_minute
+    self.lock = threading.Lock()
+    self.used = None
+    self.limit = None
+    self.observed_at = 0
+    self.saved_at = 0
+    self.samples = deque(maxlen=512)
+    self.request_times = deque()
+
+  def configure(self, reserve: float = 0.05, max_per_minute: int = 0):
+    self.reserve = reserve
+    self.max_per_minute = max_per_minute
+    return self
+
+  def observe(self, headers):
+    parsed = parse_limit_info(headers.get(LIMIT_HEADER))
+    if not parsed:
+      return
+
+    now = time.time()
+    with self.lock:
+      self.used, self.limit = parsed
+      self.observed_at = now
+      self.samples.append((now, self.used))
+
+    telemetry.gauge("api.used", self.used)
+    telemetry.gauge("api.limit", self.limit)
+    telemetry.gauge("api.remaining_pct", round(self.remaining_fraction() * 100, 2))
+    telemetry.gauge("api.poll_multiplier", self.poll_multiplier())
+
+    if now - self.saved_at >= 5:
+      self.save()
+
+  def save(self):
+    try:
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+      with open(tmp_path, "w") as f:
+        json.dump({"used": self.used, "limit": self.limit, "observed_at": self.observed_at}, f)
+      os.replace(tmp_path, self.path)
+      self.saved_at = self.observed_at
+    except OSError as e:
+      logger.debug("Unable to share the API budget through %s: %s", self.path, e)
+
+  def refresh(self):
+    try:
+      with open(self.path, "r") as f:
+        shared = json.load(f)
+    except (OSError, ValueError):
+      return
+    with self.lock:
+      if shared.get("observed_at", 0) > self.observed_at and shared.get("limit"):
+        self.used, self.limit, self.observed_at = shared["used"], shared["limit"], shared["observed_at"]
+        self.samples.append((self.observed_at, self.used))
+
+  def remaining_fraction(self):
+    if not self.limit:
+      return None
+    return max(0, self.limit - self.used) / self.limit
+
+  def hourly_burn(self):
+    cutoff = time.time() - 60 * 60
+    recent = [sample for sample in self.samples if sample[0] >= cutoff]
+    if len(recent) < 2 or recent[-1][1] < recent[0][1] or recent[-1][0] - recent[0][0] < 5 * 60:
+      return None
+    return (recent[-1][1] - recent[0][1]) / (recent[-1][0] - recent[0][0]) * 60 * 60
+
+  def poll_multiplier(self) -> int:
+    remaining = self.remaining_fraction()
+    if remaining is None:
+      return 1
+    return next(multiplier for floor, multiplier in STRETCH_STEPS if remaining >= floor)
+
+  def exhausted(self) -> bool:
+    # Readings go stale as the rolling 24h window frees calls, so re-check now and then
+    remaining = self.remaining_fraction()
+    fresh = time.time() - self.observed_at < RECHECK_SECONDS
+    return remaining is not None and remaining <= self.reserve and fresh
+
+  def acquire(self):
+    if not self.max_per_minute:
+      return
+    while True:
+      with self.lock:
+        now = time.monotonic()
+        while self.request_times and now - self.request_times[0] >= 60:
+          self.request_times.popleft()
+        if len(self.request_times) < self.max_per_minute:
+          self.request_times.append(now)
+          return
+        delay = 60 - (now - self.request_times[0])
+      logger.debug("Client-side rate limit reached, delaying the request %.1fs", delay, extra=every(10))
+      telemetry.incr("api.throttled")
+      time.sleep(delay)
+
+  def summary(self) -> str:
+    self.refresh()
+    remaining = self.remaining_fraction()
+    if remaining is None:
+      return ""
+    text = f"API {self.used:,}/{self.limit:,} used today ({remaining:.0%} left)"
+    burn = self.hourly_burn()
+    if burn:
+      text += f" • {burn:,.0f}/h"
+    if self.exhausted():
+      text += " • fetching paused"
+    elif self.poll_multiplier() > 1:
+      text += f" • polling x{self.poll_multiplier()} slower"
+    return text
+
+budget = ApiBudget()
@@ -0,0 +1,109 @@
+import hashlib, json, os, re, time
+from pathlib import Path
+from urllib.parse import urlparse
+from logger import logger
+from tools.telemetry import telemetry
+from utils.variables import FileNames, VARS
+
+CACHE_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.Cache
+
+# String literals are kept verbatim, whitespace between tokens collapses to one space
+SOQL_TOKENS = re.compile(r"'(?:\\.|[^'\\])*'|\s+|[^'\s]+")
+
+def normalize_soql(query: str) -> str:
+  tokens = [" " if token.isspace() else token for token in SOQL_TOKENS.findall(query.strip().rstrip(";"))]
+  return "".join(tokens).strip()
+
+def cache_key(api_url: str, username: str, queries: list) -> str:
+  org = urlparse(api_url or "").netloc.lower()
+  material = "\n".join([org, str(username or "").lower(), *(normalize_soql(query) for query in queries)])
+  return hashlib.sha1(material.encode()).hexdigest()
+
+class ResultCache():
+  """
+  Query results keyed by org, user and normalized SOQL, one file per entry. The first line
+  of each file holds the entry metadata so expiry checks never parse the records. A file's
+  mtime is its last use, hits touch it and eviction removes the least recently used files
+  once the directory grows past its byte limit. Entries are swapped in atomically.
+  """
+  def __init__(self, path: Path = CACHE_PATH):
+    self.path = Path(path)
+
+  def entry_path(self, key: str) -> Path:
+    return self.path / f"{key}.json"
+
+  def get(self, key: str, stale_ok: bool = False):
+    """Returns (response_data, stored_at) for a live entry, or for any entry when stale_ok"""
+    path = self.entry_path(key)
+    try:
+      with open(path, "r") as f:
+        meta = json.loads(f.readline())
+        expired = time.time() - meta["stored_at"] > meta["ttl"]
+        if expired and not stale_ok:
+          telemetry.incr("cache.expired")
+          return None
+        data = json.loads(f.read())
+      os.utime(path)
+    except FileNotFoundError:
+      telemetry.incr("cache.misses")
+      return None
+    except (OSError, ValueError, KeyError) as e:
+      logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+      self.remove(path)
+      return None
+
+    telemetry.incr("cache.hits")
+    return data, meta["stored_at"]
+
+  def put(self, key: str, response_data: dict, ttl: float, max_bytes: int, queries: list = None):
+    meta = {"stored_at": time.time(), "ttl": ttl, "queries": [normalize_soql(query)[:200] for query in queries or []]}
+    path = self.entry_path(key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+      self.path.mkdir(parents=True, exist_ok=True)
+      with open(tmp_path, "w") as f:
+        f.write(json.dumps(meta) + "\n")
+        json.dump(response_data, f, separators=(",", ":"))
+      os.replace(tmp_path, path)
+    except OSError as e:
+      logger.error(f"Unable to write cache entry {path.name}: {e}")
+      self.remove(tmp_path)
+      return
+    telemetry.incr("cache.writes")
+    self.evict(max_bytes)
+
+  def entries(self) -> list:
+    try:
+      files = [entry for entry in os.scandir(self.path) if entry.name.endswith(".json")]
+    except FileNotFoundError:
+      return []
+    stats = []
+    for entry in files:
+      try:
+        stat = entry.stat()
+      except FileNotFoundError:
+        continue
+      stats.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+    return stats
+
+  def evict(self, max_bytes: int):
+    entries = sorted(self.entries())
+    total = sum(size for _, size, _ in entries)
+    while entries and total > max_bytes:
+      _, size, path = entries.pop(0)
+      self.remove(path)
+      total -= size
+      telemetry.incr("cache.evictions")
+      logger.debug("Evicted cache entry %s to stay under %d bytes", path.name, max_bytes)
+
+  def clear(self):
+    for _, _, path in self.entries():
+      self.remove(path)
+
+  def remove(self, path: Path):
+    try:
+      os.remove(path)
+    except OSError:
+      pass
+
+result_cache = ResultCache()
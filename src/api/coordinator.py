@@ -0,0 +1,257 @@
+import hashlib, json, os, time
+import requests
+from pathlib import Path
+from exceptions import APIError
+from logger import logger
+from api.api_handler import age_records, run_together
+from api.budget import budget
+from tools.telemetry import telemetry
+from utils.variables import FileNames, VARS
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+  import msvcrt
+
+SHARED_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.Shared
+
+def queries_key(queries: list) -> str:
+  return hashlib.sha1("\n".join(queries).encode()).hexdigest()[:16]
+
+def org_key(api_url: str, username: str) -> str:
+  return hashlib.sha1(f"{api_url}\n{username}".encode()).hexdigest()[:16]
+
+class FileLock():
+  def __init__(self, path: Path):
+    self.path = Path(path)
+    self.handle = None
+
+  def acquire(self) -> bool:
+    if self.handle:
+      return True
+    handle = open(self.path, "a+")
+    try:
+      if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+      else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+      handle.close()
+      return False
+
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    self.handle = handle
+    return True
+
+  def release(self):
+    if not self.handle:
+      return
+    try:
+      if fcntl:
+        fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+      else:
+        self.handle.seek(0)
+        msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+    finally:
+      self.handle.close()
+      self.handle = None
+
+class SharedFetch():
+  """
+  Elects one process per org on this host to call SalesForce. Every process registers its
+  query set in config/shared. The leader holds an advisory lock and fetches the union of the
+  registered sets in one run_together round trip, then publishes a snapshot per set by
+  atomically swapping a JSON file. Followers read the file of their own set and watch its
+  mtime for new data. The lock dies with its process, so a follower takes over on its next
+  cycle when the leader exits.
+
+  poll_minutes returns the current poll interval, which stretches as the API budget runs
+  down, so staleness is judged against the interval in effect right now.
+  """
+  def __init__(self, poll_minutes, path: Path = SHARED_PATH):
+    self.path = Path(path)
+    self.poll_minutes = poll_minutes
+    self.lock = None
+    self.org = None
+    self.key = None
+    self.seen_mtime = None
+
+  @property
+  def leader(self) -> bool:
+    return self.lock is not None and self.lock.handle is not None
+
+  def snapshot_path(self, key: str = None) -> Path:
+    return self.path / f"snapshot-{self.org}-{key or self.key}.json"
+
+  def registry_path(self) -> Path:
+    return self.path / f"sets-{self.org}"
+
+  def registration_path(self) -> Path:
+    return self.registry_path() / f"{self.key}-{os.getpid()}.json"
+
+  def bind(self, api_handler):
+    org = org_key(api_handler.api_url, api_handler.username)
+    if org != self.org:
+      self.close()
+      self.org, self.key = org, None
+      self.lock = FileLock(self.path / f"fetch-{org}.lock")
+      self.registry_path().mkdir(parents=True, exist_ok=True)
+
+    key = queries_key(api_handler.queries)
+    if key != self.key:
+      self.unregister()
+      self.key = key
+      self.seen_mtime = None
+    self.register(api_handler.queries)
+
+  def register(self, queries: list):
+    # Rewritten every cycle, the mtime tells the leader this process is still polling
+    self.write_json(self.registration_path(), {"queries": queries, "pid": os.getpid(), "poll_minutes": self.poll_minutes()})
+
+  def unregister(self):
+    if self.key is None:
+      return
+    try:
+      self.registration_path().unlink(missing_ok=True)
+    except OSError:
+      pass
+
+  def registered_sets(self) -> dict:
+    """Query sets of the other live processes of this org, by key"""
+    sets = {}
+    now = time.time()
+    for path in sorted(self.registry_path().glob("*.json")):
+      try:
+        age = now - path.stat().st_mtime
+        with open(path, "r") as f:
+          registration = json.load(f)
+      except (OSError, ValueError):
+        continue
+
+      if age > registration.get("poll_minutes", 0) * 60 * 2 + 60:
+        # The process exited or stopped polling
+        path.unlink(missing_ok=True)
+        continue
+      key = queries_key(registration["queries"])
+      if key != self.key:
+        sets.setdefault(key, registration["queries"])
+    return sets
+
+  def run(self, api_handler, stream_fetch=None, use_cache: bool = True) -> list:
+    if api_handler.rerender or api_handler.test_mode():
+      return stream_fetch() if stream_fetch else api_handler.run(use_cache=use_cache)
+
+    self.bind(api_handler)
+    was_leader = self.leader
+    if self.lock.acquire():
+      if not was_leader:
+        logger.info(f"This process is now the fetch leader for org {self.org}")
+      return self.lead(api_handler, stream_fetch, use_cache)
+
+    snapshot = self.read()
+    if snapshot is None:
+      logger.warning(f"No fresh shared snapshot for query set {self.key}, fetching directly")
+      telemetry.incr("shared.fallbacks")
+      return stream_fetch() if stream_fetch else api_handler.run(use_cache=use_cache)
+
+    telemetry.incr("shared.reads")
+    logger.debug("Using the shared snapshot published by the fetch leader at %s", snapshot["fetched_at"])
+    return age_records(snapshot["records"], time.time() - snapshot["fetched_at"])
+
+  def lead(self, api_handler, stream_fetch, use_cache: bool) -> list:
+    """Fetches this process's set together with the sets registered by the others and publishes each"""
+    others = self.registered_sets()
+    handlers = [api_handler.for_queries(queries) for queries in others.values()]
+    if stream_fetch or not handlers:
+      # A streamed set is kept current by its events, only the other sets need the round trip
+      records = stream_fetch() if stream_fetch else api_handler.run(use_cache=use_cache)
+      results = self.fetch_together(handlers, use_cache) if handlers else []
+    else:
+      results = self.fetch_together([api_handler, *handlers], use_cache)
+      records = results.pop(0) if results else api_handler.run(use_cache=use_cache)
+
+    self.publish(records)
+    for key, set_records in zip(others, results):
+      self.publish(set_records, key)
+    return records
+
+  def fetch_together(self, handlers: list, use_cache: bool) -> list:
+    try:
+      return run_together(handlers, use_cache)
+    except (APIError, requests.exceptions.RequestException) as e:
+      logger.warning(f"Fetching the query sets of the other processes failed, they fall back to their own fetch: {e}")
+      telemetry.incr("shared.union_errors")
+      return []
+
+  def publish(self, records: list, key: str = None):
+    target = self.snapshot_path(key)
+    if self.write_json(target, {"fetched_at": time.time(), "pid": os.getpid(), "records": records}):
+      if key is None:
+        self.seen_mtime = target.stat().st_mtime_ns
+      telemetry.incr("shared.publishes")
+
+  def write_json(self, target: Path, data: dict) -> bool:
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+      with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+      os.replace(tmp_path, target)
+      return True
+    except OSError as e:
+      logger.error(f"Unable to write {target}: {e}")
+      return False
+
+  def read(self):
+    target = self.snapshot_path()
+    try:
+      mtime = target.stat().st_mtime_ns
+      with open(target, "r") as f:
+        snapshot = json.load(f)
+    except (OSError, ValueError):
+      return None
+
+    self.seen_mtime = mtime
+    age = time.time() - snapshot.get("fetched_at", 0)
+    if age > self.stale_after():
+      # The leader may have stretched its polling since this process last saw the budget
+      budget.refresh()
+      if age > self.stale_after():
+        return None
+    return snapshot
+
+  def stale_after(self) -> float:
+    # A follower falls back to fetching once the leader has missed two polls
+    return self.poll_minutes() * 60 * 2 + 60
+
+  def changed(self) -> bool:
+    if self.key is None or self.leader:
+      return False
+    try:
+      return self.snapshot_path().stat().st_mtime_ns != self.seen_mtime
+    except OSError:
+      return False
+
+  def wait(self, timeout: float, interval: float = 1) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+      if self.changed():
+        return True
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        return False
+      time.sleep(min(interval, remaining))
+
+  def close(self):
+    self.unregister()
+    if self.lock:
+      self.lock.release()
+
+def shared_fetch(config_data: dict, poll_minutes):
+  if not config_data.get("rules").get("shared_fetch", True):
+    return None
+  return SharedFetch(poll_minutes)
@@ -0,0 +1,38 @@
+import threading
+from collections import deque
+from tools.telemetry import percentile, telemetry
+
+DEFAULT_TIMEOUT = 30
+MIN_TIMEOUT = 5
+MIN_SAMPLES = 20
+
+class LatencyTracker():
+  """
+  Rolling latency window per request kind. Once enough samples exist the read timeout
+  follows the observed p99 and requests slower than p95 become candidates for hedging.
+  """
+  def __init__(self, window: int = 256):
+    self.window = window
+    self.lock = threading.Lock()
+    self.samples = {}
+
+  def observe(self, kind: str, seconds: float):
+    with self.lock:
+      self.samples.setdefault(kind, deque(maxlen=self.window)).append(seconds)
+    telemetry.observe(f"api.latency.{kind}", seconds)
+
+  def quantile(self, kind: str, pct: float):
+    with self.lock:
+      values = list(self.samples.get(kind, ()))
+    return percentile(values, pct) if len(values) >= MIN_SAMPLES else None
+
+  def timeout(self, kind: str) -> float:
+    p99 = self.quantile(kind, 99)
+    if p99 is None:
+      return DEFAULT_TIMEOUT
+    return min(DEFAULT_TIMEOUT, max(MIN_TIMEOUT, p99 * 3))
+
+  def hedge_delay(self, kind: str):
+    return self.quantile(kind, 95)
+
+latency = LatencyTracker()
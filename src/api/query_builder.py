@@ -0,0 +1,179 @@
+import re
+from string import Formatter
+from exceptions import BadQuery
+from logger import logger
+from utils.helper import define_query_columns
+
+OWNER_PLACEHOLDERS = {"support_group", "engineer_list", "team_list"}
+
+PLACEHOLDERS = {
+  "excluded_product_list",
+  "support_group",
+  "engineer_name",
+  "engineer_list",
+  "team_list",
+  "update_threshold",
+}
+
+def escape_soql(value) -> str:
+  return (
+    str(value)
+      .replace("\\", "\\\\")
+      .replace("'", "\\'")
+      .replace("\n", "\\n")
+      .replace("\r", "\\r")
+      .replace("\t", "\\t")
+  )
+
+# A placeholder inside a quoted LIKE pattern, e.g. LIKE '%{engineer_name}%'
+LIKE_PREFIX = re.compile(r"\bLIKE\s+'(?:[^'\\]|\\.)*$", re.IGNORECASE)
+
+def escape_like(value: str) -> str:
+  return value.replace("%", "\\%").replace("_", "\\_")
+
+def render_value(value, like: bool = False) -> str:
+  if like and isinstance(value, str):
+    # Wildcards in the value itself are matched literally
+    return escape_like(escape_soql(value))
+  if isinstance(value, (list, tuple, set, frozenset)):
+    # An empty IN () is invalid SOQL, an empty literal keeps the clause valid and matches nothing
+    items = sorted(str(item).strip() for item in value) or [""]
+    return ", ".join(f"'{escape_soql(item)}'" for item in items)
+  if isinstance(value, bool):
+    return "TRUE" if value else "FALSE"
+  if isinstance(value, (int, float)):
+    return f"{value:.8f}".rstrip("0").rstrip(".")
+  return escape_soql(value)
+
+def fingerprint(inputs: dict) -> tuple:
+  items = []
+  for key, value in sorted(inputs.items()):
+    if isinstance(value, (list, tuple, set, frozenset)):
+      value = tuple(sorted(str(item).strip() for item in value))
+    items.append((key, value))
+  return tuple(items)
+
+class QueryTemplate():
+  def __init__(self, name: str, text: str):
+    self.name = name
+    self.text = text
+    self.placeholders = set()
+    # (literal text, placeholder or None, whether the placeholder sits in a LIKE pattern)
+    self.segments = []
+
+    try:
+      prefix = ""
+      for literal, field, spec, conversion in Formatter().parse(text):
+        prefix += literal
+        if field is None:
+          self.segments.append((literal, None, False))
+          continue
+        if not field or spec or conversion:
+          raise BadQuery(f"Query '{name}' has an unsupported placeholder '{{{field}}}'")
+        if field not in PLACEHOLDERS:
+          raise BadQuery(f"Query '{name}' uses the unknown placeholder '{{{field}}}'")
+        self.placeholders.add(field)
+        self.segments.append((literal, field, bool(LIKE_PREFIX.search(prefix))))
+        prefix += "{}"
+    except ValueError as e:
+      raise BadQuery(f"Query '{name}' is malformed: {e}")
+
+    self.columns = define_query_columns(text)
+
+  def render(self, inputs: dict) -> str:
+    missing = self.placeholders - inputs.keys()
+    if missing:
+      raise BadQuery(f"Query '{self.name}' is missing values for {sorted(missing)}")
+    values = {}
+    for literal, field, like in self.segments:
+      if field and (field, like) not in values:
+        values[field, like] = render_value(inputs[field], like=like)
+    return "".join(literal + (values[field, like] if field else "") for literal, field, like in self.segments)
+
+class RenderedQuery():
+  def __init__(self, name: str, query: str, columns: list, key: tuple):
+    self.name = name
+    self.query = query
+    self.columns = columns
+    self.key = key
+
+class QueryBuilder():
+  def __init__(self, queries: dict):
+    self.templates = {name: QueryTemplate(name, text) for name, text in queries.items()}
+    self.rendered = {}
+    logger.debug("Compiled %d query templates: %s", len(self.templates), list(self.templates))
+
+  def render(self, name: str, **inputs) -> RenderedQuery:
+    template = self.templates.get(name)
+    if template is None:
+      raise BadQuery(f"No query named '{name}' is configured")
+
+    key = fingerprint({k: v for k, v in inputs.items() if k in template.placeholders})
+    cached = self.rendered.get(name)
+    if cached and cached.key == key:
+      return cached
+
+    rendered = RenderedQuery(name, template.render(inputs), template.columns, key)
+    self.rendered[name] = rendered
+    logger.debug("Query '%s' was rebuilt because its inputs changed", name)
+    return rendered
+
+  def render_chunks(self, name: str, max_length: int, **inputs) -> list:
+    """
+    Renders one query, or several when the owner IN-lists push it past max_length.
+    Owners are split into balanced groups and each chunk keeps every owner list
+    filtered to its group, so the union of the chunk results equals the full query.
+    """
+    template = self.templates.get(name)
+    if template is None:
+      raise BadQuery(f"No query named '{name}' is configured")
+
+    key = (max_length, fingerprint({k: v for k, v in inputs.items() if k in template.placeholders}))
+    cached = self.rendered.get((name, "chunks"))
+    if cached and cached[0] == key:
+      return cached[1]
+
+    full = self.render(name, **inputs)
+    chunks = [full]
+    owner_fields = [field for field in template.placeholders if field in OWNER_PLACEHOLDERS]
+
+    if max_length and len(full.query) > max_length and owner_fields:
+      chunks = self.split_owners(template, inputs, owner_fields, max_length)
+
+    self.rendered[(name, "chunks")] = (key, chunks)
+    return chunks
+
+  def split_owners(self, template: QueryTemplate, inputs: dict, owner_fields: list, max_length: int) -> list:
+    owners = sorted({str(owner).strip() for field in owner_fields for owner in inputs[field]})
+    empty = dict(inputs, **{field: [] for field in owner_fields})
+    budget = max_length - len(template.render(empty))
+
+    if budget <= 0:
+      logger.warning(f"Query '{template.name}' exceeds {max_length} characters without any owners, it cannot be chunked")
+      return [self.render(template.name, **inputs)]
+
+    # Each owner costs its quoted length plus a separator in every list it belongs to
+    field_members = [{str(owner).strip() for owner in inputs[field]} for field in owner_fields]
+    cost = {owner: sum(len(render_value([owner])) + 2 for members in field_members if owner in members) for owner in owners}
+    bins = max(2, -(-sum(cost.values()) // budget))
+
+    while True:
+      groups = [[] for _ in range(bins)]
+      loads = [0] * bins
+      for owner in sorted(owners, key=lambda o: -cost[o]):
+        target = loads.index(min(loads))
+        groups[target].append(owner)
+        loads[target] += cost[owner]
+
+      chunks = []
+      for idx, group in enumerate(g for g in groups if g):
+        members = set(group)
+        chunk_inputs = dict(inputs, **{field: [o for o in inputs[field] if str(o).strip() in members] for field in owner_fields})
+        chunks.append(RenderedQuery(f"{template.name}#{idx}", template.render(chunk_inputs), template.columns, None))
+
+      if all(len(chunk.query) <= max_length for chunk in chunks) or bins >= len(owners):
+        break
+      bins += 1
+
+    logger.info("Query '%s' split into %d chunks to stay under %d characters", template.name, len(chunks), max_length)
+    return chunks
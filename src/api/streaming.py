@@ -0,0 +1,269 @@
+import queue, re, threading, time
+import requests
+from requests.auth import HTTPBasicAuth
+from exceptions import APIError, StreamDropped
+from logger import logger
+from api.api_handler import age_records, order_records
+from tools.encryption import decrypt_password
+from tools.telemetry import telemetry
+
+DEFAULT_CHANNEL = "/data/CaseChangeEvent"
+
+def cometd_url(api_url: str):
+  match = re.search(r"^(.*)/services/data/v(\d+\.\d+)/query/?$", api_url or "")
+  return f"{match.group(1)}/cometd/{match.group(2)}" if match else None
+
+def record_id(record: dict):
+  return record.get("Id") or (record.get("attributes") or {}).get("url", "").rsplit("/", 1)[-1] or None
+
+def filter_fields(query: str) -> set:
+  match = re.search(r"\bWHERE\b(.*?)(?:\bORDER\s+BY\b|\bLIMIT\b|$)", query, re.IGNORECASE | re.DOTALL)
+  if not match:
+    return set()
+
+  fields = set()
+  for name in re.findall(r"[A-Za-z_][\w.]*", re.sub(r"'(?:\\.|[^'])*'", "", match.group(1))):
+    fields.add(name)
+    if "." in name:
+      # Owner.Name changes arrive as OwnerId, Product__r.Name as Product__c
+      relation = name.split(".")[0]
+      fields.add(relation[:-1] + "c" if relation.endswith("__r") else relation + "Id")
+  return fields
+
+class StreamingClient():
+  """
+  Minimal Bayeux long-polling client for the SalesForce streaming endpoint. A daemon
+  thread keeps the /meta/connect loop alive, queues event payloads, and reconnects with
+  backoff (replaying from the last seen replayId) whenever the connection drops.
+  """
+  def __init__(self, api_url: str, username: str, channel: str = DEFAULT_CHANNEL, timeout: int = 120):
+    self.endpoint = cometd_url(api_url)
+    self.username = username
+    self.channel = channel
+    self.timeout = timeout
+    self.session = requests.Session()
+    self.events = queue.Queue()
+    self.pending = threading.Event()
+    self.connected = threading.Event()
+    self.stopped = threading.Event()
+    self.client_id = None
+    self.replay_id = -1
+    self.sessions = 0
+    self.thread = None
+
+  def start(self):
+    if self.endpoint is None:
+      logger.warning("The api_url does not look like a SalesForce query endpoint, streaming is disabled")
+      return self
+    self.thread = threading.Thread(target=self.listen, name="case-stream", daemon=True)
+    self.thread.start()
+    return self
+
+  def stop(self):
+    self.stopped.set()
+    if self.client_id:
+      try:
+        self.send({"channel": "/meta/disconnect", "clientId": self.client_id}, timeout=5)
+      except (APIError, requests.exceptions.RequestException):
+        pass
+    self.connected.clear()
+
+  def send(self, message: dict, timeout: float = 30) -> list:
+    auth = HTTPBasicAuth(self.username, decrypt_password())
+    response = self.session.post(self.endpoint, json=[message], auth=auth, timeout=timeout)
+    if response.status_code != 200:
+      raise StreamDropped(f"HTTP {response.status_code} {response.reason}")
+    return response.json()
+
+  def reply(self, messages: list, channel: str) -> dict:
+    for message in messages:
+      if message.get("channel") == channel:
+        if not message.get("successful"):
+          raise StreamDropped(f"{channel} failed: {message.get('error', 'unknown error')}")
+        return message
+    raise StreamDropped(f"No reply received for {channel}")
+
+  def handshake(self):
+    handshake = self.reply(self.send({
+      "channel": "/meta/handshake",
+      "version": "1.0",
+      "supportedConnectionTypes": ["long-polling"],
+    }), "/meta/handshake")
+    self.client_id = handshake["clientId"]
+
+    self.reply(self.send({
+      "channel": "/meta/subscribe",
+      "clientId": self.client_id,
+      "subscription": self.channel,
+      "ext": {"replay": {self.channel: self.replay_id}},
+    }), "/meta/subscribe")
+
+    self.sessions += 1
+    self.connected.set()
+    logger.info(f"Subscribed to {self.channel} on {self.endpoint}")
+
+  def connect(self):
+    messages = self.send({
+      "channel": "/meta/connect",
+      "clientId": self.client_id,
+      "connectionType": "long-polling",
+    }, timeout=self.timeout + 10)
+
+    for message in messages:
+      if message.get("channel") == self.channel:
+        data = message.get("data") or {}
+        self.replay_id = (data.get("event") or {}).get("replayId", self.replay_id)
+        self.events.put(data.get("payload") or {})
+        self.pending.set()
+        telemetry.incr("stream.events")
+
+    self.reply(messages, "/meta/connect")
+
+  def listen(self):
+    backoff = 1
+    while not self.stopped.is_set():
+      try:
+        if self.client_id is None:
+          self.handshake()
+          backoff = 1
+        self.connect()
+      except (StreamDropped, requests.exceptions.RequestException, ValueError, KeyError) as e:
+        if self.stopped.is_set():
+          break
+        if self.connected.is_set():
+          logger.warning(f"The case stream dropped ({e}), falling back to polling until it reconnects")
+          telemetry.incr("stream.drops")
+        else:
+          logger.debug("Unable to connect the case stream: %s", e)
+        self.connected.clear()
+        self.client_id = None
+        self.stopped.wait(backoff)
+        backoff = min(backoff * 2, 60)
+
+  def drain(self) -> list:
+    self.pending.clear()
+    events = []
+    while True:
+      try:
+        events.append(self.events.get_nowait())
+      except queue.Empty:
+        return events
+
+class CaseStream():
+  """
+  Keeps the last polled snapshot current from change events. Updates that only touch
+  columns the snapshot already holds are applied in place and deletions drop the case.
+  New cases, owner moves and changes to filtered fields trigger a full resync through
+  the regular APIHandler, which is also used on every cycle while the stream is down.
+  """
+  def __init__(self, client: StreamingClient, resync_minutes: float = 60, coalesce_seconds: float = 1):
+    self.client = client
+    self.resync_seconds = resync_minutes * 60
+    self.coalesce_seconds = coalesce_seconds
+    self.records = None
+    self.queries = None
+    self.where_fields = set()
+    self.session = None
+    self.synced_at = 0
+
+  def start(self):
+    self.client.start()
+    return self
+
+  def stop(self):
+    self.client.stop()
+
+  def live(self) -> bool:
+    return self.client.connected.is_set()
+
+  def wait(self, timeout: float) -> bool:
+    if not self.client.pending.wait(timeout):
+      return False
+    # Let a burst of related events land before re-rendering
+    self.client.stopped.wait(self.coalesce_seconds)
+    return True
+
+  def discard(self) -> int:
+    """Drops the pending events for a caller that refetches instead of applying them"""
+    return len(self.client.drain())
+
+  def run(self, api_handler) -> list:
+    events = self.client.drain()
+    stale = (
+      self.records is None or not self.live() or
+      self.session != self.client.sessions or
+      api_handler.queries != self.queries or api_handler.rerender or
+      time.time() - self.synced_at >= self.resync_seconds
+    )
+
+    if stale or not self.apply(events):
+      return self.resync(api_handler)
+
+    logger.debug("Applied %d change events to the %d case snapshot", len(events), len(self.records))
+    return age_records(self.records, time.time() - self.synced_at)
+
+  def resync(self, api_handler) -> list:
+    self.session = self.client.sessions
+    synced_at = time.time()
+    # A resync follows missed or unappliable events, a cached result would hide them
+    records = api_handler.run(use_cache=False)
+
+    self.records = list(records)
+    self.queries = list(api_handler.queries)
+    self.where_fields = set().union(*(filter_fields(query) for query in self.queries))
+    self.synced_at = synced_at
+    telemetry.incr("stream.resyncs")
+    return records
+
+  def apply(self, events: list) -> bool:
+    if not events:
+      return True
+
+    index = {record_id(record): idx for idx, record in enumerate(self.records)}
+    deleted = set()
+
+    for payload in events:
+      header = payload.get("ChangeEventHeader") or {}
+      if header.get("entityName", "Case") != "Case":
+        continue
+
+      change_type = header.get("changeType", "")
+      record_ids = header.get("recordIds") or []
+
+      if change_type == "DELETE":
+        deleted.update(record_ids)
+        continue
+      if change_type != "UPDATE":
+        logger.debug("A %s change event requires a full resync", change_type)
+        return False
+
+      fields = {field: payload.get(field) for field in header.get("changedFields") or []}
+      for case_id in record_ids:
+        idx = index.get(case_id)
+        if idx is None:
+          # An update to a filtered field may move a case into the queue
+          if fields.keys() & self.where_fields:
+            return False
+          continue
+        record = self.records[idx]
+        if any(field not in record or field in self.where_fields for field in fields):
+          return False
+        self.records[idx] = dict(record, **fields)
+
+    if deleted:
+      self.records = [record for record in self.records if record_id(record) not in deleted]
+    self.records = order_records(self.records, self.queries[0])
+    telemetry.incr("stream.applied", len(events))
+    return True
+
+def case_stream(config_data: dict):
+  rules = config_data.get("rules")
+  if not rules.get("streaming", False):
+    return None
+
+  client = StreamingClient(
+    api_url=config_data.get("api_url"),
+    username=config_data.get("username"),
+    channel=rules.get("streaming_channel", DEFAULT_CHANNEL)
+  )
+  return CaseStream(client, resync_minutes=rules.get("streaming_resync_minutes", 60))
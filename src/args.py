@@ -10,6 +10,7 @@ from config.config import Config, rewrite_configuration
 from config.team import Team
 from config.filereg import FileReg
 from tools.tools import Tools
+from tools.export import FORMATS
 
 def user_defined_args(args):
   arg_obj = {
@@ -22,12 +23,21 @@ def user_defined_args(args):
     VARS.Role: False,
     VARS.Exclude: False,
     VARS.Clean: False,
-    VARS.Vacation: False
+    VARS.Vacation: False,
+    VARS.History: False,
+    VARS.Mock: False,
+    VARS.Replay: False,
+    VARS.Daemon: False
   }
   if "-H" in args or "-h" in args:
     print_help_page()
     handle_shutdown()
+  # Values read by position after a flag are skipped, so paths like snapshots-2026-10-19.jsonl.gz are not taken for flags
+  skip = 0
   for idx, arg in enumerate(args[1:]):
+    if skip:
+      skip -= 1
+      continue
     arg = str(arg).strip().upper()
     if '-' not in arg: continue
 
@@ -41,10 +51,29 @@ def user_defined_args(args):
       month_arg = str(args[idx + 2])
       day_arg = str(args[idx + 3])
       arg_obj[VARS.Vacation] = f"{month_arg} {day_arg}"
+      skip = 2
 
     elif arg == "-TEST": arg_obj[VARS.Test] = True
     elif arg == "-S":    arg_obj[VARS.Setup] = True
-    elif arg == "-Q":    arg_obj[VARS.Simulate] = True
+    elif arg == "-Q":
+      has_format = idx + 2 < len(args) and not str(args[idx + 2]).startswith('-')
+      export_format = str(args[idx + 2]).lower() if has_format else "print"
+      has_value = has_format and idx + 3 < len(args) and not str(args[idx + 3]).startswith('-')
+
+      if export_format == "bench":
+        runs_arg = str(args[idx + 3]) if has_value else "10"
+        if not runs_arg.isdigit() or int(runs_arg) < 1:
+          handle_shutdown(1, reason="Error: '-q bench' may only be followed by a number of runs and 'mock' or an API url")
+        has_target = has_value and idx + 4 < len(args) and not str(args[idx + 4]).startswith('-')
+        arg_obj[VARS.Simulate] = {"format": export_format, "runs": int(runs_arg), "target": str(args[idx + 4]) if has_target else None}
+        skip = 1 + has_value + has_target
+
+      elif export_format in FORMATS:
+        arg_obj[VARS.Simulate] = {"format": export_format, "path": str(args[idx + 3]) if has_value else None}
+        skip = has_format + has_value
+
+      else:
+        handle_shutdown(1, reason=f"Error: '-q' may only be followed by one of {', '.join(FORMATS)} and an output path, or by 'bench'")
     
     elif arg == "-T":
       if idx + 2 >= len(args):
@@ -55,6 +84,7 @@ def user_defined_args(args):
         elif val == 'remove': arg_obj[VARS.Team] = 'remove'
         elif val == 'toggle': arg_obj[VARS.Team] = 'toggle'
         else: arg_obj[VARS.Team] = True
+        skip = int(arg_obj[VARS.Team] is not True)
 
     elif arg == "-E":
       if idx + 1 >= len(args[1:]):
@@ -64,6 +94,7 @@ def user_defined_args(args):
 
       if next_arg == "product":
         arg_obj[VARS.Exclude] = {"type": "product"}
+        skip = 1
 
       elif next_arg == "case":
         case_value_idx = idx + 3
@@ -76,12 +107,52 @@ def user_defined_args(args):
           "type": "case",
           "value": case_value
         }
+        skip = 2
 
       else:
         handle_shutdown(1, reason=f"Error: Invalid exclusion type '{next_arg}'. Must be 'Case' or 'Product'")
     
     elif arg == "-CLEAN": arg_obj[VARS.Clean] = True
 
+    elif arg == "-HISTORY":
+      has_value = idx + 2 < len(args) and not str(args[idx + 2]).startswith('-')
+      hours_arg = str(args[idx + 2]) if has_value else "24"
+      if not hours_arg.isdigit():
+        handle_shutdown(1, reason="Error: '-history' may only be followed by a number of hours")
+      arg_obj[VARS.History] = int(hours_arg)
+      skip = int(has_value)
+
+    elif arg == "-MOCK":
+      has_value = idx + 2 < len(args) and not str(args[idx + 2]).startswith('-')
+      port_arg = str(args[idx + 2]) if has_value else "8799"
+      if not port_arg.isdigit():
+        handle_shutdown(1, reason="Error: '-mock' may only be followed by a port number")
+      arg_obj[VARS.Mock] = int(port_arg)
+      skip = int(has_value)
+
+    elif arg == "-REPLAY":
+      if idx + 2 >= len(args) or str(args[idx + 2]).startswith('-'):
+        handle_shutdown(1, reason="Error: '-replay' must be followed by a snapshot archive and optionally a speed")
+
+      speed = 0
+      has_speed = idx + 3 < len(args) and not str(args[idx + 3]).startswith('-')
+      if has_speed:
+        try:
+          speed = float(args[idx + 3])
+        except ValueError:
+          handle_shutdown(1, reason="Error: the '-replay' speed must be a number, use 0 to replay as fast as possible")
+
+      arg_obj[VARS.Replay] = {"archive": str(args[idx + 2]), "speed": speed}
+      skip = 1 + has_speed
+
+    elif arg == "-DAEMON":
+      has_value = idx + 2 < len(args) and not str(args[idx + 2]).startswith('-')
+      port_arg = str(args[idx + 2]) if has_value else "8800"
+      if not port_arg.isdigit():
+        handle_shutdown(1, reason="Error: '-daemon' may only be followed by a port number")
+      arg_obj[VARS.Daemon] = int(port_arg)
+      skip = int(has_value)
+
     else:
       print_help_page()
       handle_shutdown(1, reason=f"Unknown argument: {arg}")
@@ -96,14 +167,16 @@ def argument_handler(arg_obj):
   if arg_obj[VARS.Test]:  testMode = True
 
   if arg_obj[VARS.Vacation]: tool_class.run(type=VARS.Vacation, extras=arg_obj[VARS.Vacation])
-  if arg_obj[VARS.Simulate]: tool_class.run(type=VARS.Simulate, extras=base_logger)
+  if arg_obj[VARS.Simulate]: tool_class.run(type=VARS.Simulate, extras=arg_obj[VARS.Simulate])
   if arg_obj[VARS.Exclude]:  tool_class.run(type=VARS.Exclude, extras=arg_obj[VARS.Exclude])
   if arg_obj[VARS.Config]:   tool_class.run(type=VARS.Config, extras=None)
   if arg_obj[VARS.Clean]:    tool_class.run(type=VARS.Clean, extras=None)
   if arg_obj[VARS.Setup]:    tool_class.run(type=VARS.Setup, extras=None)
   if arg_obj[VARS.Role]:     tool_class.run(type=VARS.Role, extras=None)
   if arg_obj[VARS.Team]:     tool_class.run(type=VARS.Team, extras=arg_obj[VARS.Team])
+  if arg_obj[VARS.History]:  tool_class.run(type=VARS.History, extras=arg_obj[VARS.History])
+  if arg_obj[VARS.Mock]:     tool_class.run(type=VARS.Mock, extras=arg_obj[VARS.Mock])
 
   base_logger.info(f"Arguments passed in include: {arg_obj}")
 
-  return {VARS.Debug: debug, VARS.Test: testMode}
\ No newline at end of file
+  return {VARS.Debug: debug, VARS.Test: testMode, VARS.Replay: arg_obj[VARS.Replay], VARS.Daemon: arg_obj[VARS.Daemon]}
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 from utils.variables import FileNames
 from utils.helper import logger, handle_shutdown
+from logger import every
 
 class Cases():
   def __init__(self):
@@ -17,7 +18,7 @@ class Cases():
         }
         if log_event:
           logger.info(f"Loaded {len(excluded)} excluded cases from {excludedCasesFile}")
-        logger.debug(f"Excluded cases include: {excluded}")
+        logger.debug("Excluded cases include: %s", excluded, extra=every(300))
         return excluded
     except FileNotFoundError:
       logger.warning(f"Excluded file config cannot be found, displaying all returned cases.")
@@ -94,12 +94,12 @@ class Config():
         config_value_from_key = parent_value.get(child)
       if config_value_from_key == None:
         if default:
-          logger.debug(f"Using default value: {config_value_from_key} for {key}")
+          logger.debug("Using default value: %s for %s", config_value_from_key, key)
           return default
 
         raise KeyError(f"Invalid key: {key}")
 
-      logger.debug(f"Returning value {config_value_from_key} from {key} ")
+      logger.debug("Returning value %s from %s ", config_value_from_key, key)
       return config_value_from_key
     return
   
@@ -138,9 +138,14 @@ class Config():
         break
       print(f"{updated_role} is not a valid role")
 
+    return self.set_role(updated_role)
+
+  def set_role(self, updated_role: str):
     with open(self.config_path, "r") as f:
       config_data = json.load(f)
 
+    current_role = config_data.get(VARS.Role)
+    updated_role = updated_role.lower()
     config_data[VARS.Role] = updated_role
     logger.info(f"Updating user role from {current_role} to {updated_role}")
 
@@ -197,6 +202,8 @@ class Config():
       FileNames.QueryResults,
       FileNames.FileReg,
     )
+    shutil.rmtree(Path(self.config_dir) / FileNames.Cache, ignore_errors=True)
+    logger.info(f"Removed the {FileNames.Cache} directory")
 
   def remove_key_files(self):
     self._remove_files(
@@ -278,8 +285,11 @@ def load_json_file(path, fatal=False, context="", Proc=False):
   
 def create_json_file(path, data, log_event=True):
   try:
-    with open(path, "w") as f:
+    # Write beside the target and swap it in so concurrent readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
       json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
     if log_event:
       logger.info(f"Successfully wrote {os.path.split(path)[1]} to {path}")
   except Exception as e:
@@ -1,5 +1,6 @@
 import os
 from utils.helper import logger, get_non_empty_input
+from logger import every
 from utils.variables import FileNames
 
 class Products():
@@ -15,7 +16,7 @@ class Products():
           line.strip() for line in lines
           if line.strip() and not line.strip().startswith('#')
         }
-        logger.debug(f"Total: {len(excluded)}. Excluded products include: {excluded}")
+        logger.debug("Total: %d. Excluded products include: %s", len(excluded), excluded, extra=every(300))
         return excluded
     except FileNotFoundError:
       logger.warning(f"Excluded file config cannot be found, displaying all returned products.")
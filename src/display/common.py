@@ -1,28 +1,34 @@
 import shutil, os
-from datetime import datetime
-from logger import logger
+from logger import logger, every
+from tools.history import sparkline
+from utils.clock import get_clock
+from utils.helper import convert_days_to_dhm
 
 from rich.console import Console, Group
 from rich.panel import Panel
 from rich.align import Align
 from rich.text import Text
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 console = Console()
 
 class CommonDisplay():
   @staticmethod
-  def display_header(polling_interval):
+  def display_header(polling_interval, budget_info=None, stale_seconds=None, status_lines=()):
     terminal_width = shutil.get_terminal_size().columns
-    timestamp = f"Fetching batch @ {(datetime.now()).strftime('%a %b %H:%M')}"
+    timestamp = f"Fetching batch @ {get_clock().now().strftime('%a %b %H:%M')}"
+    if stale_seconds is not None:
+      timestamp = f"STALE snapshot from {convert_days_to_dhm(stale_seconds / (24 * 60 * 60))} ago, refreshing..."
     polling_info = f"Next poll in {polling_interval} minutes..."
-    CommonDisplay.main_banner(extra_info=(timestamp, polling_info))
+    extra_info = (timestamp, polling_info, budget_info) if budget_info else (timestamp, polling_info)
+    extra_info += tuple(status_lines)
+    CommonDisplay.main_banner(extra_info=extra_info)
   
   @staticmethod
   def clear_screen():
-    logger.debug("Clearing screen from startup")
+    logger.debug("Clearing screen from startup", extra=every(300))
     if os.name == 'nt':
       os.system('cls')
     else:
@@ -54,9 +60,8 @@ class CommonDisplay():
       Align.center(subtitle),
     ]
 
-    if extra_info and len(extra_info) == 2:
-      items.append(Align.center(Text(extra_info[0], style="dim")))
-      items.append(Align.center(Text(extra_info[1], style="dim")))
+    for info in extra_info or ():
+      items.append(Align.center(Text(info, style="dim")))
 
     content = Group(*items)
 
@@ -68,12 +73,22 @@ def display_placard(content, title, p_color):
   panel = Panel(Align.center(content), title=f"[bold {p_color}]{title}[/bold {p_color}]", border_style=f"{p_color}", width=57)
   console.print(Align.center(panel))
 
+def display_trend(values, title, p_color):
+  present = [v for v in values if v is not None]
+  if not present:
+    return
+  line = sparkline(values)
+  content = f"{line}\n[dim]low {min(present)} • high {max(present)} • now {present[-1]}[/dim]"
+  display_placard(content=content, title=title, p_color=p_color)
+
 @dataclass
 class ManagerDashboardData:
 	team_needs_commitment: List[dict]
 	queue_needs_commitment: List[dict]
 	update_threshold: int
 	color: List[dict]
+	team_owner_counts: dict = field(default_factory=dict)
+	queue_trend: List[int] = field(default_factory=list)
 
 @dataclass
 class EngineerDashboardData:
@@ -82,4 +97,5 @@ class EngineerDashboardData:
 	opened_today_cases: List[dict]
 	update_threshold: int
 	vacation_scheduled_until: str
-	color: List[dict]
\ No newline at end of file
+	color: List[dict]
+	queue_trend: List[int] = field(default_factory=list)
\ No newline at end of file
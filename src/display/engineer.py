@@ -1,6 +1,5 @@
 import shutil
 import os
-from datetime import datetime
 from collections import defaultdict
 from config.config import Config
 from rich.console import Console
@@ -8,7 +7,8 @@ from rich.panel import Panel
 from rich.align import Align
 from utils.helper import convert_days_to_dhm, calculate_days_delta
 from logger import logger
-from display.common import EngineerDashboardData, display_placard
+from utils.clock import get_clock
+from display.common import EngineerDashboardData, display_placard, display_trend
 
 console = Console()
 
@@ -23,6 +23,7 @@ class EngineerDisplay():
     self.personal()
     self.case_insights()
     self.opened_today()
+    display_trend(self.data.queue_trend, title="Queue Depth (24h)", p_color=self.p_color)
 
   def queue(self):
     product_count = defaultdict(int)
@@ -30,10 +31,11 @@ class EngineerDisplay():
     cases = self.data.team_cases
 
     panel_content = "None, you're looking good!"
+    now = get_clock().time()
 
     for case in cases:
-      product = case.get('Product__r', {}).get('Name', 'No Product')
-      commitment = case.get('Time_Before_Next_Update_Commitment__c')
+      product = case.product or 'No Product'
+      commitment = case.commitment_at(now)
 
       if commitment and (commitment < (self.data.update_threshold / (24 * 60))):
         needs_commitment += 1
@@ -69,11 +71,12 @@ class EngineerDisplay():
     MissOverWeekend = 0
 
     panel_content = "You have no assigned cases!"
+    now = get_clock().time()
 
     if cases:
       for case in cases:
-        status = str(case.get('Status')).upper()
-        commitment_time = case.get('Time_Before_Next_Update_Commitment__c')
+        status = str(case.status).upper()
+        commitment_time = case.commitment_at(now)
 
         if commitment_time and (commitment_time < 1 and status not in ['NEW', 'CLOSED']):
           if commitment_time < (self.data.update_threshold / (24 * 60)):
@@ -90,7 +93,7 @@ class EngineerDisplay():
         if (not vacation_validation_failed) and vacation_days_remaining > 0 and (vacation_days_remaining > commitment_time):
           MissDuringVacation += 1
 
-        if (datetime.today().strftime('%A').lower() == 'friday' and commitment_time < 3):
+        if (get_clock().today().strftime('%A').lower() == 'friday' and commitment_time < 3):
           MissOverWeekend += 1
 
       if (InSupport + New + NeedsCommitment + MissOverWeekend + AboutToMiss == 0) and MissDuringVacation < 1:
@@ -125,12 +128,11 @@ class EngineerDisplay():
 
     if cases:
       for case in cases:
-        case_num = case.get("CaseNumber")
-        product = case.get('Product__r', {}).get('Name', 'No Product')
-        engineer = case.get('Owner', {}).get('Name', 'n/a')
-        priority = case.get('Severity__c')
+        case_num = case.case_number
+        product = case.product or 'No Product'
+        engineer = case.owner or 'n/a'
         total_case += 1
-        lines.append(f"[bold {self.s_color}]{case_num}[/bold {self.s_color}] (P{priority.split(' ')[0]}) {product} - {engineer.split(' ')[0]}")
+        lines.append(f"[bold {self.s_color}]{case_num}[/bold {self.s_color}] (P{case.priority}) {product} - {engineer.split(' ')[0]}")
 
       panel_content = "\n".join(lines)
 
@@ -144,8 +146,8 @@ class EngineerDisplay():
 
     if cases:
       for case in cases:
-        case_reason = case.get('Case_Reason__c')
-        case_complexity = case.get('Case_Complexity__c')
+        case_reason = case.reason
+        case_complexity = case.complexity
         if not case_complexity:
           missing_complexity += 1
         if case_reason == 'Other':
@@ -1,8 +1,9 @@
 from utils.helper import convert_days_to_dhm
+from utils.clock import get_clock
 from rich.console import Console
 from rich.panel import Panel
 from rich.align import Align
-from display.common import ManagerDashboardData, display_placard
+from display.common import ManagerDashboardData, display_placard, display_trend
 
 console = Console()
 
@@ -16,21 +17,29 @@ class ManagerDisplay():
   def render(self):
     self.team_commitment()
     self.queue_commitment()
+    display_trend(self.data.queue_trend, title="Queue Depth (24h)", p_color=self.p_color)
 
   def team_commitment(self):
     lines = []
     cases = self.data.team_needs_commitment
+    now = get_clock().time()
 
     for case in cases:
-      case_num = case.get("CaseNumber")
-      owner = case.get("Owner", {}).get("Name", "n/a")
-      next_update = case.get("Time_Before_Next_Update_Commitment__c")
+      case_num = case.case_number
+      owner = case.owner or "n/a"
+      next_update = case.commitment_at(now)
       if next_update:
         next_update_formated = convert_days_to_dhm(next_update)
       else: next_update_formated = 'Null'
       lines.append(f"[bold {self.s_color}]{case_num}[/bold {self.s_color}] w/ {owner} in [bold]{next_update_formated}[/bold]")
     if not cases: lines.append(f"None, your team is looking good!")
 
+    owner_counts = self.data.team_owner_counts
+    if owner_counts:
+      lines.append("")
+      for owner, count in sorted(owner_counts.items(), key=lambda item: -item[1]):
+        lines.append(f"[bold]{owner}[/bold]: [bold {self.s_color}]{count}[/bold {self.s_color}] due")
+
     panel_content = "\n".join(lines)
 
     display_placard(content=panel_content, title="Team commitments within 1 Day", p_color=self.p_color)
@@ -38,11 +47,12 @@ class ManagerDisplay():
   def queue_commitment(self):
     lines = []
     cases = self.data.queue_needs_commitment
+    now = get_clock().time()
 
     for case in cases:
-      case_num = case.get("CaseNumber")
-      product = case.get('Product__r', {}).get('Name', 'No Product')
-      next_update = case.get("Time_Before_Next_Update_Commitment__c")
+      case_num = case.case_number
+      product = case.product or 'No Product'
+      next_update = case.commitment_at(now)
       
       if next_update: next_update_formated = convert_days_to_dhm(next_update)
       else: next_update_formated = 'Null'
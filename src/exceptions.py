@@ -18,3 +18,21 @@ class MalformedTeamConfiguration(Exception):
   """Raised when there is an issue with the teams list configuration"""
   pass
 
+
+class ReplayFinished(Exception):
+  """Raised when a snapshot replay has run past the end of its archive"""
+  pass
+
+class BatchUnsupported(APIError):
+  """Raised when the API endpoint does not accept composite batch requests"""
+  pass
+
+class StreamDropped(APIError):
+  """Raised when the streaming subscription is rejected or the connection is lost"""
+  pass
+
+class RoleSwitch(Exception):
+  """Raised by a handler loop when the user asks to switch to the other role"""
+  def __init__(self, role: str):
+    super().__init__(f"Switching to the {role.lower()} role")
+    self.role = role
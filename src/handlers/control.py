@@ -0,0 +1,207 @@
+import asyncio, atexit, os, sys, threading
+from dataclasses import dataclass
+from logger import logger
+
+try:
+	import termios, tty
+except ImportError:
+	termios = None
+	import msvcrt
+
+KEYS = {
+	"r": "refresh",
+	"e": "exclude_case",
+	"p": "exclude_product",
+	"t": "toggle_team",
+	"s": "switch_role",
+	"q": "quit",
+}
+
+PROMPTS = {
+	"exclude_case": "Case number to exclude (RESET clears the list): ",
+	"exclude_product": "Product to exclude (RESET clears the list): ",
+	"toggle_team": "Team to toggle: ",
+}
+
+def key_hint(keys: dict) -> str:
+	return "  ".join(f"[{key}] {kind.replace('_', ' ')}" for key, kind in keys.items())
+
+@dataclass
+class Action:
+	kind: str
+	value: str = None
+
+def modified_at(path: str):
+	try:
+		return os.stat(path).st_mtime_ns
+	except OSError:
+		return None
+
+class ControlLoop():
+	"""
+	Runs an asyncio loop on a background thread that multiplexes keyboard commands, changes
+	to watched files, blocking notification waits (stream events, shared snapshots) and the
+	refresh timer. The handler loop blocks in next_action() and gets back whichever came first.
+	"""
+	def __init__(self, watch_paths: list = (), keys: dict = KEYS, interactive: bool = True):
+		self.loop = asyncio.new_event_loop()
+		self.thread = threading.Thread(target=self.loop.run_forever, name="control", daemon=True)
+		self.watch_paths = list(watch_paths)
+		self.keys = keys
+		self.mtimes = {}
+		self.interactive = interactive and sys.stdin is not None and sys.stdin.isatty()
+		self.terminal = None
+		self.prompt = None
+		self.notice = None
+		self.actions = None
+
+	def start(self):
+		self.thread.start()
+		asyncio.run_coroutine_threadsafe(self.setup(), self.loop).result()
+		return self
+
+	async def setup(self):
+		self.actions = asyncio.Queue()
+		self.mtimes = {path: modified_at(path) for path in self.watch_paths}
+		self.loop.create_task(self.watch_files())
+
+		if not self.interactive:
+			return
+		if termios:
+			fd = sys.stdin.fileno()
+			self.terminal = termios.tcgetattr(fd)
+			tty.setcbreak(fd)
+			atexit.register(self.restore_terminal)
+			self.loop.add_reader(fd, self.read_stdin)
+		else:
+			self.loop.create_task(self.poll_console())
+
+	def stop(self):
+		self.restore_terminal()
+		if self.loop.is_running():
+			asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+			self.loop.call_soon_threadsafe(self.loop.stop)
+			self.thread.join()
+
+	async def shutdown(self):
+		if self.interactive and termios:
+			self.loop.remove_reader(sys.stdin.fileno())
+		tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+
+	def restore_terminal(self):
+		if self.terminal is not None:
+			termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self.terminal)
+			self.terminal = None
+
+	def read_stdin(self):
+		for char in os.read(sys.stdin.fileno(), 64).decode(errors="ignore"):
+			self.on_key(char)
+
+	async def poll_console(self):
+		while True:
+			while msvcrt.kbhit():
+				self.on_key(msvcrt.getwch())
+			await asyncio.sleep(0.05)
+
+	def echo(self, text: str):
+		sys.stdout.write(text)
+		sys.stdout.flush()
+
+	def on_key(self, char: str):
+		if self.prompt is not None:
+			kind, typed = self.prompt
+			if char in ("\r", "\n"):
+				self.prompt = None
+				self.echo("\n")
+				if typed.strip():
+					self.actions.put_nowait(Action(kind, typed.strip()))
+			elif char == "\x1b":
+				self.prompt = None
+				self.echo("  (cancelled)\n")
+			elif char in ("\x7f", "\b"):
+				if typed:
+					self.prompt = (kind, typed[:-1])
+					self.echo("\b \b")
+			elif char.isprintable():
+				self.prompt = (kind, typed + char)
+				self.echo(char)
+			return
+
+		kind = self.keys.get(char.lower())
+		if kind in PROMPTS:
+			self.prompt = (kind, "")
+			self.echo("\n" + PROMPTS[kind])
+		elif kind:
+			self.actions.put_nowait(Action(kind))
+
+	async def watch_files(self):
+		# The standard library has no portable change notification, one stat per file per second is cheap
+		while True:
+			await asyncio.sleep(1)
+			for path in self.watch_paths:
+				current = modified_at(path)
+				if current != self.mtimes.get(path):
+					self.mtimes[path] = current
+					self.actions.put_nowait(Action("files", path))
+
+	def acknowledge(self, path: str):
+		"""Records a write this process made itself so the watcher does not report it back"""
+		self.loop.call_soon_threadsafe(self.mtimes.__setitem__, path, modified_at(path))
+
+	async def wait_external(self, wait):
+		# Blocking waits run in one second slices so an abandoned wait frees its worker quickly
+		while not await self.loop.run_in_executor(None, wait, 1):
+			pass
+		return Action("events")
+
+	async def next(self, timeout: float, wait=None) -> Action:
+		tasks = {asyncio.ensure_future(self.actions.get())}
+		if wait:
+			tasks.add(asyncio.ensure_future(self.wait_external(wait)))
+
+		deadline = self.loop.time() + timeout
+		action = None
+		while action is None:
+			done, _ = await asyncio.wait(tasks, timeout=max(0, deadline - self.loop.time()), return_when=asyncio.FIRST_COMPLETED)
+			if done:
+				# Commands win over notifications that completed in the same instant
+				action = sorted((task.result() for task in done), key=lambda a: a.kind == "events")[0]
+			elif self.prompt is None:
+				action = Action("timer")
+			else:
+				# Hold the refresh while a prompt is open so the redraw does not wipe it
+				deadline = self.loop.time() + 1
+
+		for task in tasks:
+			if not task.done():
+				task.cancel()
+		return action
+
+	def next_action(self, timeout: float, wait=None) -> Action:
+		action = asyncio.run_coroutine_threadsafe(self.next(timeout, wait), self.loop).result()
+		logger.debug("Control loop action: %s", action)
+		return action
+
+	def status_lines(self) -> list:
+		lines = [self.notice] if self.notice else []
+		self.notice = None
+		if self.interactive:
+			lines.append(key_hint(self.keys))
+		return lines
+
+def toggle_team(team_cls, teams_list: dict, team: str) -> tuple:
+	"""Flips a team's visibility in the loaded teams list and in the teams file, returns (toggled, message)"""
+	teams = teams_list.get("teams", {})
+	name = next((name for name in teams if name.lower() == team.strip().lower()), team.strip())
+	viewable = teams.get(name, {}).get("viewable")
+
+	if viewable is True and not any(values.get("viewable") for other, values in teams.items() if other not in ("group", name)):
+		return False, "At least one team has to stay viewable"
+
+	result = team_cls.toggle_team_view(name)
+	if result.get("STATUS"):
+		teams[name]["viewable"] = not viewable
+	return result.get("STATUS"), result.get("MESSAGE")
@@ -0,0 +1,246 @@
+import json, hashlib, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
+from display.common import EngineerDashboardData, ManagerDashboardData
+from handlers.engineer import EngineerHandler
+from handlers.manager import ManagerHandler
+from logger import logger
+from exceptions import APIError
+from api.api_handler import run_together
+from config.team import Team
+from utils.helper import group_members, team_members
+from utils.clock import get_clock
+from utils.records import CaseRecord, ingest
+from tools.metrics import exporter, engineer_families, manager_families
+import requests
+
+def json_default(value):
+	return value.to_dict() if isinstance(value, CaseRecord) else str(value)
+
+class DaemonHandler:
+	"""
+	Runs a single fetch loop for both roles and serves the classified dashboards as JSON
+	over a local HTTP server, so terminals and the TSE board can read one shared snapshot
+	instead of each polling SalesForce.
+	"""
+	def __init__(self, config_data, config_cls, filereg_cls, team_cls, debug, send_alerts, isTest, teamsList, display, common_display, replay_source=None, port=8800):
+		role_kwargs = dict(
+			config_data=config_data,
+			config_cls=config_cls,
+			filereg_cls=filereg_cls,
+			team_cls=team_cls,
+			debug=debug,
+			send_alerts=False,
+			isTest=isTest,
+			teamsList=teamsList,
+			display=None,
+			common_display=common_display
+		)
+		self.engineer = EngineerHandler(**role_kwargs)
+		self.manager = ManagerHandler(**role_kwargs)
+		self.manager.stream = None
+		self.manager.history = None
+		# The daemon is the only fetcher for both views, its HTTP snapshot takes the place of the shared file
+		for handler in (self.engineer, self.manager):
+			if handler.shared:
+				handler.shared.close()
+				handler.shared = None
+		self.config_data = config_data
+		self.config_cls = config_cls
+		self.teams_list = teamsList
+		self.isTest = isTest
+		self.host = config_data.get("rules").get("daemon_host", "127.0.0.1")
+		self.port = port
+		self.poll_interval = self.engineer.poll_interval
+		self.clock = get_clock()
+		self.lock = threading.Lock()
+		self.snapshot = None
+		self.responses = {}
+		self.server = None
+
+	def run(self, isTest):
+		logger.debug("%s.run() invoked", __class__.__name__)
+
+		Team.validate_teams_list(self.teams_list)
+		self.group_list = set(group_members(self.teams_list))
+		self.engineer_list = set(team_members(self.teams_list))
+		self.engineers = sorted(self.engineer_list | {self.engineer.engineer_name})
+
+		self.serve()
+		if self.engineer.stream:
+			self.engineer.stream.start()
+
+		use_cache = True
+		while True:
+			try:
+				self.refresh(use_cache)
+			except (APIError, requests.exceptions.RequestException) as e:
+				logger.error(f"Daemon fetch failed, serving the previous snapshot: {e}")
+				with self.lock:
+					if self.snapshot:
+						self.snapshot["last_error"] = str(e)
+
+			# Change events mean the cached result is already behind
+			use_cache = not self.engineer.wait_for_events(self.engineer.next_poll_minutes() * 60)
+			if not use_cache:
+				logger.info("Case change events were received, refreshing the daemon snapshot")
+
+	def refresh(self, use_cache: bool = True):
+		if self.engineer.stream:
+			self.engineer.stream.discard()
+		excluded_products = self.engineer.products.load_excluded_products()
+		excluded_cases = self.engineer.cases.load_excluded_cases(log_event=False)
+
+		engineer_query = self.engineer.build_query(
+			excluded_products = excluded_products,
+			group_list = self.group_list,
+			engineer_name = self.engineer.engineer_name,
+			engineer_list = self.engineer_list
+		)
+		manager_query = self.manager.build_query(self.group_list, self.engineer_list)
+
+		# Both query sets and their chunks go out in one composite request per cycle
+		engineer_records, manager_records = run_together([
+			self.engineer.create_api_handler(engineer_query),
+			self.manager.create_api_handler(manager_query, self.isTest)
+		], use_cache=use_cache)
+		engineer_cases = ingest(engineer_records, now=self.clock.time())
+		manager_cases = ingest(manager_records, now=self.clock.time())
+		queue_needs_commitment, team_needs_commitment, team_owner_counts = self.manager.bucket_cases(
+			cases=manager_cases,
+			group_members=self.group_list,
+			team_members=self.engineer_list
+		)
+
+		# Only the personal bucket depends on who is asking, it is partitioned for every engineer in one pass
+		classified = self.classify(engineer_cases, self.engineer.engineer_name, excluded_products, excluded_cases)
+		personal = self.engineer.owner_matcher(self.engineers).partition(case for case in engineer_cases if case.valid)
+		queue_trend = self.engineer.record_history(classified.get("team_cases"))
+
+		with self.lock:
+			version = (self.snapshot or {}).get("version", 0) + 1
+			self.snapshot = {
+				"version": version,
+				"fetched_at": self.clock.now().isoformat(timespec="seconds"),
+				"last_error": None,
+				"classified": classified,
+				"personal": personal,
+				"queue_trend": queue_trend,
+				"manager": ManagerDashboardData(
+					queue_needs_commitment = queue_needs_commitment,
+					team_needs_commitment = team_needs_commitment,
+					team_owner_counts = team_owner_counts,
+					queue_trend = queue_trend,
+					update_threshold = self.manager.update_threshold,
+					color = None
+				),
+			}
+			self.responses = {}
+
+		if exporter.enabled:
+			exporter.publish("engineer", engineer_families(classified, self.engineer.update_threshold, now=self.clock.time()))
+			exporter.publish("manager", manager_families(self.snapshot["manager"]))
+		logger.info("Daemon snapshot %d holds %d engineer and %d manager cases", version, len(engineer_cases), len(manager_cases))
+
+	def classify(self, cases: list, engineer_name: str, excluded_products: set, excluded_cases) -> dict:
+		return self.engineer.sort_cases(
+			cases=cases,
+			engineer_name=engineer_name,
+			excluded_products=excluded_products,
+			excluded_cases=excluded_cases,
+			group_list=self.group_list,
+			engineer_list=self.engineer_list
+		)
+
+	def engineer_dashboard(self, snapshot: dict, engineer_name: str) -> dict:
+		sorted_cases = snapshot["classified"]
+		dashboard = EngineerDashboardData(
+			team_cases = sorted_cases.get("team_cases"),
+			personal_cases = snapshot["personal"].get(engineer_name, []),
+			opened_today_cases = sorted_cases.get("opened_today_cases"),
+			update_threshold = self.engineer.update_threshold,
+			vacation_scheduled_until = self.config_data.get("rules").get("vacation_scheduled_until", ""),
+			color = None,
+			queue_trend = snapshot["queue_trend"]
+		)
+		return dict(vars(dashboard), engineer=engineer_name, case_validation_failed_list=sorted_cases.get("case_validation_failed_list"))
+
+	def encode(self, body) -> tuple:
+		payload = json.dumps(body, separators=(",", ":"), default=json_default).encode()
+		return payload, f'"{hashlib.sha1(payload).hexdigest()}"'
+
+	def resolve(self, path: str):
+		"""Returns (status, payload, etag, snapshot), building and caching each payload once per snapshot"""
+		parts = [unquote(part) for part in urlparse(path).path.strip("/").split("/") if part]
+
+		with self.lock:
+			snapshot = self.snapshot
+			if parts == ["health"]:
+				health = {"status": "ok" if snapshot else "starting"}
+				if snapshot:
+					health.update(version=snapshot["version"], fetched_at=snapshot["fetched_at"], last_error=snapshot["last_error"])
+				return (200, *self.encode(health), snapshot)
+			if parts == ["engineers"]:
+				return (200, *self.encode({"engineers": self.engineers}), snapshot)
+			if snapshot is None:
+				return (503, *self.encode({"error": "The first snapshot has not been fetched yet"}), None)
+
+			key = tuple(part.lower() for part in parts)
+			if key in self.responses:
+				return (200, *self.responses[key], snapshot)
+
+		if parts == ["manager"]:
+			body = dict(vars(snapshot["manager"]))
+		elif parts and parts[0] == "engineer" and len(parts) <= 2:
+			requested = parts[1] if len(parts) == 2 else self.engineer.engineer_name
+			name = next((engineer for engineer in self.engineers if engineer.lower() == requested.lower()), None)
+			if name is None:
+				return (404, *self.encode({"error": f"'{requested}' is not a member of the configured teams"}), snapshot)
+			body = self.engineer_dashboard(snapshot, name)
+		else:
+			return (404, *self.encode({"error": "Unknown endpoint, use /engineer/<name>, /manager, /engineers or /health"}), snapshot)
+
+		# Version and fetch time travel in headers so unchanged dashboards keep their ETag
+		body.pop("color", None)
+		body["poll_interval"] = self.poll_interval
+		encoded = self.encode(body)
+		with self.lock:
+			if self.snapshot is snapshot:
+				self.responses[key] = encoded
+		return (200, *encoded, snapshot)
+
+	def serve(self):
+		self.server = ThreadingHTTPServer((self.host, self.port), DaemonRequestHandler)
+		self.server.daemon_threads = True
+		self.server.app = self
+		threading.Thread(target=self.server.serve_forever, name="daemon-http", daemon=True).start()
+		logger.info(f"Daemon serving dashboards on http://{self.host}:{self.server.server_port}")
+		print(f"Serving dashboards on http://{self.host}:{self.server.server_port} (/engineer/<name>, /manager, /engineers, /health)")
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+
+	def log_message(self, format, *args):
+		logger.debug("daemon: " + format, *args)
+
+	def do_GET(self):
+		status, payload, etag, snapshot = self.server.app.resolve(self.path)
+		not_modified = status == 200 and etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]
+
+		self.send_response(304 if not_modified else status)
+		self.send_header("Cache-Control", "no-cache")
+		if status == 200:
+			self.send_header("ETag", etag)
+		if snapshot:
+			self.send_header("X-Snapshot-Version", str(snapshot["version"]))
+			self.send_header("X-Fetched-At", snapshot["fetched_at"])
+
+		if not_modified:
+			self.send_header("Content-Length", "0")
+			self.end_headers()
+			return
+
+		self.send_header("Content-Type", "application/json;charset=UTF-8")
+		self.send_header("Content-Length", str(len(payload)))
+		self.end_headers()
+		self.wfile.write(payload)
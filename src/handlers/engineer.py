@@ -1,121 +1,362 @@
-import os, time
+import os
+from functools import partial
 from config.products import Products
 from config.cases import Cases
 from config.config import Config
 from config.filereg import FileReg
+from config.team import Team
 from display.engineer import EngineerDisplay
 from display.common import CommonDisplay, EngineerDashboardData
 from logger import logger
-from exceptions import ConfigurationError
-from utils.variables import FileNames
-from utils.helper import concat_group_list, concat_team_list
+from exceptions import ConfigurationError, RoleSwitch
+from utils.variables import FileNames, VARS
+from utils.helper import group_members, team_members, handle_shutdown
 from api.api_handler import APIHandler, uploadToTseBoard
-from datetime import datetime
+from api.query_builder import QueryBuilder
+from api.streaming import case_stream
+from api.coordinator import shared_fetch
+from api.budget import budget
 from tools.alert import alert
+from tools.history import QueueHistory
+from tools.replay import SnapshotRecorder
+from utils.clock import get_clock
+from utils.records import ingest, to_dicts
+from utils.matcher import build_matcher
+from handlers.warm_start import warm_start
+from handlers.prefetch import Prefetcher
+from handlers.control import ControlLoop, Action, toggle_team
+from handlers.reload import reload_settings, settings_paths
+from tools.metrics import exporter, configure_metrics, engineer_families
+
+def render_query(query_builder: QueryBuilder, query_name: str, max_length: int, excluded_products, group_list, engineer_name, engineer_list) -> list:
+	chunks = query_builder.render_chunks(
+		query_name,
+		max_length=max_length,
+		excluded_product_list=excluded_products,
+		support_group=group_list,
+		engineer_name=engineer_name,
+		engineer_list=engineer_list
+	)
+	return [chunk.query for chunk in chunks]
 
 class EngineerHandler:
-	def __init__(self, config_data, config_cls: Config, filereg_cls: FileReg, team_cls, debug, send_alerts, isTest, teamsList, display, common_display: CommonDisplay):
+	def __init__(self, config_data, config_cls: Config, filereg_cls: FileReg, team_cls, debug, send_alerts, isTest, teamsList, display, common_display: CommonDisplay, replay_source=None):
 		self.config_cls = config_cls
 		self.filereg_cls = filereg_cls
-		self.config_data = config_data
+		self.team_cls = team_cls
 		self.debug = debug
 		self.isTest = isTest
 		self.display = display
 		self.teams_list: dict = teamsList
+		self.send_alerts_flag = send_alerts
+		self.replay_source = replay_source
+		self.apply_config(config_data)
+		self.products = Products()
+		self.cases = Cases()
+		self.display_util = common_display
+		self.history = QueueHistory("engineer").init() if config_data.get("rules").get("record_history", True) else None
+		self.recorder = SnapshotRecorder("ENGINEER") if config_data.get("rules").get("record_snapshots", False) else None
+		self.clock = get_clock()
+		self.stream = case_stream(config_data) if not isTest and not replay_source else None
+		self.shared = shared_fetch(config_data, self.next_poll_minutes) if not isTest and not replay_source else None
+		self.matcher = None
+		self.prefetch = Prefetcher("engineer", enabled=config_data.get("rules").get("prefetch", True) and not replay_source)
+		self.control = None
+
+	def apply_config(self, config_data: dict):
+		"""Derives the settings the loop reads from config.json, at startup and on every reload"""
+		rules = config_data.get("rules")
 		alerts = config_data.get("alerts", {})
-		self.send_alerts = send_alerts or alerts.get("send", False)
+		query_builder = QueryBuilder(config_data.get("queries", {}))
+
+		self.config_data = config_data
+		self.send_alerts = (self.send_alerts_flag or alerts.get("send", False)) and not self.replay_source
 		self.sound_alerts = alerts.get("sound", None)
-		self.poll_interval = config_data.get("rules").get("poll_interval", 30)
+		self.poll_interval = rules.get("poll_interval", 30)
 		self.queries = config_data.get("queries", {})
+		self.query_builder = query_builder
+		self.max_query_length = rules.get("max_query_length", 16000)
+		self.max_parallel_queries = rules.get("max_parallel_queries", 4)
+		self.execution_mode = rules.get("execution_mode", "batch")
+		self.change_probe = rules.get("change_probe", True)
+		self.probe_max_skips = rules.get("probe_max_skips", 5)
+		self.hedge_requests = rules.get("hedge_requests", True)
+		self.max_retries = rules.get("max_retries", 2)
+		budget.configure(
+			reserve=rules.get("api_budget_reserve", 0.05),
+			max_per_minute=rules.get("max_requests_per_minute", 0)
+		)
+		configure_metrics(rules)
 		self.color = config_data.get("colors", None)
-		self.update_threshold = config_data.get("rules").get("update_threshold", 45)
-		self.engineer_name = self.config_data.get("engineer_name")
-		self.products = Products()
-		self.cases = Cases()
-		self.display_util = common_display
+		self.update_threshold = rules.get("update_threshold", 45)
+		self.board_payload_version = rules.get("tse_board_payload_version", 1)
+		self.engineer_name = config_data.get("engineer_name")
 
 	def run(self, isTest):
-		logger.debug(f"{__class__.__name__}.run() invoked")
+		logger.debug("%s.run() invoked", __class__.__name__)
 
-		engineer_name = self.engineer_name
-		group_list = concat_group_list(self.teams_list)
-		engineer_list = concat_team_list(self.teams_list)
+		Team.validate_teams_list(self.teams_list)
+		group_list = set(group_members(self.teams_list))
+		engineer_list = set(team_members(self.teams_list))
 		excluded_products = self.products.load_excluded_products()
 
-		query = self.build_query(
-			excluded_products = excluded_products,
-			group_list = group_list,
-			engineer_name = engineer_name,
-			engineer_list = engineer_list
-		)
-
-		self.main_loop(
-			query=query,
-			excluded_products=excluded_products,
-			group_list=group_list,
-			engineer_list=engineer_list
-		)
-
-	def main_loop(self, query: str, excluded_products: set, group_list, engineer_list):
-		logger.debug("Entering the structured loop")
+		if self.stream:
+			self.stream.start()
 
-		rerender_due_to_update = False
-
-		while True:
-			case_results = self.invoke_api(query, rerender = rerender_due_to_update)
-			excluded_cases = self.cases.load_excluded_cases(log_event=False)
+		# A replay runs on its own clock, so it keeps the plain sleep based wait
+		if not self.replay_source:
+			self.control = ControlLoop(watch_paths=self.exclusion_paths() + settings_paths(self.config_cls, self.team_cls)).start()
 
-			sorted_case_results = self.sort_cases(
-				cases=case_results,
-				engineer_name=self.engineer_name,
+		try:
+			self.main_loop(
 				excluded_products=excluded_products,
-				excluded_cases=excluded_cases,
 				group_list=group_list,
 				engineer_list=engineer_list
 			)
+		finally:
+			self.close()
 
-			self.display_results(case_results=sorted_case_results)
+	def main_loop(self, excluded_products: set, group_list: set, engineer_list: set):
+		logger.debug("Entering the structured loop")
 
-			total_seconds = self.poll_interval * 60
-			elapsed = 0
+		refreshed = None
+		fetch_options = {}
+		first_cycle = True
 
-			update_detected = False
+		while True:
+			# A prefetched refresh is swapped in, otherwise this cycle fetches in the foreground
+			if refreshed is None:
+				refreshed = self.prefetch.take()
+			if refreshed is None:
+				refreshed = self.prefetch.foreground(partial(self.refresh, excluded_products, group_list, engineer_list, warm=first_cycle, **fetch_options))
+			first_cycle = False
+			sorted_case_results, queue_trend, cases = refreshed
+
+			self.display_results(case_results=sorted_case_results, queue_trend=queue_trend)
+
+			total_seconds = self.next_poll_minutes() * 60
+			self.prefetch.schedule(partial(self.refresh, excluded_products, group_list, engineer_list), due_in=total_seconds)
+			refreshed, fetch_options = None, {}
+
+			action = self.next_action(total_seconds)
+			if action.kind == "timer":
+				continue
 
-			while elapsed < total_seconds:
-				time.sleep(10)
-				elapsed += 10
+			# Every other action replaces the scheduled refresh, a late prefetch result is dropped
+			self.prefetch.cancel(wait=False)
+
+			if action.kind == "quit":
+				handle_shutdown(0)
+			elif action.kind == "switch_role":
+				raise RoleSwitch("MANAGER")
+			elif action.kind == "events":
+				logger.info("Case change events were received, the display will be re-rendered")
+			elif action.kind == "refresh":
+				fetch_options = {"use_cache": False}
+			elif action.kind == "exclude_case":
+				self.exclude_case(action.value)
+				refreshed = self.reclassify(cases, excluded_products, group_list, engineer_list)
+			elif action.kind == "files" and action.value in settings_paths(self.config_cls, self.team_cls):
+				query = self.build_query(excluded_products, group_list, self.engineer_name, engineer_list)
+				if self.reload(action.value):
+					group_list = set(group_members(self.teams_list))
+					engineer_list = set(team_members(self.teams_list))
+
+				# Only a changed query needs a fetch, anything else re-sorts the cases on screen
+				if self.build_query(excluded_products, group_list, self.engineer_name, engineer_list) == query:
+					refreshed = self.reclassify(cases, excluded_products, group_list, engineer_list)
+			elif action.kind in ("exclude_product", "files"):
+				if action.kind == "exclude_product":
+					self.products.add_excluded_product(action.value)
+					self.acknowledge_exclusions()
+				else:
+					logger.info(f"{os.path.basename(action.value)} was changed, the display will be re-rendered")
 
 				current_excluded_products = self.products.load_excluded_products()
+				if current_excluded_products >= excluded_products:
+					# Only more exclusions, the cases on screen already hold everything still shown
+					refreshed = self.reclassify(cases, current_excluded_products, group_list, engineer_list)
+				else:
+					fetch_options = {"rerender": True}
+				excluded_products = current_excluded_products
+			elif action.kind == "toggle_team":
+				toggled, self.control.notice = toggle_team(self.team_cls, self.teams_list, action.value)
+				if toggled:
+					self.control.acknowledge(self.team_cls.teams_path)
+					engineer_list = set(team_members(self.teams_list))
+				else:
+					refreshed = self.reclassify(cases, excluded_products, group_list, engineer_list)
+
+	def next_action(self, seconds: float) -> Action:
+		if not self.control:
+			return Action("events" if self.wait_for_events(seconds) else "timer")
+		return self.control.next_action(seconds, wait=self.event_wait())
+
+	def reload(self, path: str) -> bool:
+		data, self.control.notice = reload_settings(path, self.config_cls, self.team_cls)
+		if data is None:
+			return False
+		if path == self.team_cls.teams_path:
+			self.teams_list = data
+			return True
+
+		if str(data.get(VARS.Role)).upper() != "ENGINEER":
+			raise RoleSwitch(str(data.get(VARS.Role)).upper())
+		self.apply_config(data)
+		return True
+
+	def exclusion_paths(self) -> list:
+		return [os.path.join(source.base_dir, "config", name) for source, name in ((self.products, FileNames.ExProducts), (self.cases, FileNames.ExCases))]
+
+	def acknowledge_exclusions(self):
+		for path in self.exclusion_paths():
+			self.control.acknowledge(path)
+
+	def exclude_case(self, case_number: str):
+		if not (case_number.isdigit() or case_number.upper() == "RESET"):
+			self.control.notice = f"'{case_number}' is not a case number, nothing was excluded"
+			return
+		self.cases.add_excluded_cases(case_number)
+		self.acknowledge_exclusions()
+
+	def close(self):
+		self.prefetch.cancel(wait=False)
+		if self.control:
+			self.control.stop()
+		if self.stream:
+			self.stream.stop()
+		if self.shared:
+			self.shared.close()
+
+	def refresh(self, excluded_products: set, group_list: set, engineer_list: set, rerender: bool = False, warm: bool = False, use_cache: bool = True) -> tuple:
+		"""Fetches and classifies one cycle, returning (sorted case results, queue trend, cases)"""
+		query = self.build_query(
+			excluded_products = excluded_products,
+			group_list = group_list,
+			engineer_name = self.engineer_name,
+			engineer_list = engineer_list
+		)
+
+		fetch = lambda: self.invoke_api(query, rerender = rerender, use_cache = use_cache)
+		if warm and not (self.isTest or self.replay_source or self.forwarding_agent()):
+			# Show the last cached snapshot while the first fetch is in flight
+			raw_cases = warm_start(
+				self.create_api_handler(query),
+				fetch,
+				render=lambda cases, age: self.display_results(
+					case_results=self.classify(ingest(cases, now=self.clock.time()), excluded_products, group_list, engineer_list),
+					queue_trend=self.record_history(None, record=False),
+					stale_seconds=age
+				)
+			)
+		else:
+			raw_cases = fetch()
+
+		case_results = ingest(raw_cases, now=self.clock.time())
+		sorted_case_results = self.classify(case_results, excluded_products, group_list, engineer_list)
+
+		return sorted_case_results, self.record_history(sorted_case_results.get("team_cases"), record=not rerender), case_results
 
-				if (len(current_excluded_products) != len(excluded_products)):
-					logger.info(f"The number of products in {FileNames.ExProducts} was changed, the display will be re-rendered")
-					excluded_products = current_excluded_products
-					rerender_due_to_update = True
-					update_detected = True
-					break
+	def reclassify(self, cases: list, excluded_products: set, group_list: set, engineer_list: set) -> tuple:
+		"""Re-sorts the cases already on screen after a local change, without a fetch"""
+		sorted_case_results = self.classify(cases, excluded_products, group_list, engineer_list)
+		return sorted_case_results, self.record_history(None, record=False), cases
 
-			if not update_detected:
-				rerender_due_to_update = False
+	def classify(self, cases: list, excluded_products: set, group_list: set, engineer_list: set) -> dict:
+		classify = self.partition_cases if self.partitioned_upload() else self.sort_cases
+		return classify(
+			cases=cases,
+			engineer_name=self.engineer_name,
+			excluded_products=excluded_products,
+			excluded_cases=self.cases.load_excluded_cases(log_event=False),
+			group_list=group_list,
+			engineer_list=engineer_list
+		)
 
-	def invoke_api(self, query: str, rerender: bool = False) -> dict:
+	def invoke_api(self, query: list, rerender: bool = False, use_cache: bool = True) -> dict:
 		logger.debug("Invoking the engineer handler's API call")
+		if self.replay_source:
+			return self.replay_source.run()
+		api_handler = self.create_api_handler(query, rerender)
+		stream_fetch = (lambda: self.stream.run(api_handler)) if self.stream else None
+		if self.shared:
+			return self.shared.run(api_handler, stream_fetch, use_cache)
+		return stream_fetch() if stream_fetch else api_handler.run(use_cache=use_cache)
+
+	def create_api_handler(self, query: list, rerender: bool = False) -> APIHandler:
 		return APIHandler(
-				api_url=self.config_data.get("api_url"),
-				username=self.config_data.get("username"),
-				query=query,
-				test=self.isTest,
-				config_cls=self.config_cls,
-				filereg_cls=self.filereg_cls,
-				rerender=rerender
-			).run()
+			api_url=self.config_data.get("api_url"),
+			username=self.config_data.get("username"),
+			query=query,
+			test=self.isTest,
+			config_cls=self.config_cls,
+			filereg_cls=self.filereg_cls,
+			rerender=rerender,
+			recorder=self.recorder,
+			max_workers=self.max_parallel_queries,
+			execution_mode=self.execution_mode,
+			change_probe=self.change_probe,
+			probe_max_skips=self.probe_max_skips,
+			hedge_requests=self.hedge_requests,
+			max_retries=self.max_retries
+		)
+
+	def next_poll_minutes(self) -> int:
+		# The poll interval stretches as the org's daily API allocation runs down
+		return self.poll_interval * budget.poll_multiplier()
+
+	def event_wait(self):
+		if self.shared and not self.shared.leader:
+			return self.shared.wait
+		if self.stream:
+			return self.stream.wait
+		return None
+
+	def wait_for_events(self, seconds: int) -> bool:
+		wait = self.event_wait()
+		if wait:
+			return wait(seconds)
+		self.clock.sleep(seconds)
+		return False
 	
-	def display_results(self, case_results: dict):
+	def record_history(self, cases: list, record: bool = True) -> list:
+		if not self.history:
+			return []
+		now = self.clock.time()
+		try:
+			if record and not self.isTest and not self.replay_source and (not self.shared or self.shared.leader):
+				self.history.append(cases, self.update_threshold / (24 * 60), now=now)
+			return self.history.trend(now=now)
+		except OSError as e:
+			logger.error(f"Unable to update the queue history: {e}")
+			return []
+
+	def display_results(self, case_results: dict, queue_trend: list = None, stale_seconds: float = None):
 		self.display_util.clear_screen()
-		self.display_util.display_header(self.poll_interval)
+		self.display_util.display_header(
+			self.next_poll_minutes(),
+			budget.summary(),
+			stale_seconds=stale_seconds,
+			status_lines=self.control.status_lines() if self.control else ()
+		)
+
+		if stale_seconds is None and exporter.enabled:
+			exporter.publish("engineer", engineer_families(case_results, self.update_threshold, now=self.clock.time()))
 
 		if self.forwarding_agent(): 
 			logger.debug("Display canceled, the system is acting as a forwarding agent")
-			uploadToTseBoard(case_results, self.config_cls)
+			if self.replay_source:
+				# Recorded snapshots must never reach the live board
+				logger.debug("Upload to the TSE board skipped during a replay")
+				return
+			if self.partitioned_upload():
+				uploadToTseBoard(
+					{case_number: case.to_dict() for case_number, case in case_results.get("records").items()},
+					self.config_cls,
+					views=dict(case_results.get("views"), validationFailed=case_results.get("case_validation_failed_list"))
+				)
+			else:
+				uploadToTseBoard({key: to_dicts(cases) for key, cases in case_results.items()}, self.config_cls)
 		else:
 			dashboard = EngineerDashboardData(
 				team_cases = case_results.get("team_cases"),
@@ -123,7 +364,8 @@ class EngineerHandler:
 				opened_today_cases = case_results.get("opened_today_cases"),
 				update_threshold = self.update_threshold,
 				color = self.color,
-				vacation_scheduled_until = self.config_cls.get_config_value("rules.vacation_scheduled_until")
+				vacation_scheduled_until = self.config_data.get("rules").get("vacation_scheduled_until", ""),
+				queue_trend = queue_trend or []
 			)
 			logger.debug("Rendering the display for the engineer flow")
 			self.display(dashboard).render()
@@ -134,7 +376,8 @@ class EngineerHandler:
 				logger.info(f"Cases failed validation: {case_validation_failed_list}")
 				self.display_util.failed_validation(case_validation_failed_list, self.color)
 			
-			self.send_alert(case_results.get("team_cases"))
+			if stale_seconds is None:
+				self.send_alert(case_results.get("team_cases"))
 	
 	def sort_cases(self, cases: dict, engineer_name: str, excluded_products: dict, excluded_cases: dict, group_list: dict, engineer_list: dict):
 		logger.debug("Sorting the cases into their resepective list based on the response from the API")
@@ -144,32 +387,25 @@ class EngineerHandler:
 		opened_today_cases = []
 		case_validation_failed_list = []
 
-		for idx, case in enumerate(cases):
-			owner_name_ref = case.get("Owner")
-			owner_name = owner_name_ref.get("Name", "") if owner_name_ref else ""
-
-			product_ref = case.get("Product__r")
-			product = product_ref.get("Name", "") if product_ref else ""
-
-			created_date_str = case.get("CreatedDate", "")
-			case_number = (case.get("CaseNumber", "") or "").strip()
-			
-			today = datetime.today()
+		today = self.clock.today()
+		matcher = self.owner_matcher(engineer_list, engineer_name)
 
-			if created_date_str: created_date = datetime.strptime(created_date_str[:10], "%Y-%m-%d")
+		for idx, case in enumerate(cases):
+			owner_name = case.owner
+			case_number = case.case_number
 
-			if not owner_name or not product or not created_date_str or not case_number:
+			if not case.valid:
 				logger.warning(f"Invalid Case Properties at idx {idx} of the {FileNames.QueryResults}. Skipping this case.")
 				case_validation_failed_list.append({"CaseNumber": case_number, "Index": idx})
 				continue
 
-			if (product not in excluded_products and owner_name in group_list) and (case_number not in excluded_cases):
+			if (case.product not in excluded_products and owner_name in group_list) and (case_number not in excluded_cases):
 				team_cases.append(case)
 
-			if engineer_name.lower() in owner_name.lower():
+			if engineer_name.strip() in matcher.match(owner_name):
 				personal_cases.append(case)
 
-			if owner_name in engineer_list and created_date.month == today.month and created_date.day == today.day:
+			if owner_name in engineer_list and case.created.month == today.month and case.created.day == today.day:
 				opened_today_cases.append(case)
 
 		logger.debug("Sort of cases has completed, returning the listings")
@@ -181,33 +417,93 @@ class EngineerHandler:
 			"case_validation_failed_list": case_validation_failed_list
 		}	
 
+	def partition_cases(self, cases: list, engineer_name: str, excluded_products: set, excluded_cases: set, group_list: set, engineer_list: set) -> dict:
+		"""
+		Single classification pass for the forwarding agent. Each case is kept once by case number
+		and the views only hold case numbers, keyed by owner or by engineer, so the board can
+		look a person up without scanning the full case list.
+		"""
+		logger.debug("Partitioning the forwarded cases by owner and engineer")
+
+		records = {}
+		queue = []
+		team = {}
+		opened_today = {}
+		team_cases = []
+		case_validation_failed_list = []
+
+		today = self.clock.today()
+		matcher = self.owner_matcher(engineer_list, engineer_name)
+		personal = {name: [] for name in matcher.engineers}
+
+		for idx, case in enumerate(cases):
+			owner_name = case.owner
+			case_number = case.case_number
+
+			if not case.valid:
+				logger.warning(f"Invalid Case Properties at idx {idx} of the {FileNames.QueryResults}. Skipping this case.")
+				case_validation_failed_list.append({"CaseNumber": case_number, "Index": idx})
+				continue
+
+			records[case_number] = case
+
+			if (case.product not in excluded_products and owner_name in group_list) and (case_number not in excluded_cases):
+				queue.append(case_number)
+				team_cases.append(case)
+
+			if owner_name in engineer_list:
+				team.setdefault(owner_name, []).append(case_number)
+				if case.created.month == today.month and case.created.day == today.day:
+					opened_today.setdefault(owner_name, []).append(case_number)
+
+			for name in matcher.match(owner_name):
+				personal[name].append(case_number)
+
+		logger.debug("Partitioned %d cases for %d engineers", len(records), len(personal))
+
+		return {
+			"records": records,
+			"views": {
+				"queue": queue,
+				"team": team,
+				"openedToday": opened_today,
+				"personal": personal,
+			},
+			"team_cases": team_cases,
+			"case_validation_failed_list": case_validation_failed_list
+		}
+
+	def owner_matcher(self, engineer_list, engineer_name: str = None):
+		engineers = {name.strip() for name in engineer_list} | ({engineer_name.strip()} if engineer_name else set())
+		if self.matcher is None or not engineers <= set(self.matcher.engineers):
+			self.matcher = build_matcher(engineers | set(self.matcher.engineers if self.matcher else ()))
+		return self.matcher
+
 	def send_alert(self, queue_cases: dict):
 		if os.name != "nt" and self.send_alerts:
 			alert(queue_cases, self.isTest, self.sound_alerts)
 
 	def forwarding_agent(self) -> bool:
-		return self.config_cls.get_config_value("rules.upload_to_tse_board", default=False)
-
-	def build_query(self, excluded_products, group_list, engineer_name, engineer_list):
-		logger.debug(f"Building the query for the engineer role")
-		excluded_product_list = "', '".join(excluded_products)
-		excluded_product_list = f"'{excluded_product_list}'"
-
-		upload_to_tse_board_enabled = self.forwarding_agent()
-
-		if upload_to_tse_board_enabled:
-			logger.debug("Query built for the engineer forwarding agent")
-			return self.queries["Engineer_Forwarding"].format(
-				excluded_product_list=excluded_product_list,
-				support_group=group_list,
-				engineer_name=engineer_name,
-				engineer_list=engineer_list
-			)
-		else:
-			logger.debug("Query built for the engineer flow")
-			return self.queries["Engineer"].format(
-				excluded_product_list=excluded_product_list,
-				support_group=group_list,
-				engineer_name=engineer_name,
-				engineer_list=engineer_list
-			)
\ No newline at end of file
+		return self.config_data.get("rules").get("upload_to_tse_board", False)
+
+	def partitioned_upload(self) -> bool:
+		# Boards still reading the payloadVersion 1 bucket lists keep getting them until they opt in
+		return self.forwarding_agent() and self.board_payload_version >= 2
+
+	def build_query(self, excluded_products, group_list, engineer_name, engineer_list) -> list:
+		query_name = "Engineer_Forwarding" if self.forwarding_agent() else "Engineer"
+		return render_query(self.query_builder, query_name, self.max_query_length, excluded_products, group_list, engineer_name, engineer_list)
+
+	@staticmethod
+	def initial_query(config_data: dict, teams_list: dict) -> list:
+		"""The query of the first cycle, built without a handler so startup can look up its cached result"""
+		rules = config_data.get("rules")
+		return render_query(
+			QueryBuilder(config_data.get("queries", {})),
+			"Engineer_Forwarding" if rules.get("upload_to_tse_board", False) else "Engineer",
+			rules.get("max_query_length", 16000),
+			excluded_products = Products().load_excluded_products(),
+			group_list = set(group_members(teams_list)),
+			engineer_name = config_data.get("engineer_name"),
+			engineer_list = set(team_members(teams_list))
+		)
\ No newline at end of file
@@ -1,6 +1,10 @@
 from logger import logger
+from utils.helper import handle_shutdown
+from tools.replay import ReplaySource
 from handlers.engineer import EngineerHandler
 from handlers.manager import ManagerHandler
+from handlers.daemon import DaemonHandler
+from api.cache import result_cache, cache_key
 import exceptions
 
 from display.engineer import EngineerDisplay
@@ -28,7 +32,25 @@ class Handler():
 	def init(self):
 		logger.info(f"{__class__.__name__} initialized successfully")
 
-	def run(self, role, debug, send_alerts, config_data, isTest, teamsList):
+	def cached_result_exists(self, role, config_data, teamsList) -> bool:
+		"""Whether the first query of the role has a cached result, however old"""
+		role_config = ROLE_CONFIG.get(str(role).upper())
+		if not role_config:
+			return False
+		queries = role_config["handler"].initial_query(config_data, teamsList)
+		return result_cache.get(cache_key(config_data.get("api_url"), config_data.get("username"), queries), stale_ok=True) is not None
+
+	def run(self, role, debug, send_alerts, config_data, isTest, teamsList, replay=None, daemon=None):
+		while True:
+			try:
+				return self.dispatch(role, debug, send_alerts, config_data, isTest, teamsList, replay=replay, daemon=daemon)
+			except exceptions.RoleSwitch as e:
+				logger.info(str(e))
+				role = self.config.set_role(e.role)
+				config_data = self.config.load_file()
+				teamsList = self.team.load_teams_list()
+
+	def dispatch(self, role, debug, send_alerts, config_data, isTest, teamsList, replay=None, daemon=None):
 		if type(role) != str:
 			raise TypeError(f"Role must be of type 'string'")
 		
@@ -42,16 +64,35 @@ class Handler():
 		handler_class = role_config["handler"]
 		display = role_config["display"]
 
-		handler = handler_class(
-			common_display=CommonDisplay(),
-			config_cls = self.config,
-			filereg_cls = self.filereg,
-			team_cls = self.team,
-			display=display,
-			config_data=config_data,
-			debug=debug,
-			send_alerts=send_alerts,
-			isTest=isTest,
-			teamsList=teamsList
-		)
-		handler.run(isTest)
\ No newline at end of file
+		handler_kwargs = {}
+		if daemon:
+			if replay:
+				raise exceptions.ConfigurationError("The daemon cannot be combined with a snapshot replay")
+			handler_class = DaemonHandler
+			handler_kwargs["port"] = daemon
+
+		try:
+			replay_source = None
+			if replay:
+				replay_source = ReplaySource(replay.get("archive"), speed=replay.get("speed", 0), label=role)
+				# Recorded cases are history, they must not page anyone again
+				send_alerts = False
+
+			handler = handler_class(
+				common_display=CommonDisplay(),
+				config_cls = self.config,
+				filereg_cls = self.filereg,
+				team_cls = self.team,
+				display=display,
+				config_data=config_data,
+				debug=debug,
+				send_alerts=send_alerts,
+				isTest=isTest,
+				teamsList=teamsList,
+				replay_source=replay_source,
+				**handler_kwargs
+			)
+			handler.run(isTest)
+		except exceptions.ReplayFinished as e:
+			logger.info(str(e))
+			handle_shutdown(0, reason=str(e))
\ No newline at end of file
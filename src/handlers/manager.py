@@ -1,23 +1,79 @@
-import time
 from display.manager import ManagerDisplay
 from display.common import CommonDisplay, ManagerDashboardData
 from logger import logger
-from exceptions import ConfigurationError
-from utils.helper import concat_group_list, concat_team_list
+from exceptions import ConfigurationError, RoleSwitch
+from config.team import Team
+from utils.helper import group_members, team_members, handle_shutdown
+from utils.columnar import build_columns
 from api.api_handler import APIHandler
+from api.query_builder import QueryBuilder
+from api.streaming import case_stream
+from api.coordinator import shared_fetch
+from api.budget import budget
+from tools.history import QueueHistory
+from tools.replay import SnapshotRecorder
+from utils.clock import get_clock
+from utils.records import ingest
+from handlers.warm_start import warm_start
+from handlers.prefetch import Prefetcher
+from handlers.control import ControlLoop, Action, KEYS, toggle_team
+from handlers.reload import reload_settings, settings_paths
+from tools.metrics import exporter, configure_metrics, manager_families
+from utils.variables import VARS
+
+def render_query(query_builder: QueryBuilder, max_length: int, group_member_set: set, team_member_set: set, queue_threshold_days: float) -> list:
+	return [chunk.query for chunk in query_builder.render_chunks(
+		"Manager",
+		max_length=max_length,
+		support_group=group_member_set,
+		team_list=team_member_set,
+		update_threshold=queue_threshold_days
+	)]
 
 class ManagerHandler:
-	def __init__(self, config_data, config_cls, filereg_cls, team_cls, debug, send_alerts, isTest, teamsList, display, common_display):
+	def __init__(self, config_data, config_cls, filereg_cls, team_cls, debug, send_alerts, isTest, teamsList, display, common_display, replay_source=None):
 		self.config_cls = config_cls
 		self.filereg_cls = filereg_cls
-		self.config_data = config_data
-		self.poll_interval = config_data.get("rules").get("poll_interval", 30)
-		self.queries = config_data.get("queries", {})
+		self.team_cls = team_cls
 		self.teams_list = teamsList
-		self.color = config_data.get("colors", None)
-		self.update_threshold = config_data.get("rules").get("update_threshold", 45)
+		self.cases = []
+		self.apply_config(config_data)
 		self.display = display
 		self.display_util = common_display
+		self.isTest = isTest
+		self.history = QueueHistory("manager").init() if config_data.get("rules").get("record_history", True) else None
+		self.replay_source = replay_source
+		self.recorder = SnapshotRecorder("MANAGER") if config_data.get("rules").get("record_snapshots", False) else None
+		self.clock = get_clock()
+		self.stream = case_stream(config_data) if not isTest and not replay_source else None
+		self.shared = shared_fetch(config_data, self.next_poll_minutes) if not isTest and not replay_source else None
+		self.prefetch = Prefetcher("manager", enabled=config_data.get("rules").get("prefetch", True) and not replay_source)
+		self.control = None
+
+	def apply_config(self, config_data: dict):
+		"""Derives the settings the loop reads from config.json, at startup and on every reload"""
+		rules = config_data.get("rules")
+		query_builder = QueryBuilder(config_data.get("queries", {}))
+
+		self.config_data = config_data
+		self.poll_interval = rules.get("poll_interval", 30)
+		self.queries = config_data.get("queries", {})
+		self.query_builder = query_builder
+		self.max_query_length = rules.get("max_query_length", 16000)
+		self.max_parallel_queries = rules.get("max_parallel_queries", 4)
+		self.execution_mode = rules.get("execution_mode", "batch")
+		self.change_probe = rules.get("change_probe", True)
+		self.probe_max_skips = rules.get("probe_max_skips", 5)
+		self.hedge_requests = rules.get("hedge_requests", True)
+		self.max_retries = rules.get("max_retries", 2)
+		budget.configure(
+			reserve=rules.get("api_budget_reserve", 0.05),
+			max_per_minute=rules.get("max_requests_per_minute", 0)
+		)
+		configure_metrics(rules)
+		self.color = config_data.get("colors", None)
+		self.update_threshold = rules.get("update_threshold", 45)
+		self.queue_threshold_days = self.update_threshold / (24 * 60)
 
 	def run(self, isTest):
 		logger.debug(f"Class {__class__.__name__} has been invoked")
@@ -30,54 +86,232 @@ class ManagerHandler:
 		if not username:
 			raise ConfigurationError(f"Missing username in the configuration file.")
 
-		team_names = concat_team_list(self.teams_list)
-		group_list = concat_group_list(self.teams_list)
+		Team.validate_teams_list(self.teams_list)
 
-		manager_query = self.queries["Manager"].format(
-			support_group=group_list,
-			team_list=team_names,
-			update_threshold=(self.update_threshold / (24 * 60))
-		)
+		if self.stream:
+			self.stream.start()
+
+		# Exclusions only shape the engineer view, so the manager gets every other key
+		if not self.replay_source:
+			self.control = ControlLoop(
+				watch_paths=settings_paths(self.config_cls, self.team_cls),
+				keys={key: kind for key, kind in KEYS.items() if not kind.startswith("exclude")}
+			).start()
+
+		try:
+			self.main_loop(isTest)
+		finally:
+			self.close()
+
+	def main_loop(self, isTest):
+		group_member_set = set(group_members(self.teams_list))
+		team_member_set = set(team_members(self.teams_list))
+
+		api_handler = self.create_api_handler(self.build_query(group_member_set, team_member_set), isTest)
 		logger.debug(f"The Manager query has been formated with configured Teams and update thresholds")
 
 		logger.info(f"Inside manager handler loop")
 
-		api_handler = APIHandler(
-			api_url=api_url,
-			username=username,
-			query=manager_query,
-			test=isTest,
-			config_cls=self.config_cls,
-			filereg_cls=self.filereg_cls
-		)
+		fetch = lambda use_cache=True: self.replay_source.run() if self.replay_source else self.fetch_cases(api_handler, use_cache)
+
+		if isTest or self.replay_source:
+			refreshed = self.refresh(fetch(), group_member_set, team_member_set)
+		else:
+			# Show the last cached snapshot while the first fetch is in flight
+			refreshed = self.refresh(warm_start(
+				api_handler,
+				fetch,
+				render=lambda cases, age: self.render(self.classify(ingest(cases, now=self.clock.time()), group_member_set, team_member_set, record=False), stale_seconds=age)
+			), group_member_set, team_member_set)
 
 		while True:
-			self.display_util.clear_screen()
-			self.display_util.display_header(self.poll_interval)
+			# Only the loop thread swaps in the cases on screen, the prefetch thread just returns them
+			dashboard, self.cases = refreshed
+			self.render(dashboard)
+
+			# The next cycle is fetched and classified in the background, timed to be ready when it is due
+			poll_seconds = self.next_poll_minutes() * 60
+			self.prefetch.schedule(lambda: self.refresh(fetch(), group_member_set, team_member_set), due_in=poll_seconds)
+
+			logger.debug("Waiting up to %d minutes for the next action.", self.next_poll_minutes())
+			action = self.next_action(poll_seconds)
+			if action.kind == "timer":
+				refreshed = self.prefetch.take() or self.prefetch.foreground(lambda: self.refresh(fetch(), group_member_set, team_member_set))
+				continue
+
+			# Every other action replaces the scheduled refresh, a late prefetch result is dropped
+			self.prefetch.cancel(wait=False)
+			use_cache = True
+
+			if action.kind == "quit":
+				handle_shutdown(0)
+			elif action.kind == "switch_role":
+				raise RoleSwitch("ENGINEER")
+			elif action.kind == "events":
+				logger.info("Case change events were received, the display will be re-rendered")
+			elif action.kind == "refresh":
+				use_cache = False
+			elif action.kind == "toggle_team":
+				toggled, self.control.notice = toggle_team(self.team_cls, self.teams_list, action.value)
+				if not toggled:
+					continue
+				self.control.acknowledge(self.team_cls.teams_path)
+				team_member_set = set(team_members(self.teams_list))
+				api_handler = self.create_api_handler(self.build_query(group_member_set, team_member_set), isTest)
+			elif action.kind == "files":
+				if not self.reload(action.value):
+					continue
+				group_member_set = set(group_members(self.teams_list))
+				team_member_set = set(team_members(self.teams_list))
+				query = self.build_query(group_member_set, team_member_set)
+				refetch = query != api_handler.queries
+				api_handler = self.create_api_handler(query, isTest)
 
-			cases = api_handler.run()
+				# Only a changed query needs a fetch, anything else re-buckets the cases on screen
+				if not refetch:
+					refreshed = self.classify(self.cases, group_member_set, team_member_set, record=False), self.cases
+					continue
 
-			queue_needs_commitment = []
-			team_needs_commitment = []
+			refreshed = self.prefetch.foreground(lambda: self.refresh(fetch(use_cache), group_member_set, team_member_set))
 
-			for case in cases:
-				owner_name = case.get("Owner", {}).get("Name", "")
-				commitment_time = case.get("Time_Before_Next_Update_Commitment__c")
+	def reload(self, path: str) -> bool:
+		data, self.control.notice = reload_settings(path, self.config_cls, self.team_cls)
+		if data is None:
+			return False
+		if path == self.team_cls.teams_path:
+			self.teams_list = data
+			return True
 
-				if owner_name in group_list and commitment_time is not None and commitment_time <= (self.update_threshold / (24 * 60)):
-					queue_needs_commitment.append(case)
+		if str(data.get(VARS.Role)).upper() != "MANAGER":
+			raise RoleSwitch(str(data.get(VARS.Role)).upper())
+		self.apply_config(data)
+		return True
 
-				elif owner_name in team_names and commitment_time is not None and commitment_time <= 1:
-					team_needs_commitment.append(case)
-			
-			dashboard = ManagerDashboardData(
-				queue_needs_commitment = queue_needs_commitment,
-				team_needs_commitment = team_needs_commitment,
-				update_threshold = self.update_threshold,
-				color = self.color
-			)
+	def next_action(self, seconds: float) -> Action:
+		if not self.control:
+			return Action("events" if self.wait_for_events(seconds) else "timer")
+		return self.control.next_action(seconds, wait=self.event_wait())
 
-			self.display(dashboard).render()
+	def close(self):
+		self.prefetch.cancel(wait=False)
+		if self.control:
+			self.control.stop()
+		if self.stream:
+			self.stream.stop()
+		if self.shared:
+			self.shared.close()
+
+	def refresh(self, records: list, group_member_set: set, team_member_set: set) -> tuple:
+		"""Classifies one fetched cycle, returning (dashboard, cases)"""
+		cases = ingest(records, now=self.clock.time())
+		return self.classify(cases, group_member_set, team_member_set), cases
+
+	def classify(self, cases: list, group_member_set: set, team_member_set: set, record: bool = True) -> ManagerDashboardData:
+		queue_needs_commitment, team_needs_commitment, team_owner_counts = self.bucket_cases(
+			cases=cases,
+			group_members=group_member_set,
+			team_members=team_member_set
+		)
+
+		return ManagerDashboardData(
+			queue_needs_commitment = queue_needs_commitment,
+			team_needs_commitment = team_needs_commitment,
+			team_owner_counts = team_owner_counts,
+			queue_trend = self.record_history(cases, record=record),
+			update_threshold = self.update_threshold,
+			color = self.color
+		)
+
+	def render(self, dashboard: ManagerDashboardData, stale_seconds: float = None):
+		self.display_util.clear_screen()
+		self.display_util.display_header(
+			self.next_poll_minutes(),
+			budget.summary(),
+			stale_seconds=stale_seconds,
+			status_lines=self.control.status_lines() if self.control else ()
+		)
+		self.display(dashboard).render()
+
+		if stale_seconds is None and exporter.enabled:
+			exporter.publish("manager", manager_families(dashboard))
+
+	def fetch_cases(self, api_handler: APIHandler, use_cache: bool = True) -> list:
+		stream_fetch = (lambda: self.stream.run(api_handler)) if self.stream else None
+		if self.shared:
+			return self.shared.run(api_handler, stream_fetch, use_cache)
+		return stream_fetch() if stream_fetch else api_handler.run(use_cache=use_cache)
+
+	def next_poll_minutes(self) -> int:
+		# The poll interval stretches as the org's daily API allocation runs down
+		return self.poll_interval * budget.poll_multiplier()
+
+	def event_wait(self):
+		if self.shared and not self.shared.leader:
+			return self.shared.wait
+		if self.stream:
+			return self.stream.wait
+		return None
+
+	def wait_for_events(self, seconds: int) -> bool:
+		wait = self.event_wait()
+		if wait:
+			return wait(seconds)
+		self.clock.sleep(seconds)
+		return False
+
+	def build_query(self, group_member_set: set, team_member_set: set) -> list:
+		return render_query(self.query_builder, self.max_query_length, group_member_set, team_member_set, self.queue_threshold_days)
+
+	@staticmethod
+	def initial_query(config_data: dict, teams_list: dict) -> list:
+		"""The query of the first cycle, built without a handler so startup can look up its cached result"""
+		rules = config_data.get("rules")
+		return render_query(
+			QueryBuilder(config_data.get("queries", {})),
+			rules.get("max_query_length", 16000),
+			set(group_members(teams_list)),
+			set(team_members(teams_list)),
+			rules.get("update_threshold", 45) / (24 * 60)
+		)
+
+	def create_api_handler(self, query: list, isTest: bool) -> APIHandler:
+		return APIHandler(
+			api_url=self.config_data.get("api_url"),
+			username=self.config_data.get("username"),
+			query=query,
+			test=isTest,
+			config_cls=self.config_cls,
+			filereg_cls=self.filereg_cls,
+			recorder=self.recorder,
+			max_workers=self.max_parallel_queries,
+			execution_mode=self.execution_mode,
+			change_probe=self.change_probe,
+			probe_max_skips=self.probe_max_skips,
+			hedge_requests=self.hedge_requests,
+			max_retries=self.max_retries
+		)
+
+	def record_history(self, cases: list, record: bool = True) -> list:
+		if not self.history:
+			return []
+		now = self.clock.time()
+		try:
+			if record and not self.isTest and not self.replay_source and (not self.shared or self.shared.leader):
+				self.history.append(cases, self.queue_threshold_days, now=now)
+			return self.history.trend(now=now)
+		except OSError as e:
+			logger.error(f"Unable to update the queue history: {e}")
+			return []
+
+	def bucket_cases(self, cases: list, group_members: set, team_members: set):
+		logger.debug("Bucketing the manager cases by commitment time")
+		columns = build_columns(cases, now=self.clock.time())
+
+		queue_idx, team_idx = columns.commitment_buckets(
+			group_members=group_members,
+			team_members=team_members,
+			queue_threshold=self.queue_threshold_days,
+			team_threshold=1
+		)
 
-			logger.debug(f"Sleeping for {self.poll_interval} minutes.")
-			time.sleep(self.poll_interval * 60)
+		return columns.take(queue_idx), columns.take(team_idx), columns.owner_counts(team_idx)
\ No newline at end of file
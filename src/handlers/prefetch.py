@@ -0,0 +1,99 @@
+import threading, time
+from collections import deque
+from logger import logger
+from tools.telemetry import telemetry
+
+class Prefetcher():
+	"""
+	Back buffer for a handler loop. After each render the next refresh is scheduled on a
+	worker thread, started early enough from recent refresh durations to finish just before
+	it is due, and the render thread swaps the finished result in without waiting on the network.
+	Every schedule starts a new generation, a cancelled job that is already fetching runs to the
+	end in the background and its result is dropped instead of being swapped in.
+	"""
+	def __init__(self, name: str, margin_seconds: float = 2, enabled: bool = True):
+		self.name = name
+		self.margin_seconds = margin_seconds
+		self.enabled = enabled
+		self.durations = deque(maxlen=8)
+		self.thread = None
+		self.cancelled = threading.Event()
+		self.generation = 0
+		self.lock = threading.Lock()
+		self.running = threading.Lock()
+		self.result = None
+		self.error = None
+
+	def lead_seconds(self) -> float:
+		# Assume a slow fetch until a few have been timed
+		return (max(self.durations) if self.durations else 10) + self.margin_seconds
+
+	def timed(self, produce):
+		started = time.perf_counter()
+		result = produce()
+		self.durations.append(time.perf_counter() - started)
+		telemetry.observe("prefetch.refresh_seconds", self.durations[-1])
+		return result
+
+	def foreground(self, produce):
+		"""Runs a refresh on the calling thread once a cancelled job still fetching has finished, so the two never overlap"""
+		with self.running:
+			return produce()
+
+	def schedule(self, produce, due_in: float):
+		self.cancel(wait=False)
+		if not self.enabled:
+			return
+
+		cancelled = self.cancelled = threading.Event()
+		generation = self.generation
+		start_in = max(0, due_in - self.lead_seconds())
+
+		def work():
+			if cancelled.wait(start_in):
+				return
+			result = error = None
+			with self.running:
+				try:
+					result = self.timed(produce)
+				except Exception as e:
+					error = e
+			with self.lock:
+				if generation != self.generation:
+					logger.debug("Dropping the result of a cancelled %s prefetch", self.name)
+					return
+				self.result, self.error = result, error
+
+		logger.debug("The %s refresh will be prefetched in %.0fs", self.name, start_in)
+		self.thread = threading.Thread(target=work, name=f"{self.name}-prefetch", daemon=True)
+		self.thread.start()
+
+	def take(self):
+		"""Returns the prefetched result, waiting if it is still in flight, or None when nothing was scheduled"""
+		if self.thread is None:
+			return None
+		if self.thread.is_alive():
+			logger.info("The %s prefetch has not finished yet, waiting for it", self.name)
+			telemetry.incr("prefetch.late")
+		self.thread.join()
+		self.thread = None
+
+		result, error = self.result, self.error
+		self.result = self.error = None
+		if error is not None:
+			raise error
+		telemetry.incr("prefetch.swaps")
+		return result
+
+	def cancel(self, wait: bool = True):
+		"""Drops the scheduled refresh, a fetch already in flight is left to finish and its result discarded"""
+		if self.thread is None:
+			return
+		self.cancelled.set()
+		with self.lock:
+			self.generation += 1
+			self.result = self.error = None
+		if wait:
+			self.thread.join()
+		self.thread = None
+		telemetry.incr("prefetch.cancelled")
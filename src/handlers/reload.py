@@ -0,0 +1,32 @@
+import os
+from logger import logger
+from config.config import load_json_file
+from config.team import Team
+from api.query_builder import QueryBuilder
+from exceptions import BadQuery, ConfigurationError, MalformedTeamConfiguration
+
+def settings_paths(config_cls, team_cls) -> list:
+	return [config_cls.config_path, team_cls.teams_path]
+
+def reload_settings(path: str, config_cls, team_cls) -> tuple:
+	"""
+	Reads and validates a changed config.json or teams.json. Returns (data, message), data is
+	None when the file is mid-edit or invalid so the caller keeps everything it derived before.
+	"""
+	name = os.path.basename(path)
+	data = load_json_file(path, context="a reload")
+	if not isinstance(data, dict):
+		return None, f"{name} could not be read, the previous settings are kept"
+
+	try:
+		if path == team_cls.teams_path:
+			Team.validate_teams_list(data, exit_if_misconfigured=True)
+		else:
+			config_cls.validate_items(data)
+			QueryBuilder(data.get("queries", {}))
+	except (BadQuery, ConfigurationError, MalformedTeamConfiguration, AttributeError, TypeError) as e:
+		logger.warning(f"Ignoring the change to {name}: {e}")
+		return None, f"{name} is invalid, the previous settings are kept: {e}"
+
+	logger.info(f"Reloaded {name}")
+	return data, f"Reloaded {name}"
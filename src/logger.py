@@ -1,25 +1,82 @@
-import logging, sys
+import atexit, copy, logging, queue, sys, threading, time
 from pathlib import Path
 from utils.variables import FileNames
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 LOG_FILE = Path(__file__).resolve().parent.parent / FileNames.RunningLog
 logger = logging.getLogger("logger")
+_listener = None
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets a call site logged with extra=every(seconds) through at most once per interval.
+    The next record that gets through notes how many were dropped in between.
+    """
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.sites = {}
+
+    def filter(self, record):
+        interval = getattr(record, "rate_limit", None)
+        if not interval:
+            return True
+
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self.lock:
+            last, suppressed = self.sites.get(site, (None, 0))
+            if last is not None and now - last < interval:
+                self.sites[site] = (last, suppressed + 1)
+                return False
+            self.sites[site] = (now, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} (suppressed {suppressed} similar)"
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queues the record as logged. The stock prepare() formats the message on the calling thread,
+    here msg % args is left to the listener thread's handlers. Lists, dicts and sets passed as
+    args are copied one level deep first, so a set that changes after the call is still logged
+    as it was when the call was made.
+    """
+    def prepare(self, record):
+        if isinstance(record.args, dict):
+            record.args = {key: snapshot(value) for key, value in record.args.items()}
+        elif record.args:
+            record.args = tuple(snapshot(arg) for arg in record.args)
+        return record
+
+def snapshot(value):
+    return copy.copy(value) if isinstance(value, (list, dict, set, bytearray)) else value
+
+def every(seconds):
+    return {"rate_limit": seconds}
+
+def stop_logger():
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
 
 def setup_logger(
     log_level=None,
     max_mb=2,
     backup_count=1
 ):
-    global logger
+    global logger, _listener
     if log_level not in ('info', 'debug'):
         return logger
 
+    stop_logger()
     for h in list(logger.handlers):
-        if isinstance(h, logging.FileHandler):
+        if isinstance(h, (logging.FileHandler, QueueHandler)):
             logger.removeHandler(h)
 
-    logger.setLevel(logging.DEBUG)
+    # Records below the level are dropped before any formatting happens
+    logger.setLevel(logging.DEBUG if log_level == 'debug' else logging.INFO)
 
     formatter_file = logging.Formatter('%(asctime)s | %(levelname)-6s | %(module)-11s | (%(funcName)s) - %(message)s')
 
@@ -46,8 +103,14 @@ def setup_logger(
         console_handler.setLevel(logging.ERROR)
         console_handler.setFormatter(formatter_console)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # File and console writes happen on the listener thread, off the polling loop
+        queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RateLimitFilter())
+        _listener = QueueListener(queue_handler.queue, file_handler, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logger)
+
+        logger.addHandler(queue_handler)
 
         logger.propagate = False
 
@@ -39,6 +39,8 @@ class AppStartup:
 
     self.debug = False
     self.test = False
+    self.replay = None
+    self.daemon = None
 
     self.ctx = None
     self.config_dir = Path(__file__).resolve().parent.parent / VARS.Config
@@ -68,6 +70,8 @@ class AppStartup:
     self.logger = base_logger
 
     args = argument_handler(user_args)
+    self.replay = args.get(VARS.Replay) or None
+    self.daemon = args.get(VARS.Daemon) or None
 
     signal.signal(signal.SIGINT, signal_handler)
 
@@ -98,7 +102,14 @@ class AppStartup:
     try:
       self.logger.info("******************* Setup Complete *******************")
 
-      cached_buffer_exists = (self.config_dir / FileNames.QueryResults).exists()
+      config_data = ctx.config.load_file()
+      teamsList = ctx.team.load_teams_list()
+
+      role = config_data[VARS.Role]
+      send_alerts = config_data[VARS.Alerts][VARS.Send]
+
+      # Test mode only stays off the API when the role's own query was cached
+      cached_buffer_exists = self.test and ctx.handler.cached_result_exists(role, config_data, teamsList)
       passwd_file_exists = (self.config_dir / FileNames.PasswordFile).exists()
       key_file_exists = (self.config_dir / FileNames.KeyFile).exists()
 
@@ -114,22 +125,16 @@ class AppStartup:
 
       if test_mode_without_cache:
         print(
-          f"You are entering Test mode but "
-          f"{FileNames.QueryResults} was not previously cached.\n"
-          f"Please ensure your password is correctly entered "
-          f"as the API will be hit!"
+          "You are entering Test mode but "
+          "no query result was previously cached.\n"
+          "Please ensure your password is correctly entered "
+          "as the API will be hit!"
         )
       
-      if needs_password_generated or test_mode_without_cache:
+      if (needs_password_generated or test_mode_without_cache) and not self.replay:
         generate_encrypted_passwd()
 
-      config_data = ctx.config.load_file()
-      teamsList = ctx.team.load_teams_list()
-
-      role = config_data[VARS.Role]
-      send_alerts = config_data[VARS.Alerts][VARS.Send]
-
-      ctx.handler.run(role, self.debug, send_alerts, config_data, self.test, teamsList)
+      ctx.handler.run(role, self.debug, send_alerts, config_data, self.test, teamsList, replay=self.replay, daemon=self.daemon)
 
     except Exception as e:
       self.logger.exception(f"{type(e).__name__}: {e}")
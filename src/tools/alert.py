@@ -10,7 +10,7 @@ def alert(cases, isTest: False, sound):
     return
 
   for case in cases:
-    product = case.get('Product__r', {}).get('Name', 'No Product')
+    product = case.product or 'No Product'
     product_count[product] += 1
 
   if product_count:
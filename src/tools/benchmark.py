@@ -0,0 +1,92 @@
+import json, time
+from urllib.parse import urljoin
+import requests
+from requests.auth import HTTPBasicAuth
+from logger import logger
+from api.budget import budget
+from tools.telemetry import percentile
+
+def fetch_once(session: requests.Session, api_url: str, auth, query: str, live: bool) -> dict:
+  """
+  Runs one query to completion, following every nextRecordsUrl. Network time and JSON
+  decode time are measured separately so a heavier column list shows up as decode cost.
+  """
+  sample = {"seconds": 0.0, "decode": 0.0, "bytes": 0, "records": 0, "requests": 0}
+  url, params = api_url, {"q": query}
+
+  while url:
+    started = time.perf_counter()
+    response = session.get(url, params=params, auth=auth, headers={"Content-Type": "application/json"}, timeout=(5, 120))
+    content = response.content
+    sample["seconds"] += time.perf_counter() - started
+    sample["requests"] += 1
+    sample["bytes"] += len(content)
+    if live:
+      budget.observe(response.headers)
+
+    if response.status_code != 200:
+      raise requests.exceptions.HTTPError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+    started = time.perf_counter()
+    page = json.loads(content)
+    sample["decode"] += time.perf_counter() - started
+    sample["records"] += len(page.get("records", []))
+
+    next_url = None if page.get("done", True) else page.get("nextRecordsUrl")
+    url, params = (urljoin(api_url, next_url), None) if next_url else (None, None)
+
+  return sample
+
+def run_variant(api_url: str, auth, query: str, runs: int, live: bool = True) -> dict:
+  """Cold runs open a new connection each time, warm runs reuse one after a discarded warm-up"""
+  results = {}
+
+  cold = []
+  for _ in range(runs):
+    with requests.Session() as session:
+      cold.append(fetch_once(session, api_url, auth, query, live))
+  results["cold"] = cold
+
+  with requests.Session() as session:
+    fetch_once(session, api_url, auth, query, live)
+    results["warm"] = [fetch_once(session, api_url, auth, query, live) for _ in range(runs)]
+
+  return results
+
+def summarize(samples: list) -> dict:
+  seconds = [sample["seconds"] for sample in samples]
+  decode = [sample["decode"] for sample in samples]
+  return {
+    "p50": percentile(seconds, 50),
+    "p95": percentile(seconds, 95),
+    "p99": percentile(seconds, 99),
+    "decode": percentile(decode, 50),
+    "records": samples[-1]["records"],
+    "bytes": samples[-1]["bytes"],
+    "requests": samples[-1]["requests"],
+  }
+
+def print_benchmark(variants: list, runs: int):
+  print(f"\n== Query benchmark, {runs} run(s) per connection mode ==")
+  for idx, (query, results) in enumerate(variants, start=1):
+    print(f"\n  Variant {idx}: {query[:100]}{'...' if len(query) > 100 else ''}")
+    print(f"    {'Mode':<6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'Decode ms':>10} {'Records':>8} {'KB':>9} {'Calls':>6}")
+    for mode in ("cold", "warm"):
+      stats = summarize(results[mode])
+      print(
+        f"    {mode:<6} {stats['p50'] * 1000:>9.1f} {stats['p95'] * 1000:>9.1f} {stats['p99'] * 1000:>9.1f} "
+        f"{stats['decode'] * 1000:>10.1f} {stats['records']:>8} {stats['bytes'] / 1024:>9.1f} {stats['requests']:>6}"
+      )
+
+def benchmark(api_url: str, username: str, password: str, queries: list, runs: int, live: bool = True) -> list:
+  auth = HTTPBasicAuth(username, password)
+  variants = []
+  for query in queries:
+    logger.info(f"Benchmarking {runs} cold and {runs} warm run(s) of: {query}")
+    try:
+      variants.append((query, run_variant(api_url, auth, query, runs, live)))
+    except requests.exceptions.RequestException as e:
+      logger.error(f"Benchmark of '{query}' failed: {e}")
+      print(f"Variant failed and was skipped: {e}")
+  print_benchmark(variants, runs)
+  return variants
@@ -0,0 +1,174 @@
+import csv, json, sys
+from logger import logger
+
+try:
+  import pyarrow as pa
+  import pyarrow.parquet as pq
+except ImportError:
+  pa = None
+  pq = None
+
+FORMATS = ("print", "ndjson", "csv", "parquet")
+
+def compile_path(column: str):
+  """Builds a getter for a selected column once, dotted relationship paths may be any depth"""
+  parts = tuple(column.split("."))
+  head = parts[0]
+
+  if len(parts) == 1:
+    return lambda record: record.get(head)
+
+  def getter(record):
+    value = record
+    for part in parts:
+      if not isinstance(value, dict):
+        return None
+      value = value.get(part)
+    return value
+  return getter
+
+def compile_projection(columns: list) -> list:
+  return [(column, compile_path(column)) for column in columns]
+
+def project(records: list, projection: list) -> list:
+  return [tuple(getter(record) for _, getter in projection) for record in records]
+
+class PrintWriter():
+  def __init__(self, path: str = None):
+    self.out = open(path, "w", encoding="utf-8") if path else sys.stdout
+    self.count = 0
+
+  def open(self, names: list):
+    self.names = names
+
+  def write(self, rows: list):
+    for row in rows:
+      self.count += 1
+      lines = [f"----- Record {self.count} -----"]
+      lines.extend(f"{name}: {value}" for name, value in zip(self.names, row))
+      self.out.write("\n".join(lines) + "\n")
+
+  def close(self):
+    if self.out is not sys.stdout:
+      self.out.close()
+
+class NdjsonWriter(PrintWriter):
+  def write(self, rows: list):
+    names = self.names
+    self.out.writelines(json.dumps(dict(zip(names, row)), default=str) + "\n" for row in rows)
+    self.count += len(rows)
+
+class CsvWriter(PrintWriter):
+  def __init__(self, path: str = None):
+    self.out = open(path, "w", encoding="utf-8", newline="") if path else sys.stdout
+    self.count = 0
+
+  def open(self, names: list):
+    self.names = names
+    self.writer = csv.writer(self.out)
+    self.writer.writerow(names)
+
+  def write(self, rows: list):
+    self.writer.writerows(rows)
+    self.count += len(rows)
+
+def column_kind(values) -> str:
+  """
+  The parquet type of a column, judged on its first page. Integers and floats share a double
+  column so a later page of either fits, columns of anything else or only nulls hold text.
+  """
+  kinds = {type(value) for value in values if value is not None}
+  if kinds and kinds <= {int, float}:
+    return "double"
+  if kinds == {bool}:
+    return "bool"
+  return "string"
+
+def cast_value(value, kind: str):
+  """Fits a value into its column's type, returns (value, fitted). Values a typed column cannot hold become null"""
+  if value is None:
+    return None, True
+  if kind == "string":
+    return (value if isinstance(value, str) else json.dumps(value, default=str)), True
+  if kind == "double":
+    try:
+      return float(value), True
+    except (TypeError, ValueError):
+      pass
+  if kind == "bool" and isinstance(value, bool):
+    return value, True
+  return None, False
+
+class ParquetWriter():
+  """
+  Writes every result page as one row group. Column types are chosen from the first page by
+  column_kind() and every later page is cast to them, so the schema never has to change mid-file.
+  """
+  TYPES = {"double": "float64", "bool": "bool_", "string": "string"}
+
+  def __init__(self, path: str):
+    if pa is None:
+      raise RuntimeError("The parquet format needs the optional pyarrow package, run pip install pyarrow")
+    if not path:
+      raise RuntimeError("The parquet format needs an output path")
+    self.path = path
+    self.writer = None
+    self.count = 0
+    self.unfitted = {}
+
+  def open(self, names: list):
+    self.names = names
+
+  def write(self, rows: list):
+    if not rows:
+      return
+    columns = list(zip(*rows))
+
+    if self.writer is None:
+      self.kinds = [column_kind(values) for values in columns]
+      self.schema = pa.schema([pa.field(name, getattr(pa, self.TYPES[kind])()) for name, kind in zip(self.names, self.kinds)])
+      self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    arrays = []
+    for field, kind, values in zip(self.schema, self.kinds, columns):
+      cast = []
+      for value in values:
+        value, fitted = cast_value(value, kind)
+        if not fitted:
+          self.unfitted[field.name] = self.unfitted.get(field.name, 0) + 1
+        cast.append(value)
+      arrays.append(pa.array(cast, type=field.type))
+    self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+    self.count += len(rows)
+
+  def close(self):
+    if self.writer is None:
+      self.writer = pq.ParquetWriter(self.path, pa.schema([pa.field(name, pa.string()) for name in self.names]))
+    self.writer.close()
+    for name, count in self.unfitted.items():
+      logger.warning(f"{count} values of {name} did not fit its {self.schema.field(name).type} column and were written as null")
+
+WRITERS = {
+  "print": PrintWriter,
+  "ndjson": NdjsonWriter,
+  "csv": CsvWriter,
+  "parquet": ParquetWriter,
+}
+
+def export_pages(pages, columns: list, fmt: str = "print", path: str = None) -> int:
+  """
+  Streams result pages through the compiled projection into the chosen format.
+  Only one page is held in memory at a time, returns the number of records written.
+  """
+  projection = compile_projection(columns)
+  writer = WRITERS[fmt](path)
+  writer.open([name for name, _ in projection])
+
+  try:
+    for records, _ in pages:
+      writer.write(project(records, projection))
+      logger.debug("Exported %d records so far", writer.count)
+  finally:
+    writer.close()
+
+  return writer.count
@@ -0,0 +1,302 @@
+import json, os, time, mmap
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter as Tally
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from logger import logger
+from utils.variables import FileNames, VARS
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+  import msvcrt
+
+HISTORY_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.History
+
+# The engineer and manager views count different case sets, each keeps its own store
+VIEWS = ("engineer", "manager")
+
+# Each chunk (one per calendar month) holds one file per column. Rows are appended in
+# time order so the timestamp column stays sorted and ranges can be bisected in place.
+COLUMNS = {
+  "ts": "I",
+  "kind": "B",
+  "key": "I",
+  "count": "I",
+}
+
+KIND_TOTAL = 0
+KIND_PRODUCT = 1
+KIND_OWNER = 2
+KIND_SEVERITY = 3
+KIND_RISK = 4
+KIND_AGE = 5
+
+KIND_NAMES = {
+  "total": KIND_TOTAL,
+  "product": KIND_PRODUCT,
+  "owner": KIND_OWNER,
+  "severity": KIND_SEVERITY,
+  "risk": KIND_RISK,
+  "age": KIND_AGE,
+}
+
+class QueueHistory():
+  """
+  Append-only store of queue summaries for one view. Several processes on a host may
+  write to the same view, so every append holds an exclusive lock on the store while it
+  merges the key map and extends the columns.
+  """
+  def __init__(self, view: str, path: Path = HISTORY_PATH):
+    self.view = view
+    self.path = Path(path) / view
+    self.keys_path = self.path / "keys.json"
+    self.lock_path = self.path / "history.lock"
+    self.keys = {}
+    self.names = {}
+
+  def init(self):
+    self.path.mkdir(parents=True, exist_ok=True)
+    self._load_keys()
+    return self
+
+  def _load_keys(self):
+    if self.keys_path.exists():
+      with open(self.keys_path, "r") as f:
+        self.keys.update(json.load(f))
+    self.names = {key_id: name for name, key_id in self.keys.items()}
+
+  def summarize(self, cases: list, threshold_days: float, now: float = None) -> list:
+    now = now or time.time()
+    rows = Tally()
+    ages = []
+
+    for case in cases:
+      owner = case.owner or "n/a"
+      product = case.product or "No Product"
+      severity = case.priority or "n/a"
+      commitment = case.commitment_at(now)
+
+      rows[(KIND_PRODUCT, product)] += 1
+      rows[(KIND_OWNER, owner)] += 1
+      rows[(KIND_SEVERITY, severity)] += 1
+
+      if commitment is not None:
+        if commitment < 0: rows[(KIND_RISK, "missed")] += 1
+        elif commitment <= threshold_days: rows[(KIND_RISK, "threshold")] += 1
+        elif commitment <= 1: rows[(KIND_RISK, "day")] += 1
+
+      if case.created:
+        ages.append(max(0, int((now - case.created.timestamp()) // 60)))
+
+    rows[(KIND_TOTAL, "cases")] = len(cases)
+    if ages:
+      rows[(KIND_AGE, "max")] = max(ages)
+      rows[(KIND_AGE, "mean")] = sum(ages) // len(ages)
+
+    return list(rows.items())
+
+  def append(self, cases: list, threshold_days: float, now: float = None):
+    now = int(now or time.time())
+    rows = self.summarize(cases, threshold_days, now)
+
+    with self._locked():
+      # Another writer may have handed out ids since the last append, theirs are kept
+      self._load_keys()
+      chunk = self._chunk_dir(now)
+      chunk.mkdir(parents=True, exist_ok=True)
+      # The timestamp column must stay sorted for bisect even if another writer got ahead
+      now = max(now, self._align_columns(chunk))
+
+      columns = {name: array(code) for name, code in COLUMNS.items()}
+      new_keys = False
+
+      for (kind, name), count in rows:
+        key_name = f"{kind}:{name}"
+        key_id = self.keys.get(key_name)
+        if key_id is None:
+          key_id = max(self.names, default=-1) + 1
+          self.keys[key_name] = key_id
+          self.names[key_id] = key_name
+          new_keys = True
+        columns["ts"].append(now)
+        columns["kind"].append(kind)
+        columns["key"].append(key_id)
+        columns["count"].append(min(count, 0xFFFFFFFF))
+
+      if new_keys:
+        self._write_keys()
+
+      for name, values in columns.items():
+        with open(chunk / f"{name}.col", "ab") as f:
+          values.tofile(f)
+
+    logger.debug("Appended %d history rows to %s", len(rows), chunk.name)
+
+  def series(self, kind: str, start: float, end: float = None, name: str = None):
+    """Yields (timestamp, key name, count) rows for one kind between start and end."""
+    kind_id = KIND_NAMES[kind]
+    end = end or time.time()
+    key_filter = None
+    if name:
+      if f"{kind_id}:{name}" not in self.keys:
+        # Another process may be the writer for this view
+        self._load_keys()
+      key_filter = self.keys.get(f"{kind_id}:{name}")
+      if key_filter is None:
+        return
+
+    for chunk in self._chunks_between(start, end):
+      with ChunkReader(chunk) as reader:
+        lo, hi = reader.bounds(start, end)
+        ts, kinds, keys, counts = reader.ts, reader.kind, reader.key, reader.count
+        for idx in range(lo, hi):
+          if kinds[idx] != kind_id: continue
+          if key_filter is not None and keys[idx] != key_filter: continue
+          yield ts[idx], self.names.get(keys[idx], "?").split(":", 1)[1], counts[idx]
+
+  def downsample(self, kind: str, name: str, start: float, end: float = None, buckets: int = 48) -> list:
+    end = end or time.time()
+    width = max(1, (end - start) / buckets)
+    values = [None] * buckets
+    for ts, _, count in self.series(kind, start, end, name=name):
+      slot = min(buckets - 1, int((ts - start) // width))
+      values[slot] = count if values[slot] is None else max(values[slot], count)
+    return values
+
+  def trend(self, hours: int = 24, now: float = None, buckets: int = 48) -> list:
+    now = now or time.time()
+    return self.downsample("total", "cases", start=now - hours * 60 * 60, end=now, buckets=buckets)
+
+  @contextmanager
+  def _locked(self):
+    with open(self.lock_path, "a+") as handle:
+      if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+      else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+      try:
+        yield
+      finally:
+        if fcntl:
+          fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+          handle.seek(0)
+          msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+  def _align_columns(self, chunk: Path) -> int:
+    """Trims a partial row left by a crashed writer and returns the chunk's last timestamp."""
+    paths = {name: chunk / f"{name}.col" for name in COLUMNS}
+    sizes = {name: path.stat().st_size if path.exists() else 0 for name, path in paths.items()}
+    rows = min(sizes[name] // array(code).itemsize for name, code in COLUMNS.items())
+
+    for name, code in COLUMNS.items():
+      full = rows * array(code).itemsize
+      if sizes[name] != full:
+        logger.warning(f"Trimming a partial row from {paths[name]}")
+        os.truncate(paths[name], full)
+
+    if not rows:
+      return 0
+    last = array(COLUMNS["ts"])
+    with open(paths["ts"], "rb") as f:
+      f.seek((rows - 1) * last.itemsize)
+      last.fromfile(f, 1)
+    return last[0]
+
+  def _write_keys(self):
+    tmp_path = self.keys_path.with_name(f"keys.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+      json.dump(self.keys, f)
+    os.replace(tmp_path, self.keys_path)
+
+  def _chunk_dir(self, ts: float) -> Path:
+    return self.path / datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+  def _chunks_between(self, start: float, end: float):
+    first = self._chunk_dir(start).name
+    last = self._chunk_dir(end).name
+    for chunk in sorted(p for p in self.path.iterdir() if p.is_dir()):
+      if first <= chunk.name <= last:
+        yield chunk
+
+class ChunkReader():
+  def __init__(self, chunk: Path):
+    self.chunk = chunk
+    self.files = []
+    self.maps = []
+
+  def __enter__(self):
+    views = {}
+    for name, code in COLUMNS.items():
+      path = self.chunk / f"{name}.col"
+      size = path.stat().st_size if path.exists() else 0
+      if size == 0:
+        views[name] = memoryview(array(code))
+        continue
+      f = open(path, "rb")
+      mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+      self.files.append(f)
+      self.maps.append(mapped)
+      itemsize = array(code).itemsize
+      views[name] = memoryview(mapped)[:size - size % itemsize].cast(code)
+
+    # A crash between column appends leaves ragged columns, only full rows are readable
+    rows = min(len(view) for view in views.values())
+    for name, view in views.items():
+      setattr(self, name, view[:rows])
+    self.views = views
+    return self
+
+  def bounds(self, start: float, end: float):
+    return bisect_left(self.ts, start), bisect_right(self.ts, end)
+
+  def __exit__(self, *exc):
+    for name in COLUMNS:
+      getattr(self, name).release()
+    for view in self.views.values():
+      view.release()
+    for mapped in self.maps:
+      mapped.close()
+    for f in self.files:
+      f.close()
+    return False
+
+def sparkline(values: list) -> str:
+  ticks = "▁▂▃▄▅▆▇█"
+  present = [v for v in values if v is not None]
+  if not present:
+    return ""
+  low, high = min(present), max(present)
+  span = (high - low) or 1
+  return "".join(" " if v is None else ticks[int((v - low) / span * (len(ticks) - 1))] for v in values)
+
+def print_report(history: QueueHistory, hours: int, now: float = None):
+  now = now or time.time()
+  start = now - hours * 60 * 60
+
+  print(f"\n== {history.view.capitalize()} queue history for the last {hours} hour(s) ==")
+  print(f"  Depth: {sparkline(history.trend(hours=hours, now=now, buckets=60)) or 'No samples recorded'}")
+
+  for kind in ("product", "owner", "severity", "risk", "age"):
+    stats = {}
+    for _, name, count in history.series(kind, start, now):
+      entry = stats.setdefault(name, [count, count, 0, 0, count])
+      entry[0] = min(entry[0], count)
+      entry[1] = max(entry[1], count)
+      entry[2] += count
+      entry[3] += 1
+      entry[4] = count
+
+    if not stats:
+      continue
+
+    unit = " (minutes)" if kind == "age" else ""
+    print(f"\n  {kind.capitalize()}{unit}")
+    print(f"    {'Name':<30} {'Now':>6} {'Min':>6} {'Max':>6} {'Avg':>8}")
+    for name, (low, high, total, samples, latest) in sorted(stats.items(), key=lambda item: -item[1][4]):
+      print(f"    {name[:30]:<30} {latest:>6} {low:>6} {high:>6} {total / samples:>8.1f}")
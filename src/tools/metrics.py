@@ -0,0 +1,177 @@
+import os, re, threading, time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from logger import logger
+from tools.telemetry import telemetry
+
+PREFIX = "sfquery"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNSAFE = re.compile(r"[^a-zA-Z0-9_]")
+
+def metric_name(name: str) -> str:
+  return f"{PREFIX}_{UNSAFE.sub('_', name)}"
+
+def escape_label(value) -> str:
+  return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_sample(name: str, labels: dict, value) -> str:
+  if labels:
+    pairs = ",".join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+    return f"{name}{{{pairs}}} {float(value)!r}"
+  return f"{name} {float(value)!r}"
+
+def format_family(name: str, kind: str, help_text: str, samples: list) -> list:
+  lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+  lines.extend(format_sample(sample_name or name, labels, value) for sample_name, labels, value in samples)
+  return lines
+
+def at_risk(cases: list, threshold_days: float, now: float) -> int:
+  commitments = (case.commitment_at(now) for case in cases)
+  return sum(1 for commitment in commitments if commitment and commitment < threshold_days)
+
+def engineer_families(case_results: dict, update_threshold: float, now: float = None) -> list:
+  """Queue state of the engineer view, read straight off the classified cases"""
+  now = now or time.time()
+  team_cases = case_results.get("team_cases") or []
+  labels = {"view": "engineer"}
+  families = [
+    (metric_name("queue_cases"), "gauge", "Support group cases in the queue after exclusions, by product",
+      [(None, dict(labels, product=product), count) for product, count in sorted(Counter(case.product for case in team_cases).items(), key=lambda item: str(item[0]))]),
+    (metric_name("commitments_at_risk"), "gauge", "Cases whose next update commitment is due within the update threshold",
+      [(None, dict(labels, scope="queue"), at_risk(team_cases, update_threshold / (24 * 60), now))]),
+  ]
+
+  opened_today = case_results.get("opened_today_cases")
+  if opened_today is None:
+    opened_today = [number for numbers in case_results.get("views", {}).get("openedToday", {}).values() for number in numbers]
+  families.append((metric_name("opened_today_cases"), "gauge", "Team member cases opened today", [(None, labels, len(opened_today))]))
+
+  if case_results.get("personal_cases") is not None:
+    families.append((metric_name("personal_cases"), "gauge", "Cases owned by the configured engineer", [(None, labels, len(case_results.get("personal_cases")))]))
+  return families
+
+def manager_families(dashboard) -> list:
+  """Queue state of the manager view, the manager query only returns cases due within the threshold"""
+  labels = {"view": "manager"}
+  queue = dashboard.queue_needs_commitment
+  return [
+    (metric_name("queue_commitments_at_risk"), "gauge", "Support group cases whose next update commitment is due within the update threshold, by product",
+      [(None, dict(labels, product=product), count) for product, count in sorted(Counter(case.product for case in queue).items(), key=lambda item: str(item[0]))]),
+    (metric_name("commitments_at_risk"), "gauge", "Cases whose next update commitment is due within the update threshold",
+      [(None, dict(labels, scope="queue"), len(queue)), (None, dict(labels, scope="team"), len(dashboard.team_needs_commitment))]),
+    (metric_name("owner_commitments_at_risk"), "gauge", "Team cases due within a day, by owner",
+      [(None, dict(labels, owner=owner), count) for owner, count in sorted(dashboard.team_owner_counts.items())]),
+  ]
+
+def telemetry_families(snapshot: dict) -> list:
+  families = []
+  for name, value in sorted(snapshot["counters"].items()):
+    families.append((metric_name(name) + "_total", "counter", f"Telemetry counter {name}", [(None, {}, value)]))
+
+  for name, value in sorted(snapshot["gauges"].items()):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+      families.append((metric_name(name), "gauge", f"Telemetry gauge {name}", [(None, {}, value)]))
+
+  for name, timing in sorted(snapshot["timings"].items()):
+    base = metric_name(name)
+    samples = [(None, {"quantile": q}, timing[key]) for q, key in (("0.5", "p50"), ("0.95", "p95")) if timing[key] is not None]
+    samples += [(base + "_sum", {}, timing["sum"]), (base + "_count", {}, timing["total"])]
+    families.append((base, "summary", f"Telemetry timing {name}, quantiles over the last {timing['count']} observations", samples))
+  return families
+
+class MetricsExporter():
+  """
+  Optional Prometheus surface. Handlers publish the families derived from each classified
+  snapshot, which only swaps a reference. The exposition text is rendered when it is scraped
+  over HTTP on localhost, or written once per publish to a node-exporter textfile.
+  """
+  def __init__(self):
+    self.views = {}
+    self.published_at = {}
+    self.lock = threading.Lock()
+    self.server = None
+    self.port = 0
+    self.textfile = None
+
+  def configure(self, port: int = 0, textfile: str = None):
+    with self.lock:
+      self.textfile = Path(textfile).expanduser() if textfile else None
+      if port == self.port:
+        return
+      if self.server:
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+      self.port = port
+      if port:
+        self.serve(port)
+
+  @property
+  def enabled(self) -> bool:
+    return bool(self.server or self.textfile)
+
+  def publish(self, view: str, families: list):
+    self.views[view] = families
+    self.published_at[view] = time.time()
+    if self.textfile:
+      self.write_textfile()
+
+  def render(self) -> str:
+    # Samples of a family published by both views have to stay together under one header
+    merged = {}
+    for view, families in sorted(dict(self.views).items()):
+      for name, kind, help_text, samples in families:
+        merged.setdefault(name, (kind, help_text, []))[2].extend(samples)
+
+    updated = [(None, {"view": view}, at) for view, at in sorted(dict(self.published_at).items())]
+    if updated:
+      merged[metric_name("snapshot_timestamp_seconds")] = ("gauge", "Unix time the view last published a classified snapshot", updated)
+
+    lines = []
+    for name, (kind, help_text, samples) in merged.items():
+      lines.extend(format_family(name, kind, help_text, samples))
+    for family in telemetry_families(telemetry.snapshot()):
+      lines.extend(format_family(*family))
+    return "\n".join(lines) + "\n"
+
+  def write_textfile(self):
+    path = self.textfile
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+      with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(self.render())
+      os.replace(tmp_path, path)
+    except OSError as e:
+      logger.error(f"Unable to write the metrics textfile {path}: {e}")
+
+  def serve(self, port: int):
+    try:
+      self.server = ThreadingHTTPServer(("127.0.0.1", port), MetricsRequestHandler)
+    except OSError as e:
+      logger.error(f"Unable to serve metrics on 127.0.0.1:{port}: {e}")
+      return
+    self.server.daemon_threads = True
+    self.server.exporter = self
+    threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Serving metrics on http://127.0.0.1:{self.server.server_port}/metrics")
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+  def log_message(self, format, *args):
+    logger.debug("metrics: " + format, *args)
+
+  def do_GET(self):
+    if self.path.split("?")[0] != "/metrics":
+      self.send_error(404)
+      return
+    body = self.server.exporter.render().encode()
+    self.send_response(200)
+    self.send_header("Content-Type", CONTENT_TYPE)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+exporter = MetricsExporter()
+
+def configure_metrics(rules: dict):
+  exporter.configure(port=rules.get("metrics_port", 0), textfile=rules.get("metrics_textfile"))
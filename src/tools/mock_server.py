@@ -0,0 +1,628 @@
+import json, random, re, threading, time, base64, uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from logger import logger
+from utils.variables import FileNames, VARS
+
+API_VERSION = "v58.0"
+QUERY_PATH = f"/services/data/{API_VERSION}/query"
+COMETD_PATH = f"/cometd/{API_VERSION.lstrip('v')}"
+TEAMS_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.Teams
+
+PRODUCTS = [
+  "B2B Integration", "Managed File Transfer", "API Management", "API Gateway",
+  "Cloud Access Manager", "Event Broker", "Data Exchange", "Identity Connector",
+]
+SEVERITIES = ["1 - Critical", "2 - High", "3 - Medium", "4 - Low"]
+STATUSES = ["New", "In Support", "Pending Customer", "In Engineering", "Closed"]
+REASONS = ["Configuration", "Defect", "How To", "Other", "Performance"]
+FALLBACK_OWNERS = ["Support_Americas", "Escalation_Group", "MCS", "Jane Doe", "John Smith", "Alex Kim"]
+
+@dataclass
+class MockSettings:
+  host: str = "127.0.0.1"
+  port: int = 8799
+  cases: int = 500
+  page_size: int = 2000
+  latency_ms: int = 0
+  jitter_ms: int = 0
+  tail_rate: float = 0.0
+  tail_ms: int = 0
+  error_rate: float = 0.0
+  auth_error_rate: float = 0.0
+  pad_bytes: int = 0
+  seed: int = 7
+  event_interval: float = 0.0
+  api_limit: int = 15000
+  api_used: int = 0
+  stream_timeout: int = 20
+  username: str = None
+  password: str = None
+
+class SoqlError(Exception):
+  def __init__(self, message, code="MALFORMED_QUERY"):
+    super().__init__(message)
+    self.code = code
+
+TOKEN_PATTERN = re.compile(r"""
+  \s*(?:
+    (?P<string>'(?:[^'\\]|\\.)*')
+  | (?P<number>-?\d+(?:\.\d+)?(?![\w-]))
+  | (?P<datetime>\d{4}-\d{2}-\d{2}(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?)
+  | (?P<op><=|>=|!=|<>|=|<|>|\(|\)|,)
+  | (?P<name>[A-Za-z_][\w.]*)
+  )""", re.VERBOSE)
+
+def tokenize(text: str) -> list:
+  tokens = []
+  pos = 0
+  text = text.strip()
+  while pos < len(text):
+    match = TOKEN_PATTERN.match(text, pos)
+    if not match or match.end() == pos:
+      raise SoqlError(f"unexpected token at position {pos}: {text[pos:pos + 20]!r}")
+    kind = match.lastgroup
+    value = match.group(kind)
+    if kind == "string":
+      # Escapes stay in place until the value is read, LIKE has to tell \% from %
+      value = value[1:-1]
+    tokens.append((kind, value))
+    pos = match.end()
+  return tokens
+
+def unescape(value: str) -> str:
+  return re.sub(r"\\(.)", r"\1", value)
+
+def like_pattern(value: str) -> str:
+  parts = []
+  for escaped, char in re.findall(r"(\\?)(.)", value, re.DOTALL):
+    if not escaped and char in "%_":
+      parts.append(".*" if char == "%" else ".")
+    else:
+      parts.append(re.escape(char))
+  return "".join(parts)
+
+class SoqlQuery():
+  """
+  Parser for the subset of SOQL this project issues: a field or aggregate projection,
+  a WHERE clause built from AND/OR/NOT, comparisons, IN/NOT IN and LIKE, plus ORDER BY and LIMIT.
+  """
+  def __init__(self, text: str):
+    self.tokens = tokenize(text)
+    self.pos = 0
+    self.columns = []
+    self.aggregates = []
+    self.where = None
+    self.order_by = []
+    self.limit = None
+    self.parse()
+
+  def peek(self, offset=0):
+    idx = self.pos + offset
+    return self.tokens[idx] if idx < len(self.tokens) else (None, None)
+
+  def keyword(self, *words) -> bool:
+    kind, value = self.peek()
+    return kind == "name" and value.upper() in words
+
+  def take(self, expected=None):
+    kind, value = self.peek()
+    if kind is None:
+      raise SoqlError("unexpected end of query")
+    if expected and str(value).upper() != expected:
+      raise SoqlError(f"expecting {expected} but found {value!r}")
+    self.pos += 1
+    return kind, value
+
+  def parse(self):
+    self.take("SELECT")
+    while True:
+      _, name = self.take()
+      if self.peek()[1] == "(":
+        self.take("(")
+        arg = None if self.peek()[1] == ")" else self.take()[1]
+        self.take(")")
+        self.aggregates.append((name.upper(), arg))
+      else:
+        self.columns.append(name)
+      if self.peek()[1] != ",": break
+      self.take(",")
+
+    self.take("FROM")
+    self.take()
+
+    if self.keyword("WHERE"):
+      self.take()
+      self.where = self.parse_or()
+
+    if self.keyword("ORDER"):
+      self.take()
+      self.take("BY")
+      while True:
+        _, field = self.take()
+        descending = False
+        if self.keyword("ASC", "DESC"):
+          descending = self.take()[1].upper() == "DESC"
+        if self.keyword("NULLS"):
+          self.take()
+          self.take()
+        self.order_by.append((field, descending))
+        if self.peek()[1] != ",": break
+        self.take(",")
+
+    if self.keyword("LIMIT"):
+      self.take()
+      self.limit = int(self.take()[1])
+
+    if self.pos != len(self.tokens):
+      raise SoqlError(f"unexpected token {self.peek()[1]!r}")
+
+  def parse_or(self):
+    terms = [self.parse_and()]
+    while self.keyword("OR"):
+      self.take()
+      terms.append(self.parse_and())
+    return terms[0] if len(terms) == 1 else (lambda row: any(term(row) for term in terms))
+
+  def parse_and(self):
+    factors = [self.parse_not()]
+    while self.keyword("AND"):
+      self.take()
+      factors.append(self.parse_not())
+    return factors[0] if len(factors) == 1 else (lambda row: all(factor(row) for factor in factors))
+
+  def parse_not(self):
+    if self.keyword("NOT"):
+      self.take()
+      inner = self.parse_not()
+      return lambda row: not inner(row)
+    if self.peek()[1] == "(":
+      self.take("(")
+      inner = self.parse_or()
+      self.take(")")
+      return inner
+    return self.parse_comparison()
+
+  def parse_value(self):
+    kind, value = self.take()
+    if kind == "string": return unescape(value).lower()
+    if kind == "number": return float(value)
+    if kind == "datetime": return value[:10]
+    upper = str(value).upper()
+    if upper == "TRUE": return True
+    if upper == "FALSE": return False
+    if upper == "NULL": return None
+    if upper == "TODAY": return datetime.now(timezone.utc).date().isoformat()
+    raise SoqlError(f"unexpected value {value!r}")
+
+  def parse_comparison(self):
+    kind, field = self.take()
+    if kind != "name":
+      raise SoqlError(f"expecting a field but found {field!r}")
+
+    negate = False
+    if self.keyword("NOT"):
+      self.take()
+      negate = True
+
+    if self.keyword("IN"):
+      self.take()
+      self.take("(")
+      values = {self.parse_value()}
+      while self.peek()[1] == ",":
+        self.take(",")
+        values.add(self.parse_value())
+      self.take(")")
+      return lambda row: (normalize(row.get(field)) in values) != negate
+
+    if self.keyword("LIKE"):
+      self.take()
+      kind, value = self.take()
+      if kind != "string":
+        raise SoqlError(f"LIKE expects a string pattern but found {value!r}")
+      compiled = re.compile(f"^{like_pattern(value.lower())}$", re.DOTALL)
+      return lambda row: bool(compiled.match(str(row.get(field) or "").lower())) != negate
+
+    _, op = self.take()
+    value = self.parse_value()
+    compare = {
+      "=": lambda a, b: a == b,
+      "!=": lambda a, b: a != b,
+      "<>": lambda a, b: a != b,
+      "<": lambda a, b: a is not None and a < b,
+      "<=": lambda a, b: a is not None and a <= b,
+      ">": lambda a, b: a is not None and a > b,
+      ">=": lambda a, b: a is not None and a >= b,
+    }.get(op)
+    if compare is None:
+      raise SoqlError(f"unknown operator {op!r}")
+    as_date = isinstance(value, str) and re.match(r"^\d{4}-\d{2}-\d{2}$", value)
+
+    def comparison(row):
+      current = row.get(field)
+      current = current[:10] if as_date and current else normalize(current)
+      return compare(current, value)
+    return comparison
+
+def normalize(value):
+  if isinstance(value, str): return value.lower()
+  if isinstance(value, int) and not isinstance(value, bool): return float(value)
+  return value
+
+def load_owner_names() -> list:
+  try:
+    with open(TEAMS_PATH, "r") as f:
+      teams = json.load(f).get("teams", {})
+    owners = [name for team in teams.values() for name in team.get("members", [])]
+    return owners or FALLBACK_OWNERS
+  except (OSError, ValueError):
+    return FALLBACK_OWNERS
+
+def build_dataset(settings: MockSettings, owners: list = None) -> list:
+  rng = random.Random(settings.seed)
+  owners = owners or load_owner_names()
+  now = datetime.now(timezone.utc)
+  rows = []
+
+  for idx in range(settings.cases):
+    created = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+    if rng.random() < 0.1:
+      created = now.replace(hour=0, minute=0, second=0) + timedelta(minutes=rng.randint(0, max(1, now.hour * 60 + now.minute)))
+    modified = created + (now - created) * rng.random()
+    status = rng.choice(STATUSES)
+    rows.append({
+      "Id": f"500{idx:015d}",
+      "CaseNumber": f"{1000000 + idx:08d}",
+      "CreatedDate": created.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+      "LastModifiedDate": modified.strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+      "Owner.Name": rng.choice(owners),
+      "Product__r.Name": rng.choice(PRODUCTS),
+      "Status": status,
+      "Status_Closed__c": status == "Closed",
+      "Severity__c": rng.choice(SEVERITIES),
+      "Case_Complexity__c": rng.choice([None, "Low", "Medium", "High"]),
+      "Case_Reason__c": rng.choice(REASONS),
+      "Milestone_Target_Date__c": (now + timedelta(days=rng.uniform(0, 5))).strftime("%Y-%m-%dT%H:%M:%S.000+0000"),
+      "_deadline": time.time() + rng.uniform(-0.2, 4) * 24 * 60 * 60,
+    })
+  return rows
+
+class MockSalesforce():
+  def __init__(self, settings: MockSettings = None, dataset: list = None):
+    self.settings = settings or MockSettings()
+    self.rows = dataset if dataset is not None else build_dataset(self.settings)
+    self.rng = random.Random(self.settings.seed)
+    self.lock = threading.Lock()
+    self.cursors = OrderedDict()
+    self.max_cursors = 256
+    self.requests_served = 0
+    self.server = None
+    self.events = []
+    self.event_cond = threading.Condition()
+    self.clients = {}
+    self.stopping = threading.Event()
+
+  def snapshot_row(self, row: dict) -> dict:
+    commitment = round((row["_deadline"] - time.time()) / (24 * 60 * 60), 4)
+    return dict(row, Time_Before_Next_Update_Commitment__c=None if row["Status_Closed__c"] else commitment)
+
+  def project(self, row: dict, columns: list) -> dict:
+    record = {"attributes": {"type": "Case", "url": f"/services/data/{API_VERSION}/sobjects/Case/{row['Id']}"}}
+    for column in columns:
+      parts = column.split(".")
+      target = record
+      for part in parts[:-1]:
+        target = target.setdefault(part, {"attributes": {"type": part.replace("__r", "__c")}})
+      target[parts[-1]] = row.get(column)
+    if self.settings.pad_bytes:
+      record["Padding__c"] = "x" * self.settings.pad_bytes
+    return record
+
+  def execute(self, soql: str) -> dict:
+    query = SoqlQuery(soql)
+    rows = [self.snapshot_row(row) for row in self.rows]
+
+    for column in query.columns + [arg for _, arg in query.aggregates if arg]:
+      if rows and column not in rows[0]:
+        raise SoqlError(f"No such column '{column}' on entity 'Case'", code="INVALID_FIELD")
+
+    if query.where:
+      rows = [row for row in rows if query.where(row)]
+
+    if query.aggregates:
+      return self.aggregate(query, rows)
+
+    for field, descending in reversed(query.order_by):
+      rows.sort(key=lambda row: (row.get(field) is None, 0 if row.get(field) is None else normalize(row.get(field))), reverse=descending)
+    if query.limit is not None:
+      rows = rows[:query.limit]
+
+    records = [self.project(row, query.columns) for row in rows]
+    return self.page(records, offset=0)
+
+  def aggregate(self, query: SoqlQuery, rows: list) -> dict:
+    if query.aggregates == [("COUNT", None)]:
+      return {"totalSize": len(rows), "done": True, "records": []}
+
+    result = {"attributes": {"type": "AggregateResult"}}
+    for idx, (name, arg) in enumerate(query.aggregates):
+      values = [row.get(arg) for row in rows if row.get(arg) is not None] if arg else rows
+      if name == "COUNT": value = len(values)
+      elif name == "MAX": value = max(values) if values else None
+      elif name == "MIN": value = min(values) if values else None
+      else: raise SoqlError(f"Unsupported aggregate {name}")
+      result[f"expr{idx}"] = value
+    return {"totalSize": 1, "done": True, "records": [result]}
+
+  def page(self, records: list, offset: int, cursor: str = None) -> dict:
+    end = offset + self.settings.page_size
+    response = {"totalSize": len(records), "done": end >= len(records), "records": records[offset:end]}
+
+    if not response["done"]:
+      cursor = cursor or uuid.uuid4().hex[:15]
+      with self.lock:
+        self.cursors[cursor] = records
+        self.cursors.move_to_end(cursor)
+        while len(self.cursors) > self.max_cursors:
+          self.cursors.popitem(last=False)
+      response["nextRecordsUrl"] = f"{QUERY_PATH}/{cursor}-{end}"
+    return response
+
+  def next_page(self, locator: str) -> dict:
+    cursor, _, offset = locator.rpartition("-")
+    with self.lock:
+      records = self.cursors.get(cursor)
+    if records is None or not offset.isdigit():
+      raise SoqlError("invalid query locator", code="INVALID_QUERY_LOCATOR")
+    return self.page(records, int(offset), cursor=cursor)
+
+  def route(self, path: str):
+    url = urlparse(path)
+    try:
+      if url.path.rstrip("/").endswith("/query"):
+        soql = parse_qs(url.query).get("q", [""])[0]
+        return 200, self.execute(soql)
+      if "/query/" in url.path:
+        return 200, self.next_page(url.path.rsplit("/", 1)[1])
+    except SoqlError as e:
+      return 400, [{"message": str(e), "errorCode": e.code}]
+    return 404, [{"message": "The requested resource does not exist", "errorCode": "NOT_FOUND"}]
+
+  def batch(self, body: dict):
+    requests = body.get("batchRequests") or []
+    if not requests or len(requests) > 25:
+      return 400, [{"message": "A batch must contain between 1 and 25 requests", "errorCode": "INVALID_BATCH_REQUEST"}]
+
+    results = []
+    for request in requests:
+      if str(request.get("method", "")).upper() != "GET":
+        results.append({"statusCode": 405, "result": [{"message": "Only GET is supported", "errorCode": "METHOD_NOT_ALLOWED"}]})
+        continue
+      status, result = self.route("/services/data/" + str(request.get("url", "")).lstrip("/"))
+      results.append({"statusCode": status, "result": result})
+
+    return 200, {"hasErrors": any(result["statusCode"] >= 400 for result in results), "results": results}
+
+  def publish(self, row: dict, changes: dict, change_type: str = "UPDATE"):
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+    changes = dict(changes, LastModifiedDate=stamp)
+    payload = {}
+    for key, value in changes.items():
+      if "." in key:
+        # Relationship columns change through their lookup field, e.g. Owner.Name -> OwnerId
+        relation = key.split(".")[0]
+        key = relation[:-1] + "c" if relation.endswith("__r") else relation + "Id"
+        value = f"005{abs(hash(value)) % 10 ** 15:015d}"
+      payload[key] = value
+
+    payload["ChangeEventHeader"] = {
+      "entityName": "Case",
+      "changeType": change_type,
+      "recordIds": [row["Id"]],
+      "changedFields": [key for key in payload if change_type == "UPDATE"],
+      "commitTimestamp": int(time.time() * 1000),
+      "transactionKey": uuid.uuid4().hex,
+    }
+    with self.event_cond:
+      row.update(changes)
+      if change_type == "CREATE":
+        self.rows.append(row)
+      elif change_type == "DELETE":
+        self.rows.remove(row)
+      self.events.append(("/data/CaseChangeEvent", payload))
+      self.event_cond.notify_all()
+
+  def churn(self):
+    open_rows = [row for row in self.rows if not row["Status_Closed__c"]]
+    if not open_rows:
+      return
+    row = self.rng.choice(open_rows)
+    roll = self.rng.random()
+    if roll < 0.5:
+      self.publish(row, {"Severity__c": self.rng.choice(SEVERITIES)})
+    elif roll < 0.7:
+      status = self.rng.choice(STATUSES)
+      self.publish(row, {"Status": status, "Status_Closed__c": status == "Closed"})
+    elif roll < 0.85:
+      self.publish(row, {"Owner.Name": self.rng.choice(load_owner_names())})
+    else:
+      template = build_dataset(MockSettings(cases=1, seed=self.rng.randint(0, 10 ** 6)))[0]
+      idx = len(self.rows)
+      self.publish(dict(template, Id=f"500{idx:015d}", CaseNumber=f"{1000000 + idx:08d}"), {}, change_type="CREATE")
+
+  def churn_loop(self):
+    while not self.stopping.wait(self.settings.event_interval):
+      self.churn()
+
+  def bayeux(self, messages: list):
+    replies = []
+    for message in messages if isinstance(messages, list) else [messages]:
+      channel = message.get("channel")
+      if channel == "/meta/handshake":
+        client_id = uuid.uuid4().hex
+        with self.event_cond:
+          self.clients[client_id] = {"subscriptions": set(), "position": len(self.events)}
+        replies.append({
+          "channel": channel, "clientId": client_id, "successful": True, "version": "1.0",
+          "supportedConnectionTypes": ["long-polling"],
+          "advice": {"timeout": self.settings.stream_timeout * 1000, "interval": 0, "reconnect": "retry"},
+        })
+        continue
+
+      client = self.clients.get(message.get("clientId"))
+      if client is None:
+        replies.append({"channel": channel, "successful": False, "error": "403::Unknown client", "advice": {"reconnect": "handshake"}})
+        continue
+
+      if channel == "/meta/subscribe":
+        subscription = message.get("subscription")
+        replay_id = ((message.get("ext") or {}).get("replay") or {}).get(subscription, -1)
+        with self.event_cond:
+          client["subscriptions"].add(subscription)
+          if replay_id == -2:
+            client["position"] = 0
+          elif replay_id >= 0:
+            client["position"] = min(replay_id, len(self.events))
+        replies.append({"channel": channel, "clientId": message["clientId"], "subscription": subscription, "successful": True})
+      elif channel == "/meta/connect":
+        with self.event_cond:
+          self.event_cond.wait_for(lambda: len(self.events) > client["position"] or self.stopping.is_set(), timeout=self.settings.stream_timeout)
+          start, client["position"] = client["position"], len(self.events)
+          delivered = [
+            {"channel": event_channel, "data": {"schema": "mock", "payload": payload, "event": {"replayId": replay_id}}}
+            for replay_id, (event_channel, payload) in enumerate(self.events[start:], start=start + 1)
+            if event_channel in client["subscriptions"]
+          ]
+        replies.extend(delivered)
+        replies.append({"channel": channel, "clientId": message["clientId"], "successful": True, "advice": {"reconnect": "retry", "interval": 0}})
+      elif channel == "/meta/disconnect":
+        with self.event_cond:
+          self.clients.pop(message["clientId"], None)
+        replies.append({"channel": channel, "clientId": message["clientId"], "successful": True})
+      else:
+        replies.append({"channel": channel, "successful": False, "error": f"400::Unsupported channel {channel}"})
+
+    return 200, replies
+
+  def drop_clients(self):
+    with self.event_cond:
+      self.clients.clear()
+      self.event_cond.notify_all()
+
+  def inject_faults(self, authorization: str):
+    settings = self.settings
+    delay = settings.latency_ms + self.rng.uniform(0, settings.jitter_ms)
+    if settings.tail_rate and self.rng.random() < settings.tail_rate:
+      delay += settings.tail_ms
+    if delay:
+      time.sleep(delay / 1000)
+
+    if settings.password is not None:
+      expected = base64.b64encode(f"{settings.username or ''}:{settings.password}".encode()).decode()
+      if authorization != f"Basic {expected}":
+        return 401, [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+    if settings.auth_error_rate and self.rng.random() < settings.auth_error_rate:
+      return 401, [{"message": "Session expired or invalid", "errorCode": "INVALID_SESSION_ID"}]
+    if settings.error_rate and self.rng.random() < settings.error_rate:
+      return 500, [{"message": "An unexpected error occurred", "errorCode": "UNKNOWN_EXCEPTION"}]
+    return None
+
+  def serve(self):
+    self.server = ThreadingHTTPServer((self.settings.host, self.settings.port), MockRequestHandler)
+    self.server.daemon_threads = True
+    self.server.request_queue_size = 1024
+    self.server.app = self
+    logger.info(f"Mock Salesforce serving {len(self.rows)} cases on http://{self.settings.host}:{self.server.server_port}{QUERY_PATH}")
+    if self.settings.event_interval > 0:
+      threading.Thread(target=self.churn_loop, daemon=True).start()
+    return self.server
+
+  def start(self):
+    server = self.serve()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://{self.settings.host}:{server.server_port}{QUERY_PATH}"
+
+  def stop(self):
+    self.stopping.set()
+    with self.event_cond:
+      self.event_cond.notify_all()
+    if self.server:
+      self.server.shutdown()
+      self.server.server_close()
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+
+  def log_message(self, format, *args):
+    logger.debug("mock: " + format, *args)
+
+  def send_json(self, status: int, body):
+    payload = json.dumps(body).encode()
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json;charset=UTF-8")
+    self.send_header("Content-Length", str(len(payload)))
+    app: MockSalesforce = self.server.app
+    self.send_header("Sforce-Limit-Info", f"api-usage={app.settings.api_used + app.requests_served}/{app.settings.api_limit}")
+    self.end_headers()
+    self.wfile.write(payload)
+
+  def do_GET(self):
+    app: MockSalesforce = self.server.app
+    with app.lock:
+      app.requests_served += 1
+
+    fault = app.inject_faults(self.headers.get("Authorization", ""))
+    if fault:
+      return self.send_json(*fault)
+
+    self.send_json(*app.route(self.path))
+
+  def do_POST(self):
+    app: MockSalesforce = self.server.app
+    with app.lock:
+      app.requests_served += 1
+
+    fault = app.inject_faults(self.headers.get("Authorization", ""))
+    if fault:
+      return self.send_json(*fault)
+
+    length = int(self.headers.get("Content-Length") or 0)
+    try:
+      body = json.loads(self.rfile.read(length) or b"{}")
+    except ValueError:
+      return self.send_json(400, [{"message": "Invalid JSON body", "errorCode": "JSON_PARSER_ERROR"}])
+
+    path = urlparse(self.path).path.rstrip("/")
+    if path.endswith("/composite/batch"):
+      return self.send_json(*app.batch(body))
+    if path.startswith("/cometd/"):
+      return self.send_json(*app.bayeux(body))
+
+    self.send_json(404, [{"message": "The requested resource does not exist", "errorCode": "NOT_FOUND"}])
+
+def run_mock_server(settings: MockSettings):
+  app = MockSalesforce(settings)
+  server = app.serve()
+  print(f"Mock Salesforce listening on http://{settings.host}:{server.server_port}{QUERY_PATH}")
+  print("Point 'api_url' in config.json at the address above. Press Ctrl+C to stop.")
+  if settings.event_interval > 0:
+    print(f"Publishing a case change event every {settings.event_interval}s on {COMETD_PATH}")
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    app.stopping.set()
+    server.server_close()
+
+if __name__ == "__main__":
+  import argparse
+
+  parser = argparse.ArgumentParser(description="Local stand-in for the Salesforce /query endpoint")
+  for name, default in MockSettings().__dict__.items():
+    parser.add_argument(f"--{name.replace('_', '-')}", type=type(default) if default is not None else str, default=default)
+  run_mock_server(MockSettings(**vars(parser.parse_args())))
@@ -7,9 +7,13 @@ from config.filereg import FileReg
 from api.api_handler import APIHandler
 from utils.helper import define_query_columns
 from main import signal_handler
-from tools.encryption import generate_encrypted_passwd
+from tools.encryption import generate_encrypted_passwd, decrypt_password
+from tools.export import export_pages
+from tools.benchmark import benchmark
+from tools.mock_server import MockSalesforce, MockSettings
+from utils.variables import VARS
 
-def simulate(logger):
+def simulate(logger, export_format: str = "print", output_path: str = None):
   print("\n******************** Entering Simulation Env ********************")
   print("*****************************************************************\n")
   logger.info('Entering simulation environment!')
@@ -39,27 +43,66 @@ def simulate(logger):
 
   generate_encrypted_passwd()
 
-  response = APIHandler(
+  api_handler = APIHandler(
     api_url=api_url,
     username=username,
     query=query,
     test=False,
     config_cls=config_class,
     filereg_cls=filereg_class
-  ).run()
-
-  for idx, record in enumerate(response, start=1):
-    print(f"----- Record {idx} -----")
-    for column in columns:
-      if '.' in column:
-        parts = column.split('.')
-        item = record.get(parts[0], {}).get(parts[1], 'None')
-      else:
-        item = record.get(column, 'None')
-      print(f"{column}: {item}")
-
-def query_builder():
-  query = input('Enter query: ')
+  )
+
+  # An identical query still within its cache TTL is exported without calling the API, otherwise
+  # pages are projected and written as they arrive so large results never sit in memory whole
+  cached = api_handler.cached_result()
+  pages = [(cached.get("records", []), 0)] if cached is not None else api_handler.stream_pages()
+  count = export_pages(pages, columns, fmt=export_format, path=output_path)
+
+  if output_path:
+    print(f"Wrote {count} records to {output_path} as {export_format}")
+  logger.info(f"Simulation exported {count} records as {export_format}")
+
+def benchmark_queries(logger, runs: int = 10, target: str = None):
+  print("\n******************** Entering Benchmark Env *********************")
+  print("*****************************************************************\n")
+  logger.info('Entering benchmark environment!')
+
+  filereg_class = FileReg()
+  filereg_class.init()
+  config = Config(filereg_class).load_file()
+  named_queries = config.get("queries", {})
+
+  print(f"Enter each variant as SOQL or as a configured query name ({', '.join(named_queries) or 'none configured'}), leave empty to start")
+  variants = []
+  while True:
+    query = query_builder(prompt=f"Variant {len(variants) + 1}: ", named_queries=named_queries)
+    if not query:
+      break
+    variants.append(query)
+
+  if not variants:
+    print("No queries were entered, nothing to benchmark")
+    return
+
+  mock = None
+  if target == "mock":
+    # A local stand-in server with the mock_server settings from config.json
+    mock = MockSalesforce(MockSettings(**dict(config.get(VARS.MockServer) or {}, port=0)))
+    api_url, password = mock.start(), "mock"
+  else:
+    generate_encrypted_passwd()
+    api_url, password = target or config.get("api_url", ""), decrypt_password()
+
+  print(f"Running {runs} cold and {runs} warm run(s) of {len(variants)} variant(s) against {api_url}")
+  try:
+    benchmark(api_url, config.get("username", ""), password, variants, runs, live=target is None)
+  finally:
+    if mock:
+      mock.stop()
+
+def query_builder(prompt: str = 'Enter query: ', named_queries: dict = None):
+  query = input(prompt).strip()
+  query = (named_queries or {}).get(query, query)
   placeholders = re.findall(r"\{(.*?)\}", query)
 
   values = {}
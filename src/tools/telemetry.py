@@ -0,0 +1,66 @@
+import json, os, threading
+from collections import defaultdict, deque
+from pathlib import Path
+from logger import logger
+from utils.variables import FileNames, VARS
+
+TELEMETRY_PATH = Path(__file__).resolve().parent.parent.parent / VARS.Config / FileNames.Telemetry
+
+def percentile(values: list, pct: float):
+  if not values:
+    return None
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class Telemetry():
+  def __init__(self, path: Path = TELEMETRY_PATH, window: int = 512):
+    self.path = Path(path)
+    self.lock = threading.Lock()
+    self.flush_lock = threading.Lock()
+    self.counters = defaultdict(float)
+    self.gauges = {}
+    self.timings = defaultdict(lambda: deque(maxlen=window))
+    self.totals = defaultdict(lambda: [0, 0.0])
+
+  def incr(self, name: str, value: float = 1):
+    with self.lock:
+      self.counters[name] += value
+
+  def gauge(self, name: str, value):
+    with self.lock:
+      self.gauges[name] = value
+
+  def observe(self, name: str, seconds: float):
+    with self.lock:
+      self.timings[name].append(seconds)
+      total = self.totals[name]
+      total[0] += 1
+      total[1] += seconds
+
+  def snapshot(self) -> dict:
+    with self.lock:
+      timings = {
+        name: {
+          "count": len(values),
+          "last": values[-1] if values else None,
+          "p50": percentile(list(values), 50),
+          "p95": percentile(list(values), 95),
+          "total": self.totals[name][0],
+          "sum": self.totals[name][1],
+        }
+        for name, values in self.timings.items()
+      }
+      return {"counters": dict(self.counters), "gauges": dict(self.gauges), "timings": timings}
+
+  def flush(self):
+    # The pid keeps other processes off this temp file, the lock keeps this process's threads apart
+    tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+    with self.flush_lock:
+      try:
+        with open(tmp_path, "w") as f:
+          json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, self.path)
+      except OSError as e:
+        logger.debug("Unable to write telemetry to %s: %s", self.path, e)
+
+telemetry = Telemetry()
@@ -26,6 +26,9 @@ class Tools():
       VARS.Setup:    self.SETUP_TOOL,
       VARS.Role:     self.ROLE_TOOL,
       VARS.Team:     self.TEAM_TOOL,
+      VARS.History:  self.HISTORY_TOOL,
+      VARS.Mock:     self.MOCK_TOOL,
+      VARS.Simulate: self.SIMULATE_TOOL,
     }
 
     if type == None:
@@ -89,16 +92,21 @@ class Tools():
     logger.info(msg)
     handle_shutdown(reason=msg, module=tool_name)
   
-  def SIMULATE_TOOL(self, extras):
-    from tools.simulation import simulate
+  def SIMULATE_TOOL(self):
+    from tools.simulation import simulate, benchmark_queries
 
     tool_name = self.SIMULATE_TOOL.__name__
     logger.info(f"{tool_name} {self.msg}")
-    simulate(logger=extras)
+
+    options: dict = self.extras
+    if options.get("format") == "bench":
+      benchmark_queries(logger=logger, runs=options.get("runs"), target=options.get("target"))
+    else:
+      simulate(logger=logger, export_format=options.get("format"), output_path=options.get("path"))
 
     msg = f"{tool_name} completed the simulation of the query"
     logger.info(msg)
-    handle_shutdown(reason=msg, module=tool_name)
+    handle_shutdown(module=tool_name)
   
   def ROLE_TOOL(self):
     tool_name = self.ROLE_TOOL.__name__
@@ -128,4 +136,40 @@ class Tools():
 
     msg = f"{tool_name} completed the {extra.upper()} operation"
     logger.info(msg)
+    handle_shutdown(reason=msg, module=tool_name)
+
+  def HISTORY_TOOL(self):
+    from tools.history import HISTORY_PATH, VIEWS, QueueHistory, print_report
+
+    tool_name = self.HISTORY_TOOL.__name__
+    logger.info(f"{tool_name} {self.msg}")
+
+    hours: int = self.extras
+    recorded = [view for view in VIEWS if (HISTORY_PATH / view).is_dir()]
+    if not recorded:
+      print("No queue history has been recorded yet")
+    for view in recorded:
+      print_report(QueueHistory(view).init(), hours)
+
+    msg = f"{tool_name} completed the report for the last {hours} hour(s)"
+    logger.info(msg)
+    handle_shutdown(reason=msg, module=tool_name)
+
+  def MOCK_TOOL(self):
+    from tools.mock_server import MockSettings, run_mock_server
+
+    tool_name = self.MOCK_TOOL.__name__
+    logger.info(f"{tool_name} {self.msg}")
+
+    overrides: dict = {}
+    try:
+      overrides = self.config.load_file().get(VARS.MockServer) or {}
+    except FileNotFoundError:
+      logger.debug("No %s found, the mock server will use its defaults", FileNames.Config)
+
+    settings = MockSettings(**dict(overrides, port=self.extras))
+    run_mock_server(settings)
+
+    msg = f"{tool_name} stopped the mock server on port {settings.port}"
+    logger.info(msg)
     handle_shutdown(reason=msg, module=tool_name)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import time
+from datetime import datetime
+
+class Clock():
+  def time(self) -> float:
+    return time.time()
+
+  def now(self) -> datetime:
+    return datetime.fromtimestamp(self.time())
+
+  def today(self) -> datetime:
+    return self.now()
+
+  def sleep(self, seconds: float):
+    time.sleep(seconds)
+
+class VirtualClock(Clock):
+  """
+  Clock that starts at an arbitrary epoch and runs `speed` times faster than real time.
+  A speed of 0 never waits: sleeping simply advances the virtual time.
+  """
+  def __init__(self, start: float, speed: float = 0):
+    self.start = start
+    self.speed = speed
+    self.offset = 0.0
+    self.real_start = time.monotonic()
+
+  def time(self) -> float:
+    elapsed = (time.monotonic() - self.real_start) * self.speed if self.speed else 0
+    return self.start + self.offset + elapsed
+
+  def sleep(self, seconds: float):
+    if self.speed:
+      time.sleep(seconds / self.speed)
+    else:
+      self.offset += seconds
+
+_clock = Clock()
+
+def get_clock() -> Clock:
+  return _clock
+
+def set_clock(clock: Clock) -> Clock:
+  global _clock
+  _clock = clock
+  return clock
@@ -0,0 +1,101 @@
+from logger import logger
+from utils.clock import get_clock
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+MISSING_COMMITMENT = float("inf")
+
+class CaseColumns():
+  """
+  Columnar view over a case snapshot. Owner names are dictionary encoded so
+  membership tests run once per distinct name instead of once per case.
+  """
+  def __init__(self, cases: list, use_numpy: bool = True, now: float = None):
+    now = now or get_clock().time()
+    self.cases = cases
+    self.vectorized = bool(use_numpy and np is not None)
+
+    self.owner_vocab = {}
+
+    owner_codes = []
+    commitments = []
+
+    for case in cases:
+      commitment = case.commitment_at(now)
+
+      owner_codes.append(self.owner_vocab.setdefault(case.owner, len(self.owner_vocab)))
+      commitments.append(MISSING_COMMITMENT if commitment is None else float(commitment))
+
+    self.owner_names = list(self.owner_vocab)
+
+    if self.vectorized:
+      self.owner_codes = np.asarray(owner_codes, dtype=np.int32)
+      self.commitments = np.asarray(commitments, dtype=np.float64)
+    else:
+      self.owner_codes = owner_codes
+      self.commitments = commitments
+
+  def __len__(self):
+    return len(self.cases)
+
+  def owner_mask(self, names: set):
+    lookup = [name in names for name in self.owner_names]
+    if self.vectorized:
+      if not lookup:
+        return np.zeros(len(self), dtype=bool)
+      return np.asarray(lookup, dtype=bool)[self.owner_codes]
+    return [lookup[code] for code in self.owner_codes]
+
+  def commitment_buckets(self, group_members: set, team_members: set, queue_threshold: float, team_threshold: float = 1):
+    """
+    Returns (queue_idx, team_idx): indices of group-queue cases due within queue_threshold
+    and team cases due within team_threshold (both in days), each sorted by urgency.
+    A case that qualifies for the queue bucket is never counted against the team.
+    """
+    in_group = self.owner_mask(group_members)
+    in_team = self.owner_mask(team_members)
+
+    if self.vectorized:
+      has_commitment = self.commitments != MISSING_COMMITMENT
+      queue_mask = in_group & has_commitment & (self.commitments <= queue_threshold)
+      team_mask = ~queue_mask & in_team & has_commitment & (self.commitments <= team_threshold)
+      return self.by_urgency(np.flatnonzero(queue_mask)), self.by_urgency(np.flatnonzero(team_mask))
+
+    queue_idx = []
+    team_idx = []
+    for idx, commitment in enumerate(self.commitments):
+      if commitment == MISSING_COMMITMENT:
+        continue
+      if in_group[idx] and commitment <= queue_threshold:
+        queue_idx.append(idx)
+      elif in_team[idx] and commitment <= team_threshold:
+        team_idx.append(idx)
+    return self.by_urgency(queue_idx), self.by_urgency(team_idx)
+
+  def by_urgency(self, indices):
+    if self.vectorized:
+      indices = np.asarray(indices, dtype=np.intp)
+      return indices[np.argsort(self.commitments[indices], kind="stable")]
+    return sorted(indices, key=lambda idx: self.commitments[idx])
+
+  def owner_counts(self, indices) -> dict:
+    if self.vectorized:
+      counts = np.bincount(self.owner_codes[np.asarray(indices, dtype=np.intp)], minlength=len(self.owner_names))
+      return {self.owner_names[code]: int(count) for code, count in enumerate(counts) if count}
+
+    counts = {}
+    for idx in indices:
+      name = self.owner_names[self.owner_codes[idx]]
+      counts[name] = counts.get(name, 0) + 1
+    return counts
+
+  def take(self, indices) -> list:
+    return [self.cases[int(idx)] for idx in indices]
+
+def build_columns(cases: list, now: float = None) -> CaseColumns:
+  columns = CaseColumns(cases, now=now)
+  logger.debug("Columnar snapshot built for %d cases (vectorized=%s)", len(columns), columns.vectorized)
+  return columns
@@ -3,6 +3,7 @@ import sys
 from logger import logger
 import re
 from datetime import datetime, date
+from utils.clock import get_clock
 
 def define_query_columns(query):
 	upper_query = query.upper()
@@ -41,15 +42,16 @@ def convert_days_to_dhm(day_value):
 
 	return " ".join(parts)
 
-def concat_group_list(teams_list: dict) -> str:
-	group_list_raw = teams_list.get("teams", {}).get("group", {}).get("members", "")
-	quoted_group = [f"'{group.strip()}'" for group in group_list_raw]
-	logger.debug(f"Group list has been formated for the downstream SQL")
-	return ", ".join(quoted_group)
+def group_members(teams_list: dict) -> list:
+	group_list_raw = teams_list.get("teams", {}).get("group", {}).get("members", [])
+	return [str(group).strip() for group in group_list_raw]
 
-def concat_team_list(teams_list):
-	from config.team import Team
-	return Team.validate_teams_list(teams_list, exit_if_misconfigured=True)
+def team_members(teams_list: dict) -> list:
+	members = []
+	for team_name, values in teams_list.get("teams", {}).items():
+		if team_name != "group" and values.get("viewable"):
+			members.extend(str(name).strip() for name in values.get("members", []))
+	return members
 
 def handle_shutdown(exit_code=0, reason='', module="Main"):
 	logger.info(f"{module} module shutdown code: {exit_code} {reason}")
@@ -81,7 +83,7 @@ def calculate_days_delta(date):
 	month = months.index(month_str.capitalize()) + 1
 	
 	try:
-		today = datetime.today().date()
+		today = get_clock().today().date()
 		input_date = datetime(today.year, month, day).date()
 	except ValueError:
 		return None
@@ -124,10 +126,22 @@ Configuration:
                       validate pending commitments
 
 Runtime Options:
-  -q                    Simulate SQL queries against Salesforce
+  -q <FORMAT> <PATH>    Simulate SQL queries against Salesforce, streaming the result as print (default), ndjson, csv or parquet
+                        Ex: -q csv cases.csv
+  -q bench <RUNS> <mock|URL>
+                        Benchmark query variants RUNS times (default 10) on cold and warm connections, against the
+                        configured api_url, an in-process mock server or another URL
   -s                    Run interactive configuration setup
-  -test                 Run in test mode. Skips API calls if ~/config/dataBuffer.json does not exist
+  -test                 Run in test mode. Serves cached query results, even expired ones, and only calls the API when none exist
   -clean                Remove system-generated config files without deleting user data.
+  -history <HOURS>      Report queue depth, commitment risk and case age trends (default 24 hours)
+  -mock <PORT>          Serve a local mock of the SalesForce /query endpoint (default port 8799)
+  -replay <ARCHIVE> <SPEED>
+                        Replay recorded snapshots through the dashboard at SPEED x (0 = as fast as possible)
+  -daemon <PORT>        Run one headless fetch loop and serve dashboards as JSON (default port 8800)
+
+Keyboard Controls (engineer and manager views):
+  r refresh   e exclude case   p exclude product   t toggle team   s switch role   q quit
 
 Debug Options:
   -d                    Enable debug logging
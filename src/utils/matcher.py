@@ -0,0 +1,90 @@
+from collections import deque
+from logger import logger
+
+class OwnerMatcher():
+  """
+  Matches case owners against every engineer at once. Exact names resolve through a
+  hash, anything else through an Aho-Corasick automaton over the lowercased names, so
+  a partial match ("jane" in "Jane Doe (Backup)") costs one pass over the owner string
+  however many engineers are configured. Results are memoized per distinct owner.
+  """
+  def __init__(self, engineers):
+    self.engineers = sorted({str(name).strip() for name in engineers if str(name).strip()})
+    self.exact = {}
+    self.memo = {}
+
+    for name in self.engineers:
+      self.exact.setdefault(name.lower(), []).append(name)
+
+    self.goto = [{}]
+    self.fail = [0]
+    self.out = [()]
+    for key, names in self.exact.items():
+      self.add(key, tuple(names))
+    self.link()
+
+    # Owners that are themselves engineers resolve with one lookup, shorter names they contain included
+    self.exact = {key: self.scan(key) for key in self.exact}
+
+  def add(self, key: str, names: tuple):
+    state = 0
+    for char in key:
+      nxt = self.goto[state].get(char)
+      if nxt is None:
+        nxt = len(self.goto)
+        self.goto[state][char] = nxt
+        self.goto.append({})
+        self.fail.append(0)
+        self.out.append(())
+      state = nxt
+    self.out[state] = self.out[state] + names
+
+  def link(self):
+    pending = deque(self.goto[0].values())
+    while pending:
+      state = pending.popleft()
+      for char, nxt in self.goto[state].items():
+        pending.append(nxt)
+        fallback = self.fail[state]
+        while fallback and char not in self.goto[fallback]:
+          fallback = self.fail[fallback]
+        target = self.goto[fallback].get(char, 0)
+        self.fail[nxt] = target if target != nxt else 0
+        self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+  def scan(self, text: str) -> tuple:
+    found = []
+    state = 0
+    for char in text:
+      while state and char not in self.goto[state]:
+        state = self.fail[state]
+      state = self.goto[state].get(char, 0)
+      if self.out[state]:
+        found.extend(self.out[state])
+    return tuple(sorted(set(found)))
+
+  def match(self, owner: str) -> tuple:
+    """Returns every engineer whose name appears in owner, case-insensitively"""
+    if not owner:
+      return ()
+    matched = self.memo.get(owner)
+    if matched is None:
+      key = owner.lower()
+      matched = self.exact.get(key)
+      if matched is None:
+        matched = self.scan(key)
+      self.memo[owner] = matched
+    return matched
+
+  def partition(self, cases: list) -> dict:
+    """Assigns each case to every matching engineer in a single pass, engineers without cases get an empty list"""
+    partitions = {name: [] for name in self.engineers}
+    for case in cases:
+      for name in self.match(case.owner):
+        partitions[name].append(case)
+    return partitions
+
+def build_matcher(engineers) -> OwnerMatcher:
+  matcher = OwnerMatcher(engineers)
+  logger.debug("Owner matcher built for %d engineers with %d automaton states", len(matcher.engineers), len(matcher.goto))
+  return matcher
@@ -0,0 +1,97 @@
+import sys, time
+from datetime import datetime, timezone
+
+COMMITMENT_FIELD = "Time_Before_Next_Update_Commitment__c"
+
+# Columns that get their own slot, everything else a query selects lands in `extra`
+NORMALIZED = {
+  "attributes", "Id", "CaseNumber", "Owner", "Product__r", "Status", "Severity__c",
+  "CreatedDate", "LastModifiedDate", COMMITMENT_FIELD, "Case_Complexity__c", "Case_Reason__c",
+}
+
+def intern(value):
+  return sys.intern(value) if isinstance(value, str) else value
+
+def relation_name(record: dict, relation: str) -> str:
+  ref = record.get(relation)
+  return ref.get("Name") or "" if isinstance(ref, dict) else ""
+
+def parse_severity(label):
+  head = str(label or "").split(" ")[0]
+  return int(head) if head.isdigit() else None
+
+def parse_timestamp(value: str):
+  # Accepts both "2024-05-01T13:45:00.000+0000" and a bare "2024-05-01"
+  try:
+    return datetime.fromisoformat(value[:19]).replace(tzinfo=timezone.utc)
+  except (TypeError, ValueError):
+    return None
+
+class CaseRecord():
+  """
+  One case normalized once at ingest. Owner, product and status strings are interned,
+  the nested SalesForce sub-objects are dropped, and the commitment is also stored as
+  an absolute deadline so it can be recomputed at any later time without re-fetching.
+  """
+  __slots__ = (
+    "case_id", "case_number", "owner", "product", "status", "severity", "severity_label",
+    "created_raw", "created", "last_modified", "commitment", "deadline",
+    "complexity", "reason", "extra",
+  )
+
+  def __init__(self, record: dict, now: float = None):
+    now = now or time.time()
+    url = (record.get("attributes") or {}).get("url") or ""
+
+    self.case_id = record.get("Id") or url.rsplit("/", 1)[-1] or None
+    self.case_number = (record.get("CaseNumber") or "").strip()
+    self.owner = intern(relation_name(record, "Owner"))
+    self.product = intern(relation_name(record, "Product__r"))
+    self.status = intern(record.get("Status"))
+    self.severity_label = intern(record.get("Severity__c"))
+    self.severity = parse_severity(self.severity_label)
+    self.created_raw = record.get("CreatedDate") or ""
+    self.created = parse_timestamp(self.created_raw)
+    self.last_modified = record.get("LastModifiedDate")
+    self.commitment = record.get(COMMITMENT_FIELD)
+    self.deadline = None if self.commitment is None else now + self.commitment * 24 * 60 * 60
+    self.complexity = intern(record.get("Case_Complexity__c"))
+    self.reason = intern(record.get("Case_Reason__c"))
+    self.extra = {key: value for key, value in record.items() if key not in NORMALIZED} or None
+
+  @property
+  def valid(self) -> bool:
+    return bool(self.owner and self.product and self.created and self.case_number)
+
+  @property
+  def priority(self) -> str:
+    return str(self.severity) if self.severity is not None else str(self.severity_label or "").split(" ")[0]
+
+  def commitment_at(self, now: float):
+    return None if self.deadline is None else (self.deadline - now) / (24 * 60 * 60)
+
+  def to_dict(self) -> dict:
+    """Rebuilds the SalesForce record shape for JSON consumers such as the TSE board"""
+    record = {
+      "Id": self.case_id,
+      "CaseNumber": self.case_number,
+      "Owner": {"Name": self.owner},
+      "Product__r": {"Name": self.product},
+      "Status": self.status,
+      "Severity__c": self.severity_label,
+      "CreatedDate": self.created_raw,
+      "LastModifiedDate": self.last_modified,
+      COMMITMENT_FIELD: self.commitment,
+      "Case_Complexity__c": self.complexity,
+      "Case_Reason__c": self.reason,
+    }
+    if self.extra:
+      record.update(self.extra)
+    return record
+
+def ingest(records: list, now: float = None) -> list:
+  now = now or time.time()
+  return [record if isinstance(record, CaseRecord) else CaseRecord(record, now) for record in records]
+
+def to_dicts(records: list) -> list:
+  return [record.to_dict() if isinstance(record, CaseRecord) else record for record in records]
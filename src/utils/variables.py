@@ -22,6 +22,11 @@ class VARS:
   Clean = 'clean'
   Vacation = 'vacation'
   TestMode = 'test_mode'
+  History = 'history'
+  Mock = 'mock'
+  MockServer = 'mock_server'
+  Replay = 'replay'
+  Daemon = 'daemon'
 
 class FileNames:
   Config = "config.json"
@@ -35,3 +40,8 @@ class FileNames:
   KeyFile = "key"
   PasswordFile = "passwd" 
   Counter = "counter"
+  History = "history"
+  Recordings = "recordings"
+  Telemetry = "telemetry.json"
+  Shared = "shared"
+  Cache = "cache"
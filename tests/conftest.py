@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import pytest
+import api.api_handler as api_handler
+from api.budget import budget
+from api.cache import result_cache
+from tools.mock_server import MockSalesforce, MockSettings, build_dataset
+from tools.telemetry import telemetry
+
+OWNERS = ["Jane Doe", "John Smith", "Ann Lee", "Support_Americas", "MCS"]
+COLUMNS = "Id, CaseNumber, Owner.Name, Product__r.Name, CreatedDate, LastModifiedDate, Severity__c, Time_Before_Next_Update_Commitment__c"
+
+class StubConfig():
+  """Stands in for Config, whose get_config_value() reads config/config.json"""
+  def __init__(self, **values):
+    self.values = {"rules.max_buffer_size_bytes": 10 ** 9, **values}
+
+  def get_config_value(self, key: str, default=None):
+    return self.values.get(key, default)
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+  """Keeps the cache, telemetry and API budget files of a test out of config/"""
+  monkeypatch.setattr(result_cache, "path", tmp_path / "cache")
+  monkeypatch.setattr(telemetry, "path", tmp_path / "telemetry.json")
+  monkeypatch.setattr(budget, "path", tmp_path / "api-budget.json")
+  monkeypatch.setattr(budget, "used", None)
+  monkeypatch.setattr(budget, "limit", None)
+  monkeypatch.setattr(api_handler, "decrypt_password", lambda: "secret")
+  api_handler._snapshots.clear()
+  api_handler._batch_unsupported.clear()
+
+@pytest.fixture
+def mock_org():
+  """A local mock SalesForce org, yields (server, query url)"""
+  settings = MockSettings(port=0, cases=200)
+  server = MockSalesforce(settings, dataset=build_dataset(settings, owners=OWNERS))
+  url = server.start()
+  yield server, url
+  server.stop()
+
+@pytest.fixture
+def make_handler(mock_org):
+  _, url = mock_org
+
+  def make(queries, **kwargs):
+    config_cls = kwargs.pop("config_cls", StubConfig())
+    return api_handler.APIHandler(api_url=url, username="user", query=queries, test=False, config_cls=config_cls, filereg_cls=None, **kwargs)
+  return make
@@ -0,0 +1,72 @@
+from api.api_handler import BATCH_LIMIT, composite_batch_url, probe_query, run_together
+from conftest import COLUMNS, StubConfig
+from tools.telemetry import telemetry
+
+def case_query(idx: int) -> str:
+  return f"SELECT {COLUMNS} FROM Case WHERE CaseNumber = '{1000000 + idx:08d}'"
+
+def owner_query(owner: str) -> str:
+  return f"SELECT {COLUMNS} FROM Case WHERE Owner.Name = '{owner}' ORDER BY CaseNumber"
+
+def case_numbers(records: list) -> list:
+  return [record["CaseNumber"] for record in records]
+
+def test_composite_batch_url_and_probe_query():
+  assert composite_batch_url("https://org.my.salesforce.com/services/data/v58.0/query") == ("https://org.my.salesforce.com/services/data/v58.0/composite/batch", "v58.0")
+  assert composite_batch_url("https://example.com/query") == (None, None)
+  assert probe_query("SELECT Id, Owner.Name FROM Case WHERE Status = 'New' ORDER BY CaseNumber LIMIT 5") == "SELECT COUNT(Id), MAX(LastModifiedDate) FROM Case WHERE Status = 'New'"
+
+def test_fetch_many_splits_batches_at_the_batch_limit(mock_org, make_handler):
+  server, _ = mock_org
+  queries = [case_query(idx) for idx in range(BATCH_LIMIT + 5)]
+  handler = make_handler(queries)
+
+  before = server.requests_served
+  results = handler.fetch_many(queries)
+
+  assert server.requests_served - before == 2
+  # Results come back in query order across both batches
+  assert [case_numbers(data["records"]) for data, _ in results] == [[f"{1000000 + idx:08d}"] for idx in range(BATCH_LIMIT + 5)]
+
+def test_concurrent_mode_sends_one_request_per_query(mock_org, make_handler):
+  server, _ = mock_org
+  queries = [case_query(idx) for idx in range(3)]
+  handler = make_handler(queries, execution_mode="parallel")
+
+  before = server.requests_served
+  handler.fetch_many(queries)
+  assert server.requests_served - before == 3
+
+def test_chunked_queries_merge_into_one_ordered_result(make_handler):
+  whole = make_handler(f"SELECT {COLUMNS} FROM Case WHERE Owner.Name IN ('Jane Doe', 'John Smith') ORDER BY CaseNumber").run()
+  chunked = make_handler([owner_query("Jane Doe"), owner_query("John Smith")]).run()
+  assert case_numbers(chunked) == case_numbers(whole)
+
+def test_run_together_fetches_every_handler_in_one_request(mock_org, make_handler):
+  server, _ = mock_org
+  engineer = make_handler([owner_query("Jane Doe"), owner_query("Support_Americas")])
+  manager = make_handler([owner_query("John Smith")])
+  expected = [sorted(case_numbers(make_handler(h.queries).fetch_from_api()["records"])) for h in (engineer, manager)]
+
+  before = server.requests_served
+  records = run_together([engineer, manager], use_cache=False)
+
+  assert server.requests_served - before == 1
+  assert [sorted(case_numbers(part)) for part in records] == expected
+
+def test_unchanged_probe_reuses_the_snapshot_unless_the_cache_is_bypassed(mock_org, make_handler):
+  server, _ = mock_org
+  handler = make_handler([owner_query("Jane Doe")], config_cls=StubConfig(**{"rules.cache_ttl_seconds": 0}))
+  first = handler.run()
+  skipped = telemetry.snapshot()["counters"].get("probe.skipped", 0)
+
+  before = server.requests_served
+  assert case_numbers(handler.run()) == case_numbers(first)
+  assert server.requests_served - before == 1
+  assert telemetry.snapshot()["counters"]["probe.skipped"] == skipped + 1
+
+  # A forced refresh goes straight to a full fetch
+  before = server.requests_served
+  handler.run(use_cache=False)
+  assert server.requests_served - before == 1
+  assert telemetry.snapshot()["counters"]["probe.skipped"] == skipped + 1
@@ -0,0 +1,46 @@
+import pytest
+from args import user_defined_args
+from utils.variables import VARS
+
+ARCHIVE = "config/recordings/snapshots-2026-10-19.jsonl.gz"
+
+def parse(*args):
+  return user_defined_args(["main.py", *args])
+
+def test_replay_takes_the_archive_and_speed_by_position():
+  assert parse("-replay", ARCHIVE, "60")[VARS.Replay] == {"archive": ARCHIVE, "speed": 60.0}
+  assert parse("-replay", ARCHIVE, "-d")[VARS.Replay] == {"archive": ARCHIVE, "speed": 0}
+  assert parse("-replay", ARCHIVE, "-d")[VARS.Debug]
+
+def test_replay_without_an_archive_exits():
+  with pytest.raises(SystemExit) as exited:
+    parse("-replay")
+  assert exited.value.code == 1
+
+def test_export_paths_with_dashes_are_not_flags():
+  assert parse("-q", "csv", "my-file.csv")[VARS.Simulate] == {"format": "csv", "path": "my-file.csv"}
+  assert parse("-q", "ndjson", "-d")[VARS.Simulate] == {"format": "ndjson", "path": None}
+  assert parse("-q")[VARS.Simulate] == {"format": "print", "path": None}
+
+def test_bench_takes_runs_and_target():
+  arg_obj = parse("-q", "bench", "5", "https://my-org.example.com/services/data/v58.0/query", "-test")
+  assert arg_obj[VARS.Simulate] == {"format": "bench", "runs": 5, "target": "https://my-org.example.com/services/data/v58.0/query"}
+  assert arg_obj[VARS.Test]
+
+@pytest.mark.parametrize("args, key, value", [
+  (("-history", "48", "-d"), VARS.History, 48),
+  (("-history",), VARS.History, 24),
+  (("-mock", "9000"), VARS.Mock, 9000),
+  (("-daemon", "9001", "-d"), VARS.Daemon, 9001),
+  (("-v", "December", "25"), VARS.Vacation, "December 25"),
+  (("-e", "case", "0012-3456"), VARS.Exclude, {"type": "case", "value": "0012-3456"}),
+  (("-t", "add", "-d"), VARS.Team, "add"),
+])
+def test_flag_values_are_read_by_position(args, key, value):
+  assert parse(*args)[key] == value
+
+@pytest.mark.parametrize("args", [("-history", "a-day"), ("-mock", "-x"), ("-bogus",)])
+def test_bad_arguments_exit(args):
+  with pytest.raises(SystemExit) as exited:
+    parse(*args)
+  assert exited.value.code == 1
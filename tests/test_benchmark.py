@@ -0,0 +1,63 @@
+import pytest
+from api.budget import budget
+from conftest import COLUMNS
+from tools.benchmark import benchmark, summarize
+
+ALL = f"SELECT {COLUMNS} FROM Case ORDER BY CaseNumber"
+ONE_OWNER = f"SELECT {COLUMNS} FROM Case WHERE Owner.Name = 'Jane Doe' ORDER BY CaseNumber"
+RUNS = 3
+
+@pytest.fixture
+def paged_org(mock_org):
+  server, url = mock_org
+  server.settings.page_size = 50
+  server.settings.latency_ms = 5
+  return server, url
+
+def test_every_variant_runs_cold_and_warm_against_the_mock_server(paged_org, capsys):
+  server, url = paged_org
+  before = server.requests_served
+  variants = benchmark(url, "user", "mock", [ALL, ONE_OWNER], RUNS, live=False)
+
+  assert [query for query, _ in variants] == [ALL, ONE_OWNER]
+  calls = 0
+  for _, results in variants:
+    assert len(results["cold"]) == RUNS and len(results["warm"]) == RUNS
+    pages = results["cold"][0]["requests"]
+    assert all(sample["requests"] == pages for sample in results["cold"] + results["warm"])
+    # Cold runs, the discarded warm-up and the warm runs
+    calls += (2 * RUNS + 1) * pages
+  assert server.requests_served - before == calls
+
+  all_results = variants[0][1]
+  assert all_results["cold"][0]["requests"] == 4
+  assert {sample["records"] for sample in all_results["cold"] + all_results["warm"]} == {200}
+  assert variants[1][1]["warm"][0]["records"] < 200
+
+  for mode in ("cold", "warm"):
+    stats = summarize(all_results[mode])
+    seconds = sorted(sample["seconds"] for sample in all_results[mode])
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (seconds[1], seconds[2], seconds[2])
+    # Every page waits out the mock latency
+    assert stats["p50"] >= 4 * 0.005
+    assert (stats["records"], stats["requests"]) == (200, 4)
+
+  report = capsys.readouterr().out
+  assert "Variant 1" in report and "Variant 2" in report
+
+def test_percentiles_of_the_samples():
+  samples = [{"seconds": n / 10, "decode": n / 100, "records": 5, "bytes": 100, "requests": 1} for n in range(10, 0, -1)]
+  stats = summarize(samples)
+  assert (stats["p50"], stats["p95"], stats["p99"]) == (0.5, 1.0, 1.0)
+  assert stats["decode"] == 0.05
+
+def test_a_failing_variant_is_skipped(paged_org, capsys):
+  server, url = paged_org
+  server.settings.password = "secret"
+  assert benchmark(url, "user", "wrong", [ALL], 1, live=False) == []
+  assert "Variant failed and was skipped: HTTP 401" in capsys.readouterr().out
+
+def test_live_runs_feed_the_api_budget(paged_org):
+  _, url = paged_org
+  benchmark(url, "user", "mock", [ONE_OWNER], 1, live=True)
+  assert budget.used is not None
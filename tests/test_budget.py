@@ -0,0 +1,43 @@
+import pytest
+from api.budget import ApiBudget, LIMIT_HEADER, parse_limit_info
+
+def reading(used: int, limit: int = 10000) -> dict:
+  return {LIMIT_HEADER: f"api-usage={used}/{limit}"}
+
+def test_parse_limit_info():
+  assert parse_limit_info("api-usage=25/15000") == (25, 15000)
+  assert parse_limit_info("api-usage=18/5000; per-app-api-usage=17/250(appName=sample-connected-app)") == (18, 5000)
+  assert parse_limit_info("per-app-api-usage=17/250(appName=sample-connected-app); api-usage=18/5000") == (18, 5000)
+  assert parse_limit_info("") is None
+  assert parse_limit_info(None) is None
+
+def test_without_a_reading_nothing_is_throttled(tmp_path):
+  budget = ApiBudget(path=tmp_path / "budget.json")
+  budget.observe({})
+  assert budget.remaining_fraction() is None
+  assert budget.poll_multiplier() == 1
+  assert not budget.exhausted()
+  assert budget.summary() == ""
+
+@pytest.mark.parametrize("used, multiplier", [(0, 1), (5000, 1), (5001, 2), (7600, 4), (9000, 4), (9001, 8)])
+def test_poll_interval_stretches_as_the_allocation_runs_down(tmp_path, used, multiplier):
+  budget = ApiBudget(path=tmp_path / "budget.json")
+  budget.observe(reading(used))
+  assert budget.poll_multiplier() == multiplier
+
+def test_fetches_pause_inside_the_reserve(tmp_path):
+  budget = ApiBudget(path=tmp_path / "budget.json", reserve=0.05)
+  budget.observe(reading(9400))
+  assert not budget.exhausted()
+  budget.observe(reading(9500))
+  assert budget.exhausted()
+  assert "fetching paused" in budget.summary()
+
+def test_readings_are_shared_between_instances(tmp_path):
+  path = tmp_path / "budget.json"
+  ApiBudget(path=path).observe(reading(6000))
+
+  follower = ApiBudget(path=path)
+  follower.refresh()
+  assert (follower.used, follower.limit) == (6000, 10000)
+  assert follower.poll_multiplier() == 2
@@ -0,0 +1,63 @@
+import json, os, time
+import pytest
+import api.cache as cache
+from api.cache import ResultCache, cache_key, normalize_soql
+
+@pytest.fixture
+def store(tmp_path):
+  return ResultCache(tmp_path / "cache")
+
+def response(size: int = 1) -> dict:
+  return {"totalSize": size, "done": True, "records": [{"CaseNumber": f"{idx:08d}"} for idx in range(size)]}
+
+def test_normalize_soql_collapses_whitespace_outside_literals():
+  assert normalize_soql("  SELECT Id\n\tFROM   Case WHERE Name = 'a  b';  ") == "SELECT Id FROM Case WHERE Name = 'a  b'"
+
+def test_cache_key_is_per_org_user_and_query():
+  key = cache_key("https://Org.example.com/services/data/v58.0/query", "User", ["SELECT Id  FROM Case"])
+  assert key == cache_key("https://org.example.com/other", "user", ["SELECT Id FROM Case"])
+  assert key != cache_key("https://other.example.com/", "user", ["SELECT Id FROM Case"])
+  assert key != cache_key("https://org.example.com/", "someone", ["SELECT Id FROM Case"])
+  assert key != cache_key("https://org.example.com/", "user", ["SELECT Id FROM Case WHERE Name = 'a  b'"])
+
+def test_entries_expire_after_their_ttl(store):
+  store.put("live", response(), ttl=60, max_bytes=10 ** 6)
+  store.put("old", response(), ttl=0.05, max_bytes=10 ** 6)
+  time.sleep(0.1)
+
+  data, stored_at = store.get("live")
+  assert data == response()
+  assert time.time() - stored_at < 5
+  assert store.get("old") is None
+  assert store.get("old", stale_ok=True)[0] == response()
+  assert store.get("missing", stale_ok=True) is None
+
+def test_least_recently_used_entries_are_evicted_first(store):
+  for idx, key in enumerate(["a", "b", "c"]):
+    store.put(key, response(20), ttl=60, max_bytes=10 ** 6)
+    os.utime(store.entry_path(key), (1000 + idx, 1000 + idx))
+  entry_size = store.entry_path("a").stat().st_size
+
+  # Reading "a" makes "b" the least recently used entry
+  assert store.get("a") is not None
+  store.put("d", response(20), ttl=60, max_bytes=3 * entry_size + entry_size // 2)
+
+  assert sorted(path.stem for _, _, path in store.entries()) == ["a", "c", "d"]
+
+def test_writes_replace_entries_atomically(store, monkeypatch):
+  store.put("key", response(1), ttl=60, max_bytes=10 ** 6)
+
+  def fail(*args, **kwargs):
+    raise OSError("disk full")
+  monkeypatch.setattr(cache.json, "dump", fail)
+  store.put("key", response(5), ttl=60, max_bytes=10 ** 6)
+
+  # The failed write leaves the previous entry whole and no temporary file behind
+  assert store.get("key")[0] == response(1)
+  assert [path.name for path in store.path.iterdir()] == ["key.json"]
+
+def test_unreadable_entries_are_discarded(store):
+  store.path.mkdir(parents=True)
+  store.entry_path("broken").write_text(json.dumps({"stored_at": time.time(), "ttl": 60}) + "\n{not json")
+  assert store.get("broken") is None
+  assert not store.entry_path("broken").exists()
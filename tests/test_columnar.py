@@ -0,0 +1,45 @@
+import random
+import pytest
+from utils.columnar import CaseColumns
+from utils.records import CaseRecord
+
+NOW = 1_750_000_000
+OWNERS = ["Support_Americas", "MCS", "Jane Doe", "John Smith", "Ann Lee", ""]
+
+def snapshot(size: int, seed: int) -> list:
+  rng = random.Random(seed)
+  cases = []
+  for idx in range(size):
+    # Rounded commitments produce ties, which both paths must order the same way
+    commitment = None if rng.random() < 0.1 else round(rng.uniform(-0.5, 3), 1)
+    cases.append(CaseRecord({
+      "CaseNumber": f"{idx:08d}",
+      "Owner": {"Name": rng.choice(OWNERS)},
+      "Product__r": {"Name": "API Gateway"},
+      "Time_Before_Next_Update_Commitment__c": commitment,
+    }, now=NOW))
+  return cases
+
+def buckets(cases: list, use_numpy: bool) -> tuple:
+  columns = CaseColumns(cases, use_numpy=use_numpy, now=NOW)
+  assert columns.vectorized == use_numpy
+  queue_idx, team_idx = columns.commitment_buckets({"Support_Americas", "MCS"}, {"Jane Doe", "John Smith"}, queue_threshold=45 / (24 * 60))
+  return [case.case_number for case in columns.take(queue_idx)], [case.case_number for case in columns.take(team_idx)], columns.owner_counts(team_idx)
+
+@pytest.mark.parametrize("size, seed", [(0, 1), (1, 2), (50, 3), (2000, 4)])
+def test_numpy_and_pure_python_paths_give_identical_buckets(size, seed):
+  pytest.importorskip("numpy")
+  cases = snapshot(size, seed)
+  assert buckets(cases, use_numpy=True) == buckets(cases, use_numpy=False)
+
+def test_buckets_are_sorted_by_urgency_and_exclusive():
+  columns = CaseColumns(snapshot(500, 5), use_numpy=False, now=NOW)
+  queue_idx, team_idx = columns.commitment_buckets({"Support_Americas", "MCS"}, {"Jane Doe", "John Smith"}, queue_threshold=0.5)
+  queue, team = columns.take(queue_idx), columns.take(team_idx)
+
+  assert queue and team
+  assert not {case.case_number for case in queue} & {case.case_number for case in team}
+  for bucket, threshold in ((queue, 0.5), (team, 1)):
+    due = [case.commitment_at(NOW) for case in bucket]
+    assert due == sorted(due) and due[-1] <= threshold
+  assert sum(columns.owner_counts(team_idx).values()) == len(team)
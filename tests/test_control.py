@@ -0,0 +1,85 @@
+import json, threading, time
+from pathlib import Path
+import pytest
+from handlers.control import Action, ControlLoop
+from handlers.engineer import EngineerHandler
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+TEAMS = {"teams": {"api": {"viewable": True, "members": ["Jane Doe"]}, "group": {"members": ["Support_Americas"]}}}
+
+@pytest.fixture
+def control(tmp_path):
+  control = ControlLoop(watch_paths=[str(tmp_path / "config.json")], interactive=False).start()
+  yield control
+  control.stop()
+
+def press(control: ControlLoop, keys: str):
+  for char in keys:
+    control.loop.call_soon_threadsafe(control.on_key, char)
+
+@pytest.mark.parametrize("key, kind", [("r", "refresh"), ("q", "quit"), ("Q", "quit"), ("s", "switch_role")])
+def test_keys_map_to_commands(control, key, kind):
+  press(control, key)
+  assert control.next_action(5) == Action(kind)
+
+def test_unmapped_keys_are_ignored_until_the_timer_fires(control):
+  press(control, "x")
+  started = time.monotonic()
+  assert control.next_action(0.2) == Action("timer")
+  assert time.monotonic() - started >= 0.2
+
+def test_prompted_commands_carry_the_typed_value(control):
+  press(control, "e123\x7f4\n")
+  assert control.next_action(5) == Action("exclude_case", "124")
+  press(control, "p\x1b")
+  assert control.next_action(0.2) == Action("timer")
+
+def test_commands_win_over_notifications(control):
+  press(control, "r")
+  assert control.next_action(5, wait=lambda timeout: True) == Action("refresh")
+  assert control.next_action(5, wait=lambda timeout: True) == Action("events")
+
+def test_changes_to_watched_files_are_reported_unless_acknowledged(control, tmp_path):
+  path = tmp_path / "config.json"
+  path.write_text("{}")
+  assert control.next_action(5) == Action("files", str(path))
+
+  path.write_text('{"role": "engineer"}')
+  control.acknowledge(str(path))
+  assert control.next_action(1.5) == Action("timer")
+
+class SilentDisplay():
+  def clear_screen(self): pass
+  def display_header(self, *args, **kwargs): pass
+
+def test_the_engineer_loop_refetches_on_refresh_and_exits_on_quit(control):
+  config_data = json.loads((TEMPLATES / "config.json").read_text())
+  config_data["engineer_name"] = "Jane Doe"
+  config_data["rules"].update(record_history=False, shared_fetch=False)
+  handler = EngineerHandler(
+    config_data=config_data, config_cls=None, filereg_cls=None, team_cls=None, debug=False, send_alerts=False,
+    isTest=False, teamsList=TEAMS, display=None, common_display=SilentDisplay()
+  )
+  handler.control = control
+
+  refreshes = []
+  keys = ["r", "q"]
+  def refresh(excluded_products, group_list, engineer_list, rerender=False, warm=False, use_cache=True):
+    refreshes.append({"warm": warm, "use_cache": use_cache, "thread": threading.current_thread().name})
+    return {}, [], []
+  handler.refresh = refresh
+  handler.display_results = lambda case_results, queue_trend=None, stale_seconds=None: press(control, keys.pop(0))
+
+  try:
+    with pytest.raises(SystemExit) as exited:
+      handler.main_loop(excluded_products=set(), group_list={"Support_Americas"}, engineer_list={"Jane Doe"})
+  finally:
+    handler.prefetch.cancel(wait=False)
+
+  assert exited.value.code == 0
+  # The forced refresh replaces the scheduled prefetch and skips the cache, on the loop's own thread
+  main = threading.current_thread().name
+  assert refreshes == [
+    {"warm": True, "use_cache": True, "thread": main},
+    {"warm": False, "use_cache": False, "thread": main},
+  ]
@@ -0,0 +1,132 @@
+import json, os, subprocess, sys, time
+from pathlib import Path
+import pytest
+from api.budget import ApiBudget, LIMIT_HEADER, budget as shared_budget
+from api.coordinator import SharedFetch
+from conftest import COLUMNS
+from tools.telemetry import telemetry
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+ENGINEER = f"SELECT {COLUMNS} FROM Case WHERE Owner.Name = 'Jane Doe' ORDER BY CaseNumber"
+MANAGER = f"SELECT {COLUMNS} FROM Case WHERE Owner.Name IN ('Support_Americas', 'MCS') ORDER BY CaseNumber"
+
+@pytest.fixture
+def shared(tmp_path):
+  """Makes SharedFetch instances in one directory, each acting as a separate process"""
+  instances = []
+  def make(poll_minutes=30):
+    instances.append(SharedFetch(lambda: poll_minutes, path=tmp_path / "shared"))
+    return instances[-1]
+  yield make
+  for instance in instances:
+    instance.close()
+
+def counter(name: str) -> float:
+  return telemetry.snapshot()["counters"].get(name, 0)
+
+def served(mock_org, run) -> tuple:
+  server, _ = mock_org
+  before = server.requests_served
+  records = run()
+  return records, server.requests_served - before
+
+def numbers(records: list) -> list:
+  return [record["CaseNumber"] for record in records]
+
+def test_one_leader_fetches_the_union_of_the_registered_query_sets(mock_org, make_handler, shared):
+  leader, follower = shared(), shared()
+  engineer, manager = make_handler([ENGINEER]), make_handler([MANAGER])
+
+  _, requests = served(mock_org, lambda: leader.run(engineer))
+  assert leader.leader and requests == 1
+
+  # The follower's first cycle registers its set, nothing has been published for it yet
+  fallbacks = counter("shared.fallbacks")
+  direct, _ = served(mock_org, lambda: follower.run(manager))
+  assert not follower.leader
+  assert counter("shared.fallbacks") == fallbacks + 1
+
+  # From then on both sets come back from one round trip of the leader
+  _, requests = served(mock_org, lambda: leader.run(engineer, use_cache=False))
+  assert requests == 1
+  assert follower.changed()
+
+  reads = counter("shared.reads")
+  records, requests = served(mock_org, lambda: follower.run(manager))
+  assert requests == 0
+  assert counter("shared.reads") == reads + 1
+  assert numbers(records) == numbers(direct) and records
+
+def test_a_follower_takes_over_when_the_leader_dies(mock_org, make_handler, shared, tmp_path):
+  (tmp_path / "shared").mkdir()
+  follower = shared()
+  engineer = make_handler([ENGINEER])
+  follower.bind(engineer)
+
+  holder = subprocess.Popen(
+    [sys.executable, "-c", (
+      "import sys, time; sys.path.insert(0, sys.argv[1])\n"
+      "from api.coordinator import FileLock\n"
+      "lock = FileLock(sys.argv[2])\n"
+      "assert lock.acquire()\n"
+      "print('locked', flush=True); time.sleep(60)"
+    ), str(SRC), str(follower.lock.path)],
+    stdout=subprocess.PIPE, text=True
+  )
+  try:
+    assert holder.stdout.readline().strip() == "locked"
+    # The leader never published, so the follower fetches for itself
+    records, requests = served(mock_org, lambda: follower.run(engineer))
+    assert not follower.leader and requests == 1 and records
+  finally:
+    holder.kill()
+    holder.wait(5)
+
+  # The lock died with its process
+  served(mock_org, lambda: follower.run(engineer, use_cache=False))
+  assert follower.leader
+  assert follower.read()["pid"] == os.getpid()
+
+def test_registrations_of_processes_that_stopped_polling_are_dropped(make_handler, shared):
+  leader, follower = shared(poll_minutes=1), shared(poll_minutes=1)
+  leader.bind(make_handler([ENGINEER]))
+  follower.bind(make_handler([MANAGER]))
+  assert list(leader.registered_sets().values()) == [[MANAGER]]
+
+  # Two missed one minute polls and a minute of slack
+  stale = time.time() - 181
+  os.utime(follower.registration_path(), (stale, stale))
+  assert leader.registered_sets() == {}
+  assert not follower.registration_path().exists()
+
+def test_closing_removes_the_registration(make_handler, shared):
+  leader, follower = shared(), shared()
+  leader.bind(make_handler([ENGINEER]))
+  follower.bind(make_handler([MANAGER]))
+  follower.close()
+  assert leader.registered_sets() == {}
+
+def test_followers_read_the_snapshot_with_commitments_aged(make_handler, shared):
+  leader, follower = shared(), shared(poll_minutes=240)
+  leader.bind(make_handler([ENGINEER]))
+  assert leader.lock.acquire()
+  follower.bind(make_handler([MANAGER]))
+  # Commitments are in days, a quarter of a day has passed since the leader fetched
+  record = {"CaseNumber": "1", "Time_Before_Next_Update_Commitment__c": 2}
+  follower.snapshot_path().write_text(json.dumps({"fetched_at": time.time() - 6 * 60 * 60, "records": [record]}))
+
+  [aged] = follower.run(make_handler([MANAGER]))
+  assert aged["CaseNumber"] == "1"
+  assert aged["Time_Before_Next_Update_Commitment__c"] == pytest.approx(1.75, abs=0.001)
+
+def test_followers_judge_the_leader_by_its_stretched_interval(make_handler, shared):
+  follower = shared(poll_minutes=None)
+  follower.poll_minutes = lambda: 30 * shared_budget.poll_multiplier()
+  follower.bind(make_handler([ENGINEER]))
+  # Two missed 30 minute polls, but the leader is polling four times slower
+  follower.snapshot_path().write_text(json.dumps({"fetched_at": time.time() - 90 * 60, "records": []}))
+  assert follower.read() is None
+
+  ApiBudget(path=shared_budget.path).observe({LIMIT_HEADER: "api-usage=9000/10000"})
+  assert follower.read() is not None
+  assert shared_budget.poll_multiplier() == 4
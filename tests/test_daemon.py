@@ -0,0 +1,112 @@
+import json, threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+import pytest
+import requests
+from conftest import StubConfig
+from handlers.daemon import DaemonHandler, DaemonRequestHandler
+from utils.helper import group_members, team_members
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+TEAMS = {"teams": {"api": {"viewable": True, "members": ["Jane Doe", "John Smith"]}, "group": {"members": ["Support_Americas", "MCS"]}}}
+
+class SilentDisplay():
+  def clear_screen(self): pass
+  def display_header(self, *args, **kwargs): pass
+
+class StaticApp():
+  """Serves one fixed dashboard the way DaemonHandler.resolve() does"""
+  snapshot = {"version": 3, "fetched_at": "2026-01-01T00:00:00"}
+
+  def resolve(self, path: str):
+    if path == "/manager":
+      return 200, b'{"queue": []}', '"abc"', self.snapshot
+    return 404, b'{"error": "Unknown endpoint"}', '"404"', self.snapshot
+
+@pytest.fixture
+def daemon_url():
+  server = ThreadingHTTPServer(("127.0.0.1", 0), DaemonRequestHandler)
+  server.app = StaticApp()
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  yield f"http://127.0.0.1:{server.server_port}"
+  server.shutdown()
+  server.server_close()
+
+def test_dashboard_carries_its_etag_and_snapshot_headers(daemon_url):
+  response = requests.get(daemon_url + "/manager")
+  assert response.status_code == 200
+  assert response.headers["ETag"] == '"abc"'
+  assert response.headers["X-Snapshot-Version"] == "3"
+  assert response.json() == {"queue": []}
+
+@pytest.mark.parametrize("tags", ['"abc"', '"old", "abc"'])
+def test_matching_if_none_match_gets_an_empty_304(daemon_url, tags):
+  response = requests.get(daemon_url + "/manager", headers={"If-None-Match": tags})
+  assert response.status_code == 304
+  assert response.content == b""
+  assert response.headers["ETag"] == '"abc"'
+
+def test_stale_etag_gets_the_body(daemon_url):
+  response = requests.get(daemon_url + "/manager", headers={"If-None-Match": '"old"'})
+  assert response.status_code == 200
+  assert response.content == b'{"queue": []}'
+
+def test_errors_are_never_cached(daemon_url):
+  response = requests.get(daemon_url + "/nope", headers={"If-None-Match": '"404"'})
+  assert response.status_code == 404
+  assert "ETag" not in response.headers
+
+@pytest.fixture
+def daemon(mock_org):
+  """A real DaemonHandler fetching from the mock org, serving on an ephemeral port"""
+  _, url = mock_org
+  config_data = json.loads((TEMPLATES / "config.json").read_text())
+  config_data.update(api_url=url, username="user", engineer_name="Jane Doe")
+  config_data["rules"].update(record_history=False, shared_fetch=False, daemon_host="127.0.0.1")
+
+  daemon = DaemonHandler(
+    config_data=config_data, config_cls=StubConfig(), filereg_cls=None, team_cls=None, debug=False, send_alerts=False,
+    isTest=False, teamsList=TEAMS, display=None, common_display=SilentDisplay(), port=0
+  )
+  # The membership run() derives before its loop
+  daemon.group_list = set(group_members(TEAMS))
+  daemon.engineer_list = set(team_members(TEAMS))
+  daemon.engineers = sorted(daemon.engineer_list | {"Jane Doe"})
+  daemon.refresh(use_cache=False)
+  daemon.serve()
+  yield daemon, f"http://127.0.0.1:{daemon.server.server_port}"
+  daemon.server.shutdown()
+  daemon.server.server_close()
+
+def test_repeated_requests_are_served_from_the_snapshot_response_cache(daemon):
+  app, url = daemon
+  first = requests.get(url + "/engineer/jane doe")
+  assert first.status_code == 200
+  assert first.json()["engineer"] == "Jane Doe"
+  cached = app.responses[("engineer", "jane doe")]
+
+  second = requests.get(url + "/engineer/jane doe")
+  assert second.headers["ETag"] == first.headers["ETag"]
+  assert second.content == first.content
+  assert app.responses[("engineer", "jane doe")] is cached
+
+  not_modified = requests.get(url + "/engineer/jane doe", headers={"If-None-Match": first.headers["ETag"]})
+  assert not_modified.status_code == 304
+  assert not_modified.content == b""
+  assert not_modified.headers["X-Snapshot-Version"] == "1"
+
+def test_a_new_snapshot_changes_the_etag(daemon, mock_org):
+  app, url = daemon
+  server, _ = mock_org
+  before = requests.get(url + "/engineer/Jane Doe")
+
+  row = next(row for row in server.rows if row["Owner.Name"] == "Support_Americas" and not row["Status_Closed__c"])
+  server.publish(row, {"Owner.Name": "Jane Doe"})
+  app.refresh(use_cache=False)
+  assert app.responses == {}
+
+  after = requests.get(url + "/engineer/Jane Doe", headers={"If-None-Match": before.headers["ETag"]})
+  assert after.status_code == 200
+  assert after.headers["ETag"] != before.headers["ETag"]
+  assert after.headers["X-Snapshot-Version"] == "2"
+  assert row["CaseNumber"] in [case["CaseNumber"] for case in after.json()["personal_cases"]]
@@ -0,0 +1,98 @@
+import csv, json
+import pytest
+from conftest import COLUMNS, StubConfig
+from tools.export import cast_value, column_kind, compile_projection, export_pages, project
+
+QUERY = f"SELECT {COLUMNS} FROM Case ORDER BY CaseNumber"
+SELECTED = ["CaseNumber", "Owner.Name", "Severity__c"]
+RECORDS = [
+  {"CaseNumber": "1", "Owner": {"Name": "Jane Doe", "Manager": {"Name": "Ann Lee", "Manager": {"Name": "MCS"}}}, "Severity__c": "Level 1"},
+  {"CaseNumber": "2", "Owner": None, "Severity__c": None},
+]
+
+def test_dotted_paths_of_any_depth_are_resolved():
+  projection = compile_projection(["CaseNumber", "Owner.Name", "Owner.Manager.Name", "Owner.Manager.Manager.Name", "Owner.Missing.Name"])
+  assert project(RECORDS, projection) == [
+    ("1", "Jane Doe", "Ann Lee", "MCS", None),
+    ("2", None, None, None, None),
+  ]
+
+def test_ndjson_writes_one_object_per_record(tmp_path):
+  path = tmp_path / "cases.ndjson"
+  assert export_pages([(RECORDS[:1], 0), (RECORDS[1:], 0)], SELECTED, fmt="ndjson", path=str(path)) == 2
+  assert [json.loads(line) for line in path.read_text().splitlines()] == [
+    {"CaseNumber": "1", "Owner.Name": "Jane Doe", "Severity__c": "Level 1"},
+    {"CaseNumber": "2", "Owner.Name": None, "Severity__c": None},
+  ]
+
+def test_csv_writes_a_header_and_a_row_per_record(tmp_path):
+  path = tmp_path / "cases.csv"
+  assert export_pages([(RECORDS, 0)], SELECTED, fmt="csv", path=str(path)) == 2
+  with open(path, newline="") as f:
+    assert list(csv.reader(f)) == [SELECTED, ["1", "Jane Doe", "Level 1"], ["2", "", ""]]
+
+def test_pages_are_fetched_one_at_a_time_while_exporting(mock_org, make_handler, tmp_path):
+  server, _ = mock_org
+  server.settings.page_size = 50
+  path = tmp_path / "cases.ndjson"
+  before = server.requests_served
+  seen = []
+
+  def pages():
+    for records, size in make_handler([QUERY]).stream_pages():
+      # The next page is only requested once this one has been written
+      seen.append((len(records), server.requests_served - before))
+      yield records, size
+
+  assert export_pages(pages(), SELECTED, fmt="ndjson", path=str(path)) == 200
+  assert seen == [(50, 1), (50, 2), (50, 3), (50, 4)]
+  numbers = [json.loads(line)["CaseNumber"] for line in path.read_text().splitlines()]
+  assert numbers == sorted(numbers) and len(set(numbers)) == 200
+
+def test_a_streamed_result_is_cached_for_the_next_run(mock_org, make_handler):
+  server, _ = mock_org
+  server.settings.page_size = 50
+  records = [record for page, _ in make_handler([QUERY]).stream_pages() for record in page]
+
+  before = server.requests_served
+  cached = make_handler([QUERY]).cached_result()
+  assert server.requests_served == before
+  assert [record["CaseNumber"] for record in cached["records"]] == [record["CaseNumber"] for record in records]
+
+def test_a_result_over_the_buffer_size_is_not_cached(make_handler):
+  handler = make_handler([QUERY], config_cls=StubConfig(**{"rules.max_buffer_size_bytes": 1000}))
+  assert sum(len(page) for page, _ in handler.stream_pages()) == 200
+  assert handler.cached_result() is None
+
+@pytest.mark.parametrize("values, kind", [
+  ((1, 2), "double"),
+  ((1, 2.5), "double"),
+  ((True, None), "bool"),
+  ((None, None), "string"),
+  (("a", 1), "string"),
+  (({"Name": "x"},), "string"),
+])
+def test_column_kinds(values, kind):
+  assert column_kind(values) == kind
+
+@pytest.mark.parametrize("value, kind, cast", [
+  (7, "double", (7.0, True)),
+  ("2.5", "double", (2.5, True)),
+  ("n/a", "double", (None, False)),
+  (3, "string", ("3", True)),
+  ({"Name": "x"}, "string", ('{"Name": "x"}', True)),
+  ("yes", "bool", (None, False)),
+  (None, "bool", (None, True)),
+])
+def test_later_pages_are_cast_to_the_first_pages_types(value, kind, cast):
+  assert cast_value(value, kind) == cast
+
+def test_parquet_columns_hold_values_of_other_types_on_later_pages(tmp_path):
+  pq = pytest.importorskip("pyarrow.parquet")
+  path = tmp_path / "cases.parquet"
+  pages = [
+    ([{"Hours": 1, "Note": None, "Open": True}], 0),
+    ([{"Hours": 2.5, "Note": 4, "Open": False}], 0),
+  ]
+  assert export_pages(pages, ["Hours", "Note", "Open"], fmt="parquet", path=str(path)) == 2
+  assert pq.read_table(path).to_pydict() == {"Hours": [1.0, 2.5], "Note": [None, "4"], "Open": [True, False]}
@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+import pytest
+import handlers.engineer as engineer
+from handlers.engineer import EngineerHandler
+from utils.records import ingest
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+TEAMS = {"teams": {"api": {"viewable": True, "members": ["Jane Doe", "John Smith"]}, "group": {"members": ["Support_Americas"]}}}
+
+RECORDS = [
+  {"CaseNumber": "00000001", "Owner": {"Name": "Support_Americas"}, "Product__r": {"Name": "API Gateway"}, "CreatedDate": "2025-06-15T10:00:00.000+0000"},
+  {"CaseNumber": "00000002", "Owner": {"Name": "Jane Doe"}, "Product__r": {"Name": "API Gateway"}, "CreatedDate": "2025-06-15T10:00:00.000+0000"},
+  {"CaseNumber": "00000003", "Owner": {"Name": "John Smith"}, "Product__r": {"Name": "Event Broker"}, "CreatedDate": "2025-06-15T10:00:00.000+0000"},
+]
+
+class SilentDisplay():
+  def clear_screen(self): pass
+  def display_header(self, *args, **kwargs): pass
+
+@pytest.fixture
+def forward(monkeypatch):
+  """Classifies RECORDS as the forwarding agent and returns the payload it uploads"""
+  uploads = []
+  monkeypatch.setattr(engineer, "uploadToTseBoard", lambda cases, config_cls, views=None: uploads.append((cases, views)))
+
+  def run(**rules):
+    config_data = json.loads((TEMPLATES / "config.json").read_text())
+    config_data["engineer_name"] = "Jane Doe"
+    config_data["rules"].update(upload_to_tse_board=True, record_history=False, shared_fetch=False, **rules)
+    handler = EngineerHandler(
+      config_data=config_data, config_cls=None, filereg_cls=None, team_cls=None, debug=False, send_alerts=False,
+      isTest=False, teamsList=TEAMS, display=None, common_display=SilentDisplay()
+    )
+    handler.display_results(handler.classify(ingest(RECORDS), set(), {"Support_Americas"}, {"Jane Doe", "John Smith"}))
+    return uploads.pop()
+  return run
+
+def test_the_board_gets_the_case_lists_by_default(forward):
+  cases, views = forward()
+  assert views is None
+  assert set(cases) == {"team_cases", "personal_cases", "opened_today_cases", "case_validation_failed_list"}
+  assert [case["CaseNumber"] for case in cases["team_cases"]] == ["00000001"]
+  assert [case["CaseNumber"] for case in cases["personal_cases"]] == ["00000002"]
+
+def test_the_partitioned_payload_is_opt_in(forward):
+  cases, views = forward(tse_board_payload_version=2)
+  assert sorted(cases) == ["00000001", "00000002", "00000003"]
+  assert views["queue"] == ["00000001"]
+  assert views["team"] == {"Jane Doe": ["00000002"], "John Smith": ["00000003"]}
+  assert views["personal"] == {"Jane Doe": ["00000002"], "John Smith": ["00000003"]}
+  assert views["validationFailed"] == []
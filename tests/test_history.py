@@ -0,0 +1,57 @@
+import json
+from multiprocessing import get_context
+from tools.history import COLUMNS, QueueHistory
+from utils.records import CaseRecord
+
+NOW = 1_750_000_000
+
+def cases(owners: list, product: str = "API Gateway") -> list:
+  return [
+    CaseRecord({"CaseNumber": f"{idx:08d}", "Owner": {"Name": owner}, "Product__r": {"Name": product},
+                "Severity__c": "3 - Medium", "CreatedDate": "2025-06-15T10:00:00.000+0000"}, now=NOW)
+    for idx, owner in enumerate(owners)
+  ]
+
+def write_rows(root, product: str, rounds: int):
+  history = QueueHistory("engineer", path=root).init()
+  for idx in range(rounds):
+    history.append(cases([f"{product} {idx}"], product=product), 0.1, now=NOW + idx)
+
+def test_views_are_stored_apart(tmp_path):
+  QueueHistory("engineer", path=tmp_path).init().append(cases(["Jane Doe"] * 2), 0.1, now=NOW)
+  QueueHistory("manager", path=tmp_path).init().append(cases(["Jane Doe"] * 5), 0.1, now=NOW)
+
+  assert QueueHistory("engineer", path=tmp_path).init().trend(now=NOW + 1, buckets=1) == [2]
+  assert QueueHistory("manager", path=tmp_path).init().trend(now=NOW + 1, buckets=1) == [5]
+
+def test_concurrent_writers_share_one_key_map(tmp_path):
+  ctx = get_context("fork")
+  writers = [ctx.Process(target=write_rows, args=(tmp_path, product, 20)) for product in ("Alpha", "Beta")]
+  for writer in writers: writer.start()
+  for writer in writers: writer.join()
+  assert all(writer.exitcode == 0 for writer in writers)
+
+  keys = json.loads((tmp_path / "engineer" / "keys.json").read_text())
+  assert len(set(keys.values())) == len(keys)
+  assert {f"2:{product} {idx}" for product in ("Alpha", "Beta") for idx in range(20)} <= set(keys)
+
+  history = QueueHistory("engineer", path=tmp_path).init()
+  owners = [name for _, name, _ in history.series("owner", NOW - 1, NOW + 60)]
+  assert sorted(owners) == sorted(f"{product} {idx}" for product in ("Alpha", "Beta") for idx in range(20))
+
+  chunk = next(path for path in history.path.iterdir() if path.is_dir())
+  ts = [ts for ts, _, _ in history.series("total", NOW - 1, NOW + 60)]
+  assert ts == sorted(ts) and len(ts) == 40
+  rows = {(chunk / f"{name}.col").stat().st_size // {"I": 4, "B": 1}[code] for name, code in COLUMNS.items()}
+  assert len(rows) == 1
+
+def test_a_partial_row_is_trimmed_before_the_next_append(tmp_path):
+  history = QueueHistory("engineer", path=tmp_path).init()
+  history.append(cases(["Jane Doe"]), 0.1, now=NOW)
+  chunk = next(path for path in history.path.iterdir() if path.is_dir())
+  # A writer that died between column appends
+  with open(chunk / "ts.col", "ab") as f:
+    f.write((NOW + 1).to_bytes(4, "little"))
+
+  history.append(cases(["Jane Doe", "John Smith"]), 0.1, now=NOW + 2)
+  assert history.downsample("total", "cases", start=NOW, end=NOW + 3, buckets=3) == [1, None, 2]
@@ -0,0 +1,90 @@
+import logging, queue, threading, time
+from logging.handlers import QueueListener
+from logger import DeferredQueueHandler, RateLimitFilter, every
+
+class Recorder(logging.Handler):
+  def __init__(self):
+    super().__init__()
+    self.lines = []
+
+  def emit(self, record):
+    self.lines.append(self.format(record))
+
+class Formatted():
+  """Notes the thread it is turned into text on"""
+  def __init__(self):
+    self.threads = []
+
+  def __str__(self):
+    self.threads.append(threading.current_thread())
+    return "value"
+
+def recording_logger(name: str, *filters):
+  recorder = Recorder()
+  for log_filter in filters:
+    recorder.addFilter(log_filter)
+  logger = logging.getLogger(name)
+  logger.handlers = [recorder]
+  logger.propagate = False
+  logger.setLevel(logging.DEBUG)
+  return logger, recorder
+
+def test_records_are_formatted_on_the_listener_thread():
+  recorder = Recorder()
+  handler = DeferredQueueHandler(queue.SimpleQueue())
+  listener = QueueListener(handler.queue, recorder)
+  logger = logging.getLogger("test_deferred")
+  logger.addHandler(handler)
+  logger.propagate = False
+
+  arg = Formatted()
+  listener.start()
+  try:
+    logger.warning("got %s", arg)
+  finally:
+    listener.stop()
+    logger.removeHandler(handler)
+
+  assert recorder.lines == ["got value"]
+  assert arg.threads and threading.current_thread() not in arg.threads
+
+def test_mutable_args_are_logged_as_they_were_when_logged():
+  recorder = Recorder()
+  handler = DeferredQueueHandler(queue.SimpleQueue())
+  listener = QueueListener(handler.queue, recorder)
+  logger = logging.getLogger("test_deferred_snapshot")
+  logger.handlers = [handler]
+  logger.propagate = False
+
+  excluded, counts = {"Gateway"}, {"open": 1}
+  logger.warning("excluded %s", excluded)
+  logger.warning("counts %(open)s", counts)
+  # Changed before the listener gets to the records
+  excluded.add("Portal")
+  counts["open"] = 2
+  listener.start()
+  listener.stop()
+
+  assert recorder.lines == ["excluded {'Gateway'}", "counts 1"]
+
+def test_rate_limited_call_sites_note_what_they_suppressed():
+  logger, recorder = recording_logger("test_rate_limit", RateLimitFilter())
+  def poll(n):
+    logger.info("poll %d failed", n, extra=every(0.2))
+
+  for n in range(3):
+    poll(n)
+  time.sleep(0.25)
+  poll(3)
+  assert recorder.lines == ["poll 0 failed", "poll 3 failed (suppressed 2 similar)"]
+
+def test_records_without_a_rate_limit_and_other_call_sites_pass():
+  logger, recorder = recording_logger("test_rate_limit_sites", RateLimitFilter())
+  for n in range(2):
+    logger.info("plain %d", n)
+    logger.info("first site %d", n, extra=every(60))
+    logger.info("second site %d", n, extra=every(60))
+  assert recorder.lines == ["plain 0", "first site 0", "second site 0", "plain 1"]
+
+def test_every():
+  assert every(5) == {"rate_limit": 5}
@@ -0,0 +1,43 @@
+import random
+from types import SimpleNamespace
+from utils.matcher import OwnerMatcher
+
+def brute_force(engineers: list, owner: str) -> tuple:
+  return tuple(sorted({name for name in engineers if name.lower() in owner.lower()}))
+
+def test_exact_and_partial_owners_match_case_insensitively():
+  matcher = OwnerMatcher(["Jane Doe", "John Smith", " Ann "])
+  assert matcher.match("Jane Doe") == ("Jane Doe",)
+  assert matcher.match("JANE DOE (Backup)") == ("Jane Doe",)
+  assert matcher.match("Joanne Smith") == ("Ann",)
+  assert matcher.match("Nobody") == ()
+  assert matcher.match("") == ()
+  assert matcher.match(None) == ()
+
+def test_every_overlapping_name_is_reported():
+  # "ann" and "anne" end inside "joanne", the automaton has to follow its failure links to find both
+  matcher = OwnerMatcher(["Ann", "Anne", "Joanne", "Jo"])
+  assert matcher.match("Joanne") == ("Ann", "Anne", "Jo", "Joanne")
+  assert matcher.match("Annette") == ("Ann", "Anne")
+
+def test_matches_agree_with_a_substring_scan():
+  rng = random.Random(7)
+  engineers = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 4))).strip() or "a" for _ in range(40)]
+  matcher = OwnerMatcher(engineers)
+  names = sorted({name.strip() for name in engineers})
+  for _ in range(300):
+    owner = "".join(rng.choice("abcd ") for _ in range(rng.randint(0, 12)))
+    assert matcher.match(owner) == brute_force(names, owner), owner
+
+def test_partition_assigns_each_case_to_every_matching_engineer():
+  matcher = OwnerMatcher(["Jane Doe", "Jane", "John Smith", "Idle Engineer"])
+  cases = [SimpleNamespace(number=idx, owner=owner) for idx, owner in enumerate(["Jane Doe", "John Smith", "Queue", "jane"])]
+
+  partitions = matcher.partition(cases)
+
+  assert {name: [case.number for case in assigned] for name, assigned in partitions.items()} == {
+    "Idle Engineer": [],
+    "Jane": [0, 3],
+    "Jane Doe": [0],
+    "John Smith": [1],
+  }
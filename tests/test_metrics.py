@@ -0,0 +1,101 @@
+import re
+import pytest
+import requests
+from display.common import ManagerDashboardData
+from tools.metrics import MetricsExporter, engineer_families, escape_label, format_family, format_sample, manager_families
+from utils.records import ingest
+
+NOW = 1_700_000_000.0
+
+# One sample line of the text exposition format 0.0.4
+SAMPLE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*",?)*\})? [-+]?(\d+(\.\d*)?([eE][-+]?\d+)?|Inf|NaN)$')
+
+def cases(*rows) -> list:
+  return ingest([{"CaseNumber": f"{idx:08d}", "Owner": {"Name": owner}, "Product__r": {"Name": product}, "Time_Before_Next_Update_Commitment__c": days}
+    for idx, (owner, product, days) in enumerate(rows)], now=NOW)
+
+def values(families: list) -> dict:
+  return {(name, tuple(sorted(labels.items()))): value for name, _, _, samples in families for _, labels, value in samples}
+
+def test_label_values_are_escaped():
+  assert escape_label('a\\b"c\nd') == 'a\\\\b\\"c\\nd'
+  assert format_sample("sfquery_x", {"product": 'say "hi"'}, 2) == 'sfquery_x{product="say \\"hi\\""} 2.0'
+  assert format_sample("sfquery_x", {}, 0.5) == "sfquery_x 0.5"
+
+def test_family_has_help_and_type_before_its_samples():
+  assert format_family("sfquery_x", "gauge", "Help text", [(None, {}, 1), ("sfquery_x_sum", {}, 2)]) == [
+    "# HELP sfquery_x Help text",
+    "# TYPE sfquery_x gauge",
+    "sfquery_x 1.0",
+    "sfquery_x_sum 2.0",
+  ]
+
+def test_engineer_families_count_the_queue_and_commitments_at_risk():
+  team = cases(("Queue", "Gateway", 0.01), ("Queue", "Gateway", 2), ("Queue", "Broker", None))
+  threshold_minutes = 60
+  families = engineer_families({"team_cases": team, "opened_today_cases": team[:1], "personal_cases": []}, threshold_minutes, now=NOW)
+
+  assert values(families) == {
+    ("sfquery_queue_cases", (("product", "Broker"), ("view", "engineer"))): 1,
+    ("sfquery_queue_cases", (("product", "Gateway"), ("view", "engineer"))): 2,
+    ("sfquery_commitments_at_risk", (("scope", "queue"), ("view", "engineer"))): 1,
+    ("sfquery_opened_today_cases", (("view", "engineer"),)): 1,
+    ("sfquery_personal_cases", (("view", "engineer"),)): 0,
+  }
+
+def test_commitments_count_down_from_the_ingest_deadline():
+  team = cases(("Queue", "Gateway", 0.5))
+  key = ("sfquery_commitments_at_risk", (("scope", "queue"), ("view", "engineer")))
+  assert values(engineer_families({"team_cases": team}, 60, now=NOW))[key] == 0
+  assert values(engineer_families({"team_cases": team}, 60, now=NOW + 0.49 * 24 * 3600))[key] == 1
+
+def test_manager_view_publishes_its_breakdown_under_its_own_name():
+  dashboard = ManagerDashboardData(
+    queue_needs_commitment=cases(("Queue", "Gateway", 0.01)),
+    team_needs_commitment=cases(("Jane Doe", "Broker", 0.2), ("John Smith", "Broker", 0.3)),
+    team_owner_counts={"Jane Doe": 1, "John Smith": 1},
+    queue_trend=[],
+    update_threshold=60,
+    color=None
+  )
+  names = {name for name, _, _, _ in manager_families(dashboard)}
+  assert "sfquery_queue_cases" not in names
+  assert values(manager_families(dashboard))[("sfquery_queue_commitments_at_risk", (("product", "Gateway"), ("view", "manager")))] == 1
+
+@pytest.fixture
+def exporter():
+  exporter = MetricsExporter()
+  exporter.publish("engineer", engineer_families({"team_cases": cases(("Queue", 'Odd "product"\\', 0.01))}, 60, now=NOW))
+  exporter.publish("manager", [("sfquery_commitments_at_risk", "gauge", "Cases due", [(None, {"view": "manager", "scope": "queue"}, 4)])])
+  yield exporter
+  if exporter.server:
+    exporter.server.shutdown()
+    exporter.server.server_close()
+
+def test_rendered_exposition_parses(exporter):
+  lines = exporter.render().splitlines()
+
+  headers = [line.split()[2] for line in lines if line.startswith("# TYPE")]
+  assert len(headers) == len(set(headers)), "a family was split across two headers"
+  assert all(SAMPLE.match(line) for line in lines if not line.startswith("#")), [line for line in lines if not line.startswith("#") and not SAMPLE.match(line)]
+
+  at_risk = [line for line in lines if line.startswith("sfquery_commitments_at_risk{")]
+  assert len(at_risk) == 2
+  assert any(line.startswith("sfquery_snapshot_timestamp_seconds{view=\"manager\"}") for line in lines)
+
+def test_metrics_are_served_over_http(exporter):
+  exporter.serve(0)
+  base = f"http://127.0.0.1:{exporter.server.server_port}"
+
+  response = requests.get(base + "/metrics")
+  assert response.status_code == 200
+  assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+  assert "# TYPE sfquery_queue_cases gauge" in response.text
+  assert requests.get(base + "/other").status_code == 404
+
+def test_textfile_is_written_on_publish(tmp_path):
+  exporter = MetricsExporter()
+  exporter.configure(textfile=str(tmp_path / "sfquery.prom"))
+  exporter.publish("engineer", engineer_families({"team_cases": []}, 60, now=NOW))
+  assert "sfquery_opened_today_cases{view=\"engineer\"} 0.0" in (tmp_path / "sfquery.prom").read_text()
+  assert [path.name for path in tmp_path.iterdir()] == ["sfquery.prom"]
@@ -0,0 +1,88 @@
+import threading
+import pytest
+from handlers.prefetch import Prefetcher
+
+def blocking(started: threading.Event, release: threading.Event, result):
+  def produce():
+    started.set()
+    assert release.wait(5)
+    return result
+  return produce
+
+def test_a_due_prefetch_is_swapped_in():
+  prefetch = Prefetcher("test")
+  prefetch.schedule(lambda: "next", due_in=0)
+  assert prefetch.take() == "next"
+  assert prefetch.take() is None
+  assert len(prefetch.durations) == 1
+
+def test_a_cancelled_prefetch_never_starts():
+  calls = []
+  prefetch = Prefetcher("test", margin_seconds=0)
+  prefetch.schedule(lambda: calls.append("fetched"), due_in=60)
+  thread = prefetch.thread
+
+  prefetch.cancel()
+  assert not thread.is_alive()
+  assert calls == []
+  assert prefetch.take() is None
+
+def test_the_late_result_of_a_cancelled_prefetch_is_dropped():
+  started, release = threading.Event(), threading.Event()
+  prefetch = Prefetcher("test")
+  prefetch.schedule(blocking(started, release, "late"), due_in=0)
+  assert started.wait(5)
+  thread = prefetch.thread
+
+  # Cancelling does not wait for the fetch in flight
+  prefetch.cancel(wait=False)
+  assert thread.is_alive()
+  release.set()
+  thread.join(5)
+
+  assert prefetch.result is None
+  assert prefetch.take() is None
+
+def test_a_new_schedule_is_not_overwritten_by_a_late_result():
+  started, release = threading.Event(), threading.Event()
+  prefetch = Prefetcher("test")
+  prefetch.schedule(blocking(started, release, "late"), due_in=0)
+  assert started.wait(5)
+  late = prefetch.thread
+
+  prefetch.schedule(lambda: "current", due_in=0)
+  release.set()
+  late.join(5)
+  assert prefetch.take() == "current"
+
+def test_foreground_refreshes_wait_for_a_cancelled_fetch_in_flight():
+  started, release = threading.Event(), threading.Event()
+  order = []
+  prefetch = Prefetcher("test")
+  prefetch.schedule(blocking(started, release, "late"), due_in=0)
+  assert started.wait(5)
+  prefetch.cancel(wait=False)
+
+  foreground = threading.Thread(target=lambda: order.append(prefetch.foreground(lambda: "foreground")))
+  foreground.start()
+  foreground.join(0.2)
+  # The two refreshes never overlap
+  assert foreground.is_alive() and order == []
+
+  release.set()
+  foreground.join(5)
+  assert order == ["foreground"]
+
+def test_a_failed_prefetch_raises_on_take():
+  def fail():
+    raise RuntimeError("fetch failed")
+  prefetch = Prefetcher("test")
+  prefetch.schedule(fail, due_in=0)
+  with pytest.raises(RuntimeError, match="fetch failed"):
+    prefetch.take()
+
+def test_a_disabled_prefetcher_schedules_nothing():
+  prefetch = Prefetcher("test", enabled=False)
+  prefetch.schedule(lambda: "next", due_in=0)
+  assert prefetch.thread is None
+  assert prefetch.take() is None
@@ -0,0 +1,61 @@
+import re
+import pytest
+from api.query_builder import QueryBuilder, render_value
+from exceptions import BadQuery
+
+OWNER_QUERY = "SELECT Id FROM Case WHERE Owner.Name IN ({support_group}) OR Owner.Name IN ({engineer_list}) ORDER BY CaseNumber"
+
+def owners_in(query: str) -> set:
+  return set(re.findall(r"'([^']*)'", query))
+
+def test_render_value_quotes_sorts_and_escapes():
+  assert render_value(["b", " a ", "O'Brien"]) == "'O\\'Brien', 'a', 'b'"
+  assert render_value([]) == "''"
+  assert render_value(0.00123) == "0.00123"
+  assert render_value(True) == "TRUE"
+
+def test_like_placeholder_escapes_wildcards_only_inside_the_pattern():
+  builder = QueryBuilder({"Engineer": "SELECT Id FROM Case WHERE Owner.Name LIKE '%{engineer_name}%' OR Owner.Name = '{engineer_name}'"})
+  query = builder.render("Engineer", engineer_name="J_n 50%").query
+  assert "LIKE '%J\\_n 50\\%%'" in query
+  assert "Owner.Name = 'J_n 50%'" in query
+
+def test_render_reuses_the_query_until_its_inputs_change():
+  builder = QueryBuilder({"Manager": OWNER_QUERY})
+  first = builder.render("Manager", support_group={"b", "a"}, engineer_list=["c"])
+  assert builder.render("Manager", support_group=["a", "b"], engineer_list={"c"}) is first
+  assert builder.render("Manager", support_group=["a"], engineer_list=["c"]) is not first
+
+def test_unknown_placeholders_and_queries_are_rejected():
+  with pytest.raises(BadQuery):
+    QueryBuilder({"Bad": "SELECT Id FROM Case WHERE Owner.Name = '{owner}'"})
+  with pytest.raises(BadQuery):
+    QueryBuilder({}).render("Missing")
+
+def test_short_query_is_not_chunked():
+  builder = QueryBuilder({"Manager": OWNER_QUERY})
+  chunks = builder.render_chunks("Manager", max_length=16000, support_group=["a"], engineer_list=["b"])
+  assert len(chunks) == 1
+  assert owners_in(chunks[0].query) == {"a", "b"}
+
+def test_chunks_stay_under_the_limit_and_split_every_owner_list_alike():
+  builder = QueryBuilder({"Manager": OWNER_QUERY})
+  group = [f"Queue {idx:03d}" for idx in range(60)]
+  engineers = [f"Engineer {idx:03d}" for idx in range(140)] + group[:10]
+
+  chunks = builder.render_chunks("Manager", max_length=1200, support_group=group, engineer_list=engineers)
+
+  assert len(chunks) > 1
+  assert all(len(chunk.query) <= 1200 for chunk in chunks)
+  # Every owner lands in exactly one chunk, so the union of the results equals the full query
+  seen = [owner for chunk in chunks for owner in owners_in(chunk.query)]
+  assert sorted(set(seen)) == sorted(set(group) | set(engineers))
+  assert len(seen) == len(set(seen))
+  assert all(chunk.query.endswith("ORDER BY CaseNumber") for chunk in chunks)
+
+def test_chunks_are_cached_per_input():
+  builder = QueryBuilder({"Manager": OWNER_QUERY})
+  owners = [f"Owner {idx}" for idx in range(100)]
+  chunks = builder.render_chunks("Manager", max_length=900, support_group=owners, engineer_list=[])
+  assert builder.render_chunks("Manager", max_length=900, support_group=list(reversed(owners)), engineer_list=[]) is chunks
+  assert builder.render_chunks("Manager", max_length=1800, support_group=owners, engineer_list=[]) is not chunks
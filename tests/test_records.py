@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+import pytest
+from utils.records import COMMITMENT_FIELD, CaseRecord, ingest, parse_severity, parse_timestamp, to_dicts
+
+NOW = 1_700_000_000.0
+DAY = 24 * 60 * 60
+
+def salesforce_record(**fields) -> dict:
+  record = {
+    "attributes": {"type": "Case", "url": "/services/data/v58.0/sobjects/Case/5003000000D8cuI"},
+    "Id": "5003000000D8cuI",
+    "CaseNumber": "00123456",
+    "Owner": {"attributes": {"type": "User"}, "Name": "Jane Doe"},
+    "Product__r": {"attributes": {"type": "Product__c"}, "Name": "Gateway"},
+    "Status": "Open",
+    "Severity__c": "2 - High",
+    "CreatedDate": "2024-05-01T13:45:00.000+0000",
+    "LastModifiedDate": "2024-05-02T08:00:00.000+0000",
+    COMMITMENT_FIELD: 1.5,
+    "Case_Complexity__c": "Medium",
+    "Case_Reason__c": "Question",
+    "Account_Region__c": "EMEA",
+  }
+  record.update(fields)
+  return record
+
+def test_to_dict_rebuilds_the_record_without_the_salesforce_attributes():
+  record = salesforce_record()
+  expected = dict(record, Owner={"Name": "Jane Doe"}, Product__r={"Name": "Gateway"})
+  del expected["attributes"]
+  assert CaseRecord(record, NOW).to_dict() == expected
+
+def test_a_rebuilt_record_ingests_to_the_same_case():
+  case = CaseRecord(salesforce_record(), NOW)
+  again = CaseRecord(case.to_dict(), NOW)
+  assert {slot: getattr(again, slot) for slot in CaseRecord.__slots__} == {slot: getattr(case, slot) for slot in CaseRecord.__slots__}
+  assert again.extra == {"Account_Region__c": "EMEA"}
+
+def test_the_id_falls_back_to_the_attributes_url():
+  record = salesforce_record()
+  del record["Id"]
+  assert CaseRecord(record, NOW).case_id == "5003000000D8cuI"
+
+@pytest.mark.parametrize("label, severity", [
+  ("1 - Critical", 1),
+  ("2 - High", 2),
+  ("4", 4),
+  ("High", None),
+  ("", None),
+  (None, None),
+])
+def test_parse_severity(label, severity):
+  assert parse_severity(label) == severity
+
+@pytest.mark.parametrize("value, parsed", [
+  ("2024-05-01T13:45:00.000+0000", datetime(2024, 5, 1, 13, 45, tzinfo=timezone.utc)),
+  ("2024-05-01", datetime(2024, 5, 1, tzinfo=timezone.utc)),
+  ("yesterday", None),
+  ("", None),
+  (None, None),
+])
+def test_parse_timestamp(value, parsed):
+  assert parse_timestamp(value) == parsed
+
+def test_the_commitment_counts_down_from_its_deadline():
+  case = CaseRecord(salesforce_record(), NOW)
+  assert case.deadline == NOW + 1.5 * DAY
+  assert case.commitment_at(NOW) == pytest.approx(1.5)
+  assert case.commitment_at(NOW + DAY / 2) == pytest.approx(1.0)
+  assert case.commitment_at(NOW + 2 * DAY) == pytest.approx(-0.5)
+
+def test_a_case_without_a_commitment_has_no_deadline():
+  case = CaseRecord(salesforce_record(**{COMMITMENT_FIELD: None}), NOW)
+  assert case.deadline is None
+  assert case.commitment_at(NOW) is None
+
+@pytest.mark.parametrize("fields", [
+  {"Owner": None},
+  {"Owner": {"Name": ""}},
+  {"Product__r": None},
+  {"CreatedDate": "not a date"},
+  {"CreatedDate": None},
+  {"CaseNumber": "  "},
+])
+def test_malformed_rows_are_not_valid(fields):
+  assert CaseRecord(salesforce_record(), NOW).valid
+  assert not CaseRecord(salesforce_record(**fields), NOW).valid
+
+def test_priority_falls_back_to_the_label():
+  assert CaseRecord(salesforce_record(), NOW).priority == "2"
+  assert CaseRecord(salesforce_record(Severity__c="Urgent - now"), NOW).priority == "Urgent"
+
+def test_ingest_passes_cases_through_and_to_dicts_passes_dicts_through():
+  case = CaseRecord(salesforce_record(), NOW)
+  raw = salesforce_record(CaseNumber="00999999")
+  cases = ingest([case, raw], now=NOW)
+  assert cases[0] is case and cases[1].case_number == "00999999"
+  assert to_dicts([case, raw]) == [case.to_dict(), raw]
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from config.config import Config
+from config.team import Team
+from handlers.engineer import EngineerHandler
+from handlers.reload import reload_settings
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+TEAMS = {"teams": {"api": {"viewable": True, "members": ["Jane Doe"]}, "group": {"members": ["Support_Americas"]}}}
+
+class SilentDisplay():
+  def clear_screen(self): pass
+  def display_header(self, *args, **kwargs): pass
+
+@pytest.fixture
+def settings(tmp_path):
+  """Config and Team pointed at writable copies of config.json and teams.json"""
+  config_cls = Config(filereg=None)
+  config_cls.config_path = str(tmp_path / "config.json")
+  team_cls = Team(filereg=None)
+  team_cls.teams_path = str(tmp_path / "teams.json")
+
+  config_data = json.loads((TEMPLATES / "config.json").read_text())
+  config_data.update(engineer_name="Jane Doe", api_url="https://org.example.com/services/data/v58.0/query", username="user")
+  config_data["rules"].update(record_history=False, shared_fetch=False, prefetch=False)
+  Path(config_cls.config_path).write_text(json.dumps(config_data))
+  Path(team_cls.teams_path).write_text(json.dumps(TEAMS))
+  return config_cls, team_cls, config_data
+
+@pytest.fixture
+def handler(settings):
+  config_cls, team_cls, config_data = settings
+  handler = EngineerHandler(
+    config_data=config_data, config_cls=config_cls, filereg_cls=None, team_cls=team_cls, debug=False, send_alerts=False,
+    isTest=False, teamsList=json.loads(json.dumps(TEAMS)), display=None, common_display=SilentDisplay()
+  )
+  handler.control = SimpleNamespace(notice=None)
+  return handler
+
+def edit(path: str, change):
+  data = json.loads(Path(path).read_text())
+  change(data)
+  Path(path).write_text(json.dumps(data))
+
+def test_a_config_edit_is_applied(settings, handler):
+  config_cls, _, _ = settings
+  edit(config_cls.config_path, lambda data: data["rules"].update(poll_interval=5, update_threshold=90))
+
+  assert handler.reload(config_cls.config_path)
+  assert (handler.poll_interval, handler.update_threshold) == (5, 90)
+  assert handler.control.notice == "Reloaded config.json"
+
+def test_a_teams_edit_is_applied(settings, handler):
+  _, team_cls, _ = settings
+  edit(team_cls.teams_path, lambda data: data["teams"]["api"]["members"].append("John Smith"))
+
+  assert handler.reload(team_cls.teams_path)
+  assert handler.teams_list["teams"]["api"]["members"] == ["Jane Doe", "John Smith"]
+
+@pytest.mark.parametrize("change", [
+  lambda data: data.pop("api_url"),
+  lambda data: data["queries"].update(Engineer="SELECT Id FROM Case WHERE Owner.Name = '{nobody}'"),
+])
+def test_an_invalid_config_keeps_the_previous_settings(settings, handler, change):
+  config_cls, _, _ = settings
+  edit(config_cls.config_path, lambda data: (data["rules"].update(poll_interval=5), change(data)))
+
+  assert not handler.reload(config_cls.config_path)
+  assert handler.poll_interval == 30
+  assert handler.config_data["api_url"]
+  assert "config.json is invalid" in handler.control.notice
+
+def test_a_half_written_file_keeps_the_previous_settings(settings, handler):
+  config_cls, _, _ = settings
+  Path(config_cls.config_path).write_text('{"rules": {"poll_interval": 5')
+
+  assert not handler.reload(config_cls.config_path)
+  assert handler.poll_interval == 30
+  assert handler.control.notice == "config.json could not be read, the previous settings are kept"
+
+@pytest.mark.parametrize("change", [
+  lambda data: data["teams"]["api"].update(viewable="yes"),
+  lambda data: data["teams"]["api"].update(viewable=False),
+])
+def test_an_invalid_teams_edit_keeps_the_previous_list(settings, handler, change):
+  _, team_cls, _ = settings
+  edit(team_cls.teams_path, change)
+
+  assert not handler.reload(team_cls.teams_path)
+  assert handler.teams_list == TEAMS
+  assert "teams.json is invalid" in handler.control.notice
+
+def test_reload_settings_returns_the_validated_data(settings):
+  config_cls, team_cls, config_data = settings
+  assert reload_settings(config_cls.config_path, config_cls, team_cls) == (config_data, "Reloaded config.json")
+  assert reload_settings(team_cls.teams_path, config_cls, team_cls) == (TEAMS, "Reloaded teams.json")
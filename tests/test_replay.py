@@ -0,0 +1,99 @@
+import gzip, json
+from pathlib import Path
+import pytest
+import handlers.engineer as engineer
+from exceptions import ReplayFinished
+from handlers.engineer import EngineerHandler
+from tools.replay import ReplaySource, SnapshotRecorder
+from utils.clock import Clock, VirtualClock, get_clock, set_clock
+
+TEMPLATES = Path(__file__).resolve().parent.parent / "templates"
+START = 1_750_000_000
+STEP = 30 * 60
+TEAMS = {"teams": {"api": {"viewable": True, "members": ["Jane Doe", "John Smith"]}, "group": {"members": ["Support_Americas"]}}}
+
+def snapshot(idx: int) -> list:
+  return [{"CaseNumber": f"{idx:08d}", "Owner": {"Name": "Support_Americas"}, "Product__r": {"Name": "API Gateway"},
+           "Severity__c": "3 - Medium", "CreatedDate": "2025-06-15T10:00:00.000+0000", "Time_Before_Next_Update_Commitment__c": 0.5}]
+
+@pytest.fixture(autouse=True)
+def real_clock():
+  yield
+  set_clock(Clock())
+
+@pytest.fixture
+def archive(tmp_path):
+  """Three snapshots recorded half an hour apart on a virtual clock"""
+  recorder = SnapshotRecorder("ENGINEER", path=tmp_path)
+  clock = set_clock(VirtualClock(start=START))
+  for idx in range(3):
+    recorder.record(snapshot(idx))
+    clock.sleep(STEP)
+  set_clock(Clock())
+  return recorder.archive_for(START)
+
+def test_replay_follows_the_virtual_clock(archive):
+  source = ReplaySource(archive)
+  clock = get_clock()
+  assert clock.time() == START
+
+  # Sleeping inside a recorded interval keeps serving the snapshot in effect at that time
+  assert source.run() == snapshot(0)
+  clock.sleep(STEP / 2)
+  assert source.run() == snapshot(0)
+  clock.sleep(STEP / 2)
+  assert source.run() == snapshot(1)
+  clock.sleep(STEP)
+  assert source.run() == snapshot(2)
+
+  clock.sleep(STEP)
+  with pytest.raises(ReplayFinished, match="4 cycle"):
+    source.run()
+
+def test_replay_filters_snapshots_by_role(archive):
+  SnapshotRecorder("MANAGER", path=archive.parent).record([{"CaseNumber": "manager"}])
+  source = ReplaySource(archive, label="ENGINEER")
+  for _ in range(3):
+    assert source.run()[0]["CaseNumber"] != "manager"
+    get_clock().sleep(STEP)
+
+def test_replay_stops_at_a_partly_written_entry(archive):
+  with open(archive, "ab") as f:
+    f.write(gzip.compress(json.dumps({"t": START + 3 * STEP, "records": []}).encode())[:20])
+
+  source = ReplaySource(archive)
+  for idx in range(3):
+    assert source.run() == snapshot(idx)
+    get_clock().sleep(STEP)
+  with pytest.raises(ReplayFinished):
+    source.run()
+
+def test_an_unreadable_archive_ends_the_replay(tmp_path):
+  broken = tmp_path / "broken.jsonl.gz"
+  broken.write_bytes(b"not gzip")
+  with pytest.raises(ReplayFinished, match="Unable to read"):
+    ReplaySource(broken)
+
+class SilentDisplay():
+  def clear_screen(self): pass
+  def display_header(self, *args, **kwargs): pass
+
+def test_a_forwarding_replay_never_uploads_to_the_board(archive, monkeypatch):
+  config_data = json.loads((TEMPLATES / "config.json").read_text())
+  config_data["engineer_name"] = "Jane Doe"
+  config_data["rules"].update(upload_to_tse_board=True, record_history=False)
+
+  uploads = []
+  monkeypatch.setattr(engineer, "uploadToTseBoard", lambda *args, **kwargs: uploads.append(args))
+  monkeypatch.setattr(engineer, "alert", lambda *args, **kwargs: pytest.fail("a replay must not alert"))
+
+  handler = EngineerHandler(
+    config_data=config_data, config_cls=None, filereg_cls=None, team_cls=None, debug=False, send_alerts=True,
+    isTest=False, teamsList=TEAMS, display=None, common_display=SilentDisplay(), replay_source=ReplaySource(archive)
+  )
+  with pytest.raises(ReplayFinished):
+    handler.run(False)
+
+  # One 30 minute poll per recorded snapshot
+  assert (handler.replay_source.cycles, handler.replay_source.snapshots) == (3, 2)
+  assert uploads == []
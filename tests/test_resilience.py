@@ -0,0 +1,111 @@
+import time
+from collections import deque
+import pytest
+import api.api_handler as api_handler
+from api.api_handler import RETRY_STATUSES
+from api.latency import MIN_SAMPLES, LatencyTracker
+from conftest import COLUMNS
+from tools.telemetry import telemetry
+
+QUERY = f"SELECT {COLUMNS} FROM Case WHERE Owner.Name = 'Jane Doe' ORDER BY CaseNumber"
+SLOW_MS = 1500
+
+@pytest.fixture(autouse=True)
+def fresh_latency(monkeypatch):
+  monkeypatch.setattr(api_handler, "latency", LatencyTracker())
+  monkeypatch.setattr(api_handler, "RETRY_BASE_SECONDS", 0.01)
+
+@pytest.fixture
+def script(mock_org, monkeypatch):
+  """Queues (delay ms, status) faults for the next requests the mock org serves, in arrival order"""
+  server, _ = mock_org
+  steps = deque()
+  inject_faults = server.inject_faults
+
+  def scripted(authorization: str):
+    if not steps:
+      return inject_faults(authorization)
+    delay_ms, status = steps.popleft()
+    time.sleep(delay_ms / 1000)
+    return (status, [{"message": "Injected fault", "errorCode": "INJECTED"}]) if status else None
+
+  monkeypatch.setattr(server, "inject_faults", scripted)
+  return steps
+
+def counter(name: str) -> float:
+  return telemetry.snapshot()["counters"].get(name, 0)
+
+def timed(handler) -> tuple:
+  started = time.perf_counter()
+  response = handler.hit_api(query=QUERY)
+  return response, time.perf_counter() - started
+
+def test_hedges_wait_for_enough_samples_and_the_first_response_wins(mock_org, make_handler, script):
+  server, _ = mock_org
+  handler = make_handler([QUERY])
+  hedges, wins = counter("api.hedges"), counter("api.hedge_wins")
+
+  for _ in range(MIN_SAMPLES - 1):
+    assert handler.hit_api(query=QUERY).status_code == 200
+
+  # Without a full window there is no p95, a slow request is simply waited for
+  script.append((SLOW_MS, None))
+  response, elapsed = timed(handler)
+  assert response.status_code == 200 and elapsed >= SLOW_MS / 1000
+  assert counter("api.hedges") == hedges
+
+  # The slow sample completed the window, the next slow request is hedged after p95
+  assert api_handler.latency.hedge_delay("query") < SLOW_MS / 1000
+  before = server.requests_served
+  script.extend([(SLOW_MS, None), (0, None)])
+  response, elapsed = timed(handler)
+
+  assert response.status_code == 200
+  assert elapsed < SLOW_MS / 1000
+  assert server.requests_served - before == 2
+  assert counter("api.hedges") == hedges + 1
+  assert counter("api.hedge_wins") == wins + 1
+
+def test_hedging_can_be_disabled(make_handler, script):
+  handler = make_handler([QUERY], hedge_requests=False)
+  hedges = counter("api.hedges")
+  for _ in range(MIN_SAMPLES):
+    handler.hit_api(query=QUERY)
+
+  script.append((500, None))
+  _, elapsed = timed(handler)
+  assert elapsed >= 0.5
+  assert counter("api.hedges") == hedges
+
+@pytest.mark.parametrize("status", sorted(RETRY_STATUSES))
+def test_transient_statuses_are_retried(mock_org, make_handler, script, status):
+  server, _ = mock_org
+  handler = make_handler([QUERY], hedge_requests=False)
+  retries = counter("api.retries")
+
+  before = server.requests_served
+  script.extend([(0, status), (0, status)])
+  assert handler.hit_api(query=QUERY).status_code == 200
+  assert server.requests_served - before == 3
+  assert counter("api.retries") == retries + 2
+
+def test_retries_stop_at_max_retries(mock_org, make_handler):
+  server, _ = mock_org
+  server.settings.error_rate = 1.0
+  handler = make_handler([QUERY], hedge_requests=False, max_retries=2)
+
+  before = server.requests_served
+  assert handler.hit_api(query=QUERY).status_code == 500
+  assert server.requests_served - before == 3
+
+@pytest.mark.parametrize("status", [400, 401, 403, 404, 501])
+def test_other_statuses_fail_at_once(mock_org, make_handler, script, status):
+  server, _ = mock_org
+  handler = make_handler([QUERY], hedge_requests=False)
+  retries = counter("api.retries")
+
+  before = server.requests_served
+  script.append((0, status))
+  assert handler.hit_api(query=QUERY).status_code == status
+  assert server.requests_served - before == 1
+  assert counter("api.retries") == retries
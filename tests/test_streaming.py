@@ -0,0 +1,135 @@
+import time
+import pytest
+import api.streaming as streaming
+from api.streaming import CaseStream, StreamingClient, cometd_url, filter_fields, record_id
+from conftest import OWNERS, StubConfig
+from api.api_handler import APIHandler
+from tools.mock_server import MockSalesforce, MockSettings, build_dataset
+
+QUERY = (
+  "SELECT Id, CaseNumber, Owner.Name, Severity__c, Status, LastModifiedDate FROM Case "
+  "WHERE Owner.Name IN ('Jane Doe', 'Support_Americas') AND Status_Closed__c = FALSE ORDER BY CaseNumber ASC"
+)
+
+class CountingHandler():
+  """Wraps an APIHandler to count the full fetches a CaseStream falls back to"""
+  def __init__(self, handler: APIHandler):
+    self.handler = handler
+    self.queries = handler.queries
+    self.rerender = False
+    self.fetches = 0
+
+  def run(self, use_cache: bool = True) -> list:
+    self.fetches += 1
+    return self.handler.run(use_cache=use_cache)
+
+def wait_until(condition, timeout: float = 5):
+  deadline = time.monotonic() + timeout
+  while not condition():
+    assert time.monotonic() < deadline, "timed out"
+    time.sleep(0.01)
+
+@pytest.fixture
+def org(monkeypatch):
+  monkeypatch.setattr(streaming, "decrypt_password", lambda: "secret")
+  settings = MockSettings(port=0, cases=200, stream_timeout=1)
+  server = MockSalesforce(settings, dataset=build_dataset(settings, owners=OWNERS))
+  url = server.start()
+  yield server, url
+  server.stop()
+
+@pytest.fixture
+def stream(org):
+  server, url = org
+  stream = CaseStream(StreamingClient(api_url=url, username="user", timeout=1), coalesce_seconds=0).start()
+  wait_until(stream.live)
+  yield stream
+  stream.stop()
+
+@pytest.fixture
+def handler(org):
+  _, url = org
+  return CountingHandler(APIHandler(api_url=url, username="user", query=[QUERY], test=False, config_cls=StubConfig(), filereg_cls=None))
+
+def open_row(server: MockSalesforce, owner: str) -> dict:
+  return next(row for row in server.rows if row["Owner.Name"] == owner and not row["Status_Closed__c"])
+
+def by_id(records: list) -> dict:
+  return {record_id(record): record for record in records}
+
+def test_cometd_url_and_filter_fields():
+  assert cometd_url("https://org.example.com/services/data/v58.0/query") == "https://org.example.com/cometd/58.0"
+  assert cometd_url("https://org.example.com/query") is None
+  assert {"Owner.Name", "OwnerId", "Status_Closed__c"} <= filter_fields(QUERY)
+  assert "Severity__c" not in filter_fields(QUERY)
+
+def test_updates_to_fetched_columns_are_applied_in_place(org, stream, handler):
+  server, _ = org
+  stream.run(handler)
+  row = open_row(server, "Jane Doe")
+  severity = "1 - Critical" if row["Severity__c"] != "1 - Critical" else "4 - Low"
+
+  server.publish(row, {"Severity__c": severity})
+  assert stream.wait(5)
+  records = stream.run(handler)
+
+  assert handler.fetches == 1
+  assert by_id(records)[row["Id"]]["Severity__c"] == severity
+
+def test_created_cases_and_owner_moves_trigger_a_resync(org, stream, handler):
+  server, _ = org
+  stream.run(handler)
+
+  template = dict(open_row(server, "Jane Doe"), Id="500999999999999999", CaseNumber="09999999")
+  server.publish(template, {}, change_type="CREATE")
+  assert stream.wait(5)
+  assert template["Id"] in by_id(stream.run(handler))
+  assert handler.fetches == 2
+
+  row = open_row(server, "Support_Americas")
+  server.publish(row, {"Owner.Name": "John Smith"})
+  assert stream.wait(5)
+  assert row["Id"] not in by_id(stream.run(handler))
+  assert handler.fetches == 3
+
+def test_deleted_cases_are_dropped_without_a_fetch(org, stream, handler):
+  server, _ = org
+  stream.run(handler)
+  row = open_row(server, "Jane Doe")
+
+  server.publish(row, {}, change_type="DELETE")
+  assert stream.wait(5)
+  assert row["Id"] not in by_id(stream.run(handler))
+  assert handler.fetches == 1
+
+def test_a_dropped_stream_falls_back_to_polling_and_resyncs_after_the_gap(org, stream, handler):
+  server, _ = org
+  stream.run(handler)
+  row = open_row(server, "Jane Doe")
+  server.publish(row, {"Severity__c": "2 - High"})
+  assert stream.wait(5)
+  stream.run(handler)
+  last_replay_id = stream.client.replay_id
+  assert last_replay_id > 0
+
+  server.drop_clients()
+  wait_until(lambda: not stream.live())
+  # While the stream is down every cycle is a full poll, even with no events pending
+  stream.run(handler)
+  stream.run(handler)
+  assert handler.fetches == 3
+
+  # An update published during the gap is replayed from the last seen replayId on reconnect
+  server.publish(row, {"Severity__c": "1 - Critical"})
+  wait_until(lambda: stream.live() and stream.client.sessions == 2)
+  assert stream.wait(5)
+  assert stream.client.replay_id > last_replay_id
+
+  # The new session cannot prove nothing else was missed, so the first cycle resyncs
+  assert by_id(stream.run(handler))[row["Id"]]["Severity__c"] == "1 - Critical"
+  assert handler.fetches == 4
+
+  server.publish(row, {"Severity__c": "4 - Low"})
+  assert stream.wait(5)
+  assert by_id(stream.run(handler))[row["Id"]]["Severity__c"] == "4 - Low"
+  assert handler.fetches == 4
@@ -0,0 +1,29 @@
+import json, os, threading
+from tools.telemetry import Telemetry
+
+def test_flush_writes_the_snapshot_through_a_per_process_temp_file(tmp_path, monkeypatch):
+  path = tmp_path / "telemetry.json"
+  telemetry = Telemetry(path=path)
+  telemetry.incr("poll.count")
+  replaced = []
+  os_replace = os.replace
+  monkeypatch.setattr(os, "replace", lambda src, dst: (replaced.append(src), os_replace(src, dst)))
+
+  telemetry.flush()
+  assert replaced == [tmp_path / f"telemetry.json.{os.getpid()}.tmp"]
+  assert json.loads(path.read_text())["counters"] == {"poll.count": 1}
+
+def test_concurrent_flushes_leave_a_whole_file(tmp_path):
+  path = tmp_path / "telemetry.json"
+  telemetry = Telemetry(path=path)
+  for n in range(200):
+    telemetry.observe(f"timing.{n}", n / 1000)
+
+  threads = [threading.Thread(target=lambda: [telemetry.flush() for _ in range(20)]) for _ in range(4)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join(10)
+
+  assert len(json.loads(path.read_text())["timings"]) == 200
+  assert [entry.name for entry in tmp_path.iterdir()] == ["telemetry.json"]
@@ -0,0 +1,38 @@
+import threading, time
+from conftest import COLUMNS
+from handlers.warm_start import GRACE_SECONDS, warm_start
+
+QUERY = f"SELECT {COLUMNS} FROM Case WHERE Owner.Name = 'Jane Doe' ORDER BY CaseNumber"
+
+def test_without_a_cached_snapshot_the_first_fetch_is_awaited(make_handler):
+  renders = []
+  assert warm_start(make_handler([QUERY]), lambda: ["live"], render=lambda *args: renders.append(args)) == ["live"]
+  assert renders == []
+
+def test_the_cached_snapshot_renders_while_a_slow_fetch_runs(make_handler):
+  cached = make_handler([QUERY]).run()
+  renders = []
+  release = threading.Event()
+
+  def slow_fetch():
+    # The stale render happens before the live result is released
+    assert release.wait(5)
+    return ["live"]
+
+  def render(records, age):
+    renders.append((records, age))
+    release.set()
+
+  assert warm_start(make_handler([QUERY]), slow_fetch, render) == ["live"]
+  assert len(renders) == 1
+  records, age = renders[0]
+  assert [record["CaseNumber"] for record in records] == [record["CaseNumber"] for record in cached]
+  assert 0 <= age < 5
+
+def test_a_fetch_inside_the_grace_period_skips_the_stale_render(make_handler):
+  make_handler([QUERY]).run()
+  renders = []
+  started = time.perf_counter()
+  assert warm_start(make_handler([QUERY]), lambda: ["live"], render=lambda *args: renders.append(args)) == ["live"]
+  assert renders == []
+  assert time.perf_counter() - started < GRACE_SECONDS + 1